@@ -0,0 +1,55 @@
+"""full-text and trigram search for items"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        """
+        ALTER TABLE items ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', short_id || ' ' || coalesce(serial_no, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(brand, '') || ' ' || coalesce(model, '')), 'B')
+            || setweight(jsonb_to_tsvector('simple', tags, '["string"]'), 'B')
+            || setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """
+    )
+    op.create_index("ix_items_search_vector", "items", ["search_vector"], postgresql_using="gin")
+    op.create_index(
+        "ix_items_title_trgm",
+        "items",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_items_serial_no_trgm",
+        "items",
+        ["serial_no"],
+        postgresql_using="gin",
+        postgresql_ops={"serial_no": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_items_short_id_trgm",
+        "items",
+        ["short_id"],
+        postgresql_using="gin",
+        postgresql_ops={"short_id": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_short_id_trgm", table_name="items")
+    op.drop_index("ix_items_serial_no_trgm", table_name="items")
+    op.drop_index("ix_items_title_trgm", table_name="items")
+    op.drop_index("ix_items_search_vector", table_name="items")
+    op.drop_column("items", "search_vector")
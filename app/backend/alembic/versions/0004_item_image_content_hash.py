@@ -0,0 +1,20 @@
+"""content hash for item images"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("item_images", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.create_index(op.f("ix_item_images_content_hash"), "item_images", ["content_hash"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_item_images_content_hash"), table_name="item_images")
+    op.drop_column("item_images", "content_hash")
@@ -0,0 +1,4 @@
+"""Offline microbenchmarks for the rendering and encoding hot paths.
+
+Run from ``app/`` with ``python -m backend.benchmarks --help``.
+"""
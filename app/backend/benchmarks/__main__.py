@@ -0,0 +1,66 @@
+"""Command line entry point: ``python -m backend.benchmarks``."""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence
+
+from ..core.config import get_settings
+from . import runner
+from .cases import all_cases
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="backend.benchmarks", description="Run the offline microbenchmarks")
+    parser.add_argument("only", nargs="*", help="Only run cases whose name contains one of these strings")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-round", type=float, default=runner.MIN_ROUND_SECONDS, help="Seconds per round")
+    parser.add_argument("--baseline", type=Path, default=runner.DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Record these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 on a regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, e.g. 0.25 for 25%%")
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    args = parser.parse_args(argv)
+
+    cases = all_cases()
+    if args.list:
+        print("\n".join(cases))
+        return 0
+
+    baseline = runner.load_baseline(args.baseline)
+    # Rendered files must never land in the real media directory.
+    settings = get_settings()
+    media_dir = settings.media_dir
+    with tempfile.TemporaryDirectory(prefix="bench-media-") as scratch:
+        settings.media_dir = Path(scratch)
+        try:
+            results = runner.run_suite(cases, only=args.only, rounds=args.rounds, min_round=args.min_round)
+        finally:
+            settings.media_dir = media_dir
+
+    for result in results:
+        line = f"{result.name:<32} {runner.format_seconds(result.seconds):>10} ±{result.stdev / result.seconds:5.1%}"
+        if result.size_bytes is not None:
+            line += f" {result.size_bytes:>9} B"
+        previous = baseline.get(result.name)
+        if previous:
+            line += f"  {result.seconds / previous['seconds'] - 1:+6.1%} vs baseline"
+        print(line)
+
+    regressions = runner.compare(results, baseline, tolerance=args.tolerance)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name} {regression.metric}: "
+            f"{regression.baseline:g} -> {regression.current:g} (x{regression.ratio:.2f})",
+            file=sys.stderr,
+        )
+    if args.save:
+        runner.save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
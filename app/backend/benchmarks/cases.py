@@ -0,0 +1,159 @@
+"""Benchmark cases.
+
+Each case is a factory returning the callable to time and, optionally, a size
+in bytes of what it produces. Factories run once before timing, so setup such
+as seeding the SQLite database is not measured.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from ..core.config import get_settings
+from ..models import Base
+from ..models.item import Item, ItemImage
+from ..schemas.item import ItemRead
+from ..services.ai import describe_item
+from ..services.item_rows import encode_items, items_query
+from ..services.label_templates import SIZE_PRESETS
+from ..services.label_formats import LABEL_FORMATS
+from ..services.labels import render_label, render_label_image
+from ..services.qrcode_utils import make_code128_png, make_qr_png
+from ..utils.shortid import generate_short_id
+
+Case = Tuple[Callable[[], object], Optional[int]]
+
+QR_URL_LENGTHS = (32, 128, 512)
+SERIALIZE_COUNTS = (100, 1000)
+PUBLIC_BASE_URL = "http://localhost:5434"
+
+
+def sample_item(index: int = 0) -> Item:
+    """Return a representative, fully populated item that is not persisted."""
+
+    return Item(
+        id=uuid.UUID(int=index + 1),
+        short_id=f"b{index:06d}"[-7:],
+        title=f"Stainless Steel Watering Can {index}",
+        description="A durable 1.5L can suitable for indoor and outdoor plants. Fingerprint-resistant finish.",
+        tags=["gardening", "watering", "stainless"],
+        category="Garden",
+        brand="Acme",
+        model="WC-15",
+        serial_no=f"SN-{index:08d}",
+        location="Shed / Shelf 2",
+        status="active",
+    )
+
+
+def qr_encode(length: int) -> Case:
+    url = (PUBLIC_BASE_URL + "/i/" + "x" * length)[:length]
+    return (lambda: make_qr_png(url)), None
+
+
+def label_render(size: str) -> Case:
+    item = sample_item()
+    size_mm = SIZE_PRESETS[size]
+    return (lambda: render_label_image(item, size_mm=size_mm, public_base_url=PUBLIC_BASE_URL)), None
+
+
+def label_output(size: str, fmt: str = "pdf") -> Case:
+    item = sample_item()
+    size_mm = SIZE_PRESETS[size]
+    # The command line points media_dir at a scratch directory for the run.
+    destination = get_settings().media_dir / "bench" / f"{size}{LABEL_FORMATS[fmt].suffix}"
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    def run() -> Path:
+        return render_label(item, size_mm=size_mm, public_base_url=PUBLIC_BASE_URL, fmt=fmt, destination=destination)
+
+    run()
+    return run, destination.stat().st_size
+
+
+def code128() -> Case:
+    return (lambda: make_code128_png("SN-00001234")), None
+
+
+def ai_describe() -> Case:
+    hints = itertools.cycle([f"watering can {index}" for index in range(64)])
+    return (lambda: describe_item(image_path="blobs/ab/cd/example.jpg", text_hint=next(hints))), None
+
+
+def short_id() -> Case:
+    return generate_short_id, None
+
+
+def _seed_engine(n: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    created = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        for index in range(n):
+            item = sample_item(index)
+            item.created_at = item.updated_at = created + timedelta(seconds=index)
+            item.images = [
+                ItemImage(path=f"blobs/{index:04d}/{image}.jpg", derivatives={"thumb": f"derived/{index}-{image}.jpg"})
+                for image in range(2)
+            ]
+            session.add(item)
+        session.commit()
+    return engine
+
+
+def _seed_items(n: int) -> List[Item]:
+    with Session(_seed_engine(n)) as session:
+        items = session.execute(select(Item).options(selectinload(Item.images))).scalars().all()
+        session.expunge_all()
+    return items
+
+
+def item_read_serialize(n: int) -> Case:
+    items = _seed_items(n)
+
+    def run() -> bytes:
+        # Mirrors what FastAPI does for ``response_model=list[ItemRead]``.
+        payload = [ItemRead.from_orm(item) for item in items]
+        return json.dumps(jsonable_encoder(payload)).encode("utf-8")
+
+    return run, len(run())
+
+
+def item_list_lean(n: int) -> Case:
+    session = Session(_seed_engine(n))
+    query = items_query("sqlite").order_by(Item.created_at.desc(), Item.id.desc())
+
+    def run() -> bytes:
+        # The listing endpoint's path, including the query itself.
+        return encode_items(session.execute(query).all())
+
+    return run, len(run())
+
+
+def all_cases() -> Dict[str, Callable[[], Case]]:
+    """Return the suite keyed by a stable case name."""
+
+    cases: Dict[str, Callable[[], Case]] = {}
+    for length in QR_URL_LENGTHS:
+        cases[f"qr_encode[url={length}]"] = lambda length=length: qr_encode(length)
+    for size in SIZE_PRESETS:
+        cases[f"label_render[{size}]"] = lambda size=size: label_render(size)
+        cases[f"label_pdf[{size}]"] = lambda size=size: label_output(size)
+    for fmt in LABEL_FORMATS:
+        if fmt != "pdf":
+            cases[f"label_output[50x30,{fmt}]"] = lambda fmt=fmt: label_output("50x30", fmt)
+    cases["code128"] = code128
+    cases["describe_item"] = ai_describe
+    cases["generate_short_id"] = short_id
+    for n in SERIALIZE_COUNTS:
+        cases[f"item_read_serialize[n={n}]"] = lambda n=n: item_read_serialize(n)
+        cases[f"item_list_lean[n={n}]"] = lambda n=n: item_list_lean(n)
+    return cases
@@ -0,0 +1,137 @@
+"""Timing, baseline storage and regression checks for the benchmark suite."""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .cases import Case
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+MIN_ROUND_SECONDS = 0.05
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    stdev: float
+    rounds: int
+    calls: int
+    size_bytes: Optional[int] = None
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def measure(name: str, factory: Callable[[], Case], rounds: int = 5, min_round: float = MIN_ROUND_SECONDS) -> Result:
+    """Time one case and return the median seconds per call.
+
+    The number of calls per round is scaled up until a round takes at least
+    ``min_round`` seconds, which also serves as the warm-up.
+    """
+
+    func, size_bytes = factory()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round or calls >= 1 << 20:
+            break
+        calls *= 2 if elapsed * 4 >= min_round else 10
+
+    timings: List[float] = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        timings.append((time.perf_counter() - started) / calls)
+    return Result(
+        name=name,
+        seconds=statistics.median(timings),
+        stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        rounds=rounds,
+        calls=calls,
+        size_bytes=size_bytes,
+    )
+
+
+def run_suite(
+    cases: Dict[str, Callable[[], Case]],
+    only: Optional[Iterable[str]] = None,
+    rounds: int = 5,
+    min_round: float = MIN_ROUND_SECONDS,
+) -> List[Result]:
+    """Measure every case whose name contains one of the ``only`` substrings."""
+
+    patterns = list(only or [])
+    return [
+        measure(name, factory, rounds=rounds, min_round=min_round)
+        for name, factory in cases.items()
+        if not patterns or any(pattern in name for pattern in patterns)
+    ]
+
+
+def save_baseline(results: List[Result], path: Path = DEFAULT_BASELINE) -> None:
+    """Write results as the new baseline, merging with cases not re-run."""
+
+    data = load_baseline(path)
+    data.update({result.name: asdict(result) for result in results})
+    document = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "results": dict(sorted(data.items())),
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8")).get("results", {})
+
+
+def compare(
+    results: List[Result],
+    baseline: Dict[str, dict],
+    tolerance: float = 0.25,
+    size_tolerance: float = 0.05,
+) -> List[Regression]:
+    """Return the results that are slower or larger than the baseline allows.
+
+    Timings are noisy, so they get a wider ``tolerance`` than output sizes,
+    which are deterministic for a given set of library versions.
+    """
+
+    regressions: List[Regression] = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous:
+            continue
+        if result.seconds > previous["seconds"] * (1 + tolerance):
+            regressions.append(Regression(result.name, "seconds", previous["seconds"], result.seconds))
+        old_size = previous.get("size_bytes")
+        if result.size_bytes is not None and old_size and result.size_bytes > old_size * (1 + size_tolerance):
+            regressions.append(Regression(result.name, "size_bytes", old_size, result.size_bytes))
+    return regressions
+
+
+def format_seconds(value: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if value >= scale:
+            return f"{value / scale:.2f} {unit}"
+    return f"{value / 1e-9:.0f} ns"
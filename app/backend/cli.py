@@ -0,0 +1,73 @@
+"""Command line entry points for bulk operations.
+
+Run from ``app/`` with ``python -m backend.cli <command> --help``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+
+from .core.db import SessionLocal
+from .services import exporter
+from .services.importer import FORMATS, detect_format, import_items, iter_rows, queue_label_printing
+from .services.printer_registry import NoPrinterAvailable
+
+
+def _import(args: argparse.Namespace) -> int:
+    fmt = args.format or detect_format(args.path)
+    with open(args.path, encoding="utf-8-sig", newline="") as stream, SessionLocal() as db:
+        report = import_items(db, iter_rows(stream, fmt), batch_size=args.batch_size)
+
+    print(f"Imported {report.imported} items, {report.failed} rows failed", file=sys.stderr)
+    for error in report.errors:
+        print(json.dumps(error), file=sys.stderr)
+    if args.print_labels and report.item_ids:
+        try:
+            job_ids = queue_label_printing(report.item_ids, size=args.size, copies=args.copies)
+        except NoPrinterAvailable as exc:
+            print(f"Labels not queued: {exc}", file=sys.stderr)
+            return 1
+        for job_id in job_ids:
+            print(f"Queued print job {job_id}", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    output = open(args.output, "wb") if args.output != "-" else sys.stdout.buffer
+    try:
+        with SessionLocal() as db:
+            for chunk in exporter.export_stream(db, exporter.export_query(), args.format, gzip=args.gzip):
+                output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="backend.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="Import items from a CSV or JSONL file")
+    importer.add_argument("path")
+    importer.add_argument("--format", choices=FORMATS)
+    importer.add_argument("--batch-size", type=int, default=1000)
+    importer.add_argument("--print-labels", action="store_true", help="Queue labels for imported items")
+    importer.add_argument("--size", default="50x30")
+    importer.add_argument("--copies", type=int, default=1)
+    importer.set_defaults(handler=_import)
+
+    export = commands.add_parser("export", help="Export all items as CSV or JSONL")
+    export.add_argument("output", nargs="?", default="-", help="Output file, '-' for stdout")
+    export.add_argument("--format", choices=exporter.FORMATS, default="csv")
+    export.add_argument("--gzip", action="store_true")
+    export.set_defaults(handler=_export)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
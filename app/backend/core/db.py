@@ -1,16 +1,52 @@
 """Database engine and session management."""
+import time
 from contextlib import contextmanager
 from typing import Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import get_settings
+from .metrics import DB_QUERY_SECONDS
 
 settings = get_settings()
 engine = create_engine(settings.database_url, future=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+# Async drivers used when ASYNC_DATABASE_URL is not set explicitly.
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(url: str) -> str:
+    """Return ``url`` rewritten to use the async driver for its backend."""
+
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(settings.async_database_url or async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.pop("query_started", None)
+    if started is not None:
+        DB_QUERY_SECONDS.observe(time.perf_counter() - started)
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
 
 @contextmanager
 def session_scope() -> Iterator[Session]:
@@ -25,3 +61,4 @@ def session_scope() -> Iterator[Session]:
         raise
     finally:
         session.close()
+
@@ -0,0 +1,119 @@
+"""Prometheus metrics and lightweight trace context.
+
+All metrics live in the default registry. When ``PROMETHEUS_MULTIPROC_DIR`` is
+set (uvicorn or Celery with several processes) they are aggregated across
+processes at scrape time.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+try:  # OpenTelemetry is optional; spans are only exported when it is installed.
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover - optional dependency
+    otel_trace = None
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route.",
+    ["method", "route", "status"],
+)
+QR_ENCODE_SECONDS = Histogram("qr_encode_seconds", "Time spent encoding QR codes.")
+LABEL_RENDER_SECONDS = Histogram(
+    "label_render_seconds", "Time spent drawing one label.", ["size"]
+)
+PRINT_SPOOL_SECONDS = Histogram(
+    "print_spool_seconds", "Time spent handing a document to the printer.", ["backend"]
+)
+PRINT_FAILURES = Counter("print_failures_total", "Print jobs that failed to spool.", ["backend"])
+DB_QUERY_SECONDS = Histogram("db_query_seconds", "Database statement execution time.")
+CELERY_QUEUE_WAIT_SECONDS = Histogram(
+    "celery_task_queue_wait_seconds", "Time between publishing a task and a worker starting it.", ["task"]
+)
+CELERY_TASK_SECONDS = Histogram(
+    "celery_task_duration_seconds", "Celery task run time.", ["task", "state"]
+)
+CELERY_TASK_FAILURES = Counter("celery_task_failures_total", "Celery tasks that raised.", ["task"])
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and outcome.", ["cache", "result"])
+SHORT_ID_CANDIDATES = Counter(
+    "short_id_candidates_total", "Short id candidates checked against existing items.", ["length"]
+)
+SHORT_ID_COLLISIONS = Counter(
+    "short_id_collisions_total", "Short id candidates that were already taken.", ["length"]
+)
+
+trace_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trace_id", default=None)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Return the current metrics exposition and its content type."""
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def current_trace_id() -> Optional[str]:
+    return trace_id_var.get()
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str]) -> Iterator[Optional[str]]:
+    """Bind ``trace_id`` to the current context for the duration of the block."""
+
+    token = trace_id_var.set(trace_id)
+    try:
+        yield trace_id
+    finally:
+        trace_id_var.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: object) -> Iterator[None]:
+    """Time a step of a traced operation.
+
+    The duration is logged with the current trace id and, when OpenTelemetry is
+    installed, recorded as a span carrying the same id as an attribute.
+    """
+
+    trace_id = current_trace_id()
+    started = time.perf_counter()
+    try:
+        if otel_trace is not None:
+            tracer = otel_trace.get_tracer("backend")
+            with tracer.start_as_current_span(name, attributes={"trace_id": trace_id or "", **attributes}):
+                yield
+        else:
+            yield
+    finally:
+        if trace_id:
+            logger.info(
+                "span %s trace=%s duration=%.3fs %s",
+                name,
+                trace_id,
+                time.perf_counter() - started,
+                " ".join(f"{key}={value}" for key, value in attributes.items()),
+            )
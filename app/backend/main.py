@@ -1,12 +1,16 @@
 """FastAPI application entry point."""
 from __future__ import annotations
 
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response
 
 from .core.config import get_settings
-from .routers import items, public
+from .core.metrics import REQUEST_SECONDS, render_latest
+from .routers import items, jobs, printers, public
+from .utils.media import MediaFiles
 
 settings = get_settings()
 
@@ -18,14 +22,46 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[items.NEXT_CURSOR_HEADER],
 )
 
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template rather than raw path to keep cardinality bounded.
+        route = request.scope.get("route")
+        REQUEST_SECONDS.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        ).observe(time.perf_counter() - started)
+
+
 app.include_router(items.router)
+app.include_router(jobs.router)
+app.include_router(printers.router)
 app.include_router(public.router)
 
-app.mount("/media", StaticFiles(directory=settings.media_dir), name="media")
+app.mount(
+    "/media",
+    MediaFiles(directory=settings.media_dir, cache_control=settings.media_cache_control),
+    name="media",
+)
 
 
 @app.get("/")
 def read_root() -> dict:
     return {"message": "QR Label service is running"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    body, content_type = render_latest()
+    return Response(body, headers={"Content-Type": content_type})
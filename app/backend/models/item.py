@@ -4,18 +4,22 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, date
 
-from sqlalchemy import Date, DateTime, ForeignKey, Text, event, select
+from sqlalchemy import JSON, Date, DateTime, ForeignKey, Index, String, Text, event, select
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
-from ..utils.shortid import generate_short_id
+from ..core.config import get_settings
+from ..utils.shortid import ShortIdAllocator
 from . import Base
 
+short_id_allocator = ShortIdAllocator(length=get_settings().short_id_length)
+
 
 class Item(Base):
     """Represents an asset that can be tagged with a QR/Barcode."""
 
     __tablename__ = "items"
+    __table_args__ = (Index("ix_items_created_at_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         default=uuid.uuid4, primary_key=True, nullable=False
@@ -23,7 +27,9 @@ class Item(Base):
     short_id: Mapped[str] = mapped_column(unique=True, nullable=False, index=True)
     title: Mapped[str] = mapped_column(default="", nullable=False)
     description: Mapped[str] = mapped_column(Text, default="", nullable=False)
-    tags: Mapped[list[str]] = mapped_column(JSONB, default=list, nullable=False)
+    tags: Mapped[list[str]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), default=list, nullable=False
+    )
     category: Mapped[str | None]
     brand: Mapped[str | None]
     model: Mapped[str | None]
@@ -56,6 +62,8 @@ class ItemImage(Base):
         ForeignKey("items.id", ondelete="CASCADE"), nullable=False, index=True
     )
     path: Mapped[str] = mapped_column(nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), index=True)
+    derivatives: Mapped[dict | None] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, nullable=False
     )
@@ -63,18 +71,33 @@ class ItemImage(Base):
     item: Mapped[Item] = relationship(back_populates="images")
 
 
+def allocate_short_ids(connection, n: int) -> list[str]:
+    """Return ``n`` short ids not yet present in the ``items`` table."""
+
+    def taken(candidates: list[str]) -> set[str]:
+        return set(
+            connection.execute(select(Item.short_id).where(Item.short_id.in_(candidates))).scalars()
+        )
+
+    return short_id_allocator.allocate(n, taken)
+
+
+@event.listens_for(Session, "before_flush")
+def assign_short_ids(session: Session, flush_context, instances) -> None:  # pragma: no cover
+    """Allocate short ids for every pending item with one uniqueness query."""
+
+    pending = [obj for obj in session.new if isinstance(obj, Item) and not obj.short_id]
+    if not pending:
+        return
+    short_ids = allocate_short_ids(session.connection(), len(pending))
+    for item, short_id in zip(pending, short_ids):
+        item.short_id = short_id
+
+
 @event.listens_for(Item, "before_insert")
 def ensure_short_id(mapper, connection, target: Item) -> None:  # pragma: no cover
     """Populate the short_id if it is missing, ensuring uniqueness."""
 
     if target.short_id:
         return
-
-    while True:
-        candidate = generate_short_id()
-        exists = connection.execute(
-            select(Item.short_id).where(Item.short_id == candidate)
-        ).scalar_one_or_none()
-        if not exists:
-            target.short_id = candidate
-            break
+    target.short_id = allocate_short_ids(connection, 1)[0]
@@ -1,4 +1,4 @@
 """API routers."""
-from . import items, public  # noqa: F401
+from . import items, jobs, printers, public  # noqa: F401
 
-__all__ = ["items", "public"]
+__all__ = ["items", "jobs", "printers", "public"]
@@ -2,35 +2,66 @@
 from __future__ import annotations
 
 import io
-import json
+import logging
 import uuid
-from datetime import date
-from pathlib import Path
-from typing import Optional
+from datetime import date, datetime
+from typing import AsyncIterator, Iterator, Optional, Tuple
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
-from sqlalchemy import String, or_, select
+import redis
+
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..core.config import get_settings
-from ..core.db import SessionLocal
+from ..core.db import AsyncSessionLocal, SessionLocal
+from ..core.metrics import new_trace_id, trace_context
 from ..models.item import Item, ItemImage
 from ..schemas.item import (
+    BatchPrintRequest,
+    BatchPrintResponse,
+    ImportResponse,
     ItemCreateResponse,
     ItemImageRead,
     ItemRead,
+    ItemSuggestions,
     ItemUpdate,
     PrintRequest,
     PrintResponse,
 )
-from ..services.ai import describe_item
-from ..services.labels import SIZE_PRESETS
-from ..services.qrcode_utils import make_qr_png
-from ..tasks.print_tasks import print_label
+from ..services.exporter import export_query, export_stream
+from ..services.importer import FORMATS, detect_format, import_items, iter_rows, queue_label_printing
+from ..services.item_rows import encode_item, encode_items, items_query
+from ..services.label_formats import get_format
+from ..services.label_templates import parse_size
+from ..services.printer_registry import NoPrinterAvailable, get_printers
+from ..services.printers import check_language
+from ..services.public_cache import public_item_cache
+from ..services.qr_cache import qr_cache
+from ..services.search import search_page
+from ..services.storage import StoredBlob, UploadTooLarge, store_upload
+from ..services.suggestions import FAILED, PENDING, READY, suggestion_key, suggestion_store
+from ..tasks.ai_tasks import suggest_item_metadata
+from ..tasks.image_tasks import generate_image_derivatives
+from ..tasks.print_tasks import choose_printer, print_label, print_labels_batch, schedule_prerender, submit_print
+from ..utils.cursor import decode_cursor, decode_offset_cursor, encode_cursor, encode_offset_cursor
+from ..utils.http import conditional_response, etag_matches, weak_etag
+from ..utils.lru import LRUCache
+from ..utils.tags import parse_tags
 
 router = APIRouter(prefix="/api/items", tags=["items"])
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QR_CACHE_CONTROL = "public, max-age=31536000, immutable"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK_ROWS = 500
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+_short_ids: LRUCache[uuid.UUID, str] = LRUCache(maxsize=settings.qr_cache_size)
 
 
 def get_db() -> Session:
@@ -41,42 +72,213 @@ def get_db() -> Session:
         db.close()
 
 
-def _parse_tags(raw: Optional[str]) -> list[str]:
-    if not raw:
-        return []
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def _save_upload(upload: UploadFile) -> StoredBlob:
     try:
-        parsed = json.loads(raw)
-        if isinstance(parsed, list):
-            return [str(tag) for tag in parsed]
-    except json.JSONDecodeError:
-        pass
-    return [tag.strip() for tag in raw.split(",") if tag.strip()]
+        return await store_upload(upload)
+    except UploadTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
 
 
-def _save_upload(item_id: uuid.UUID, upload: UploadFile) -> Path:
-    media_dir = settings.media_dir / "items" / str(item_id)
-    media_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"{uuid.uuid4()}{Path(upload.filename or 'upload').suffix}"
-    destination = media_dir / filename
-    with destination.open("wb") as buffer:
-        buffer.write(upload.file.read())
-    return destination
+def _enqueue_derivatives(image_id: uuid.UUID) -> None:
+    # Derivatives are an optimisation; the original stays usable if the
+    # broker is unavailable, so a failed enqueue must not fail the upload.
+    try:
+        generate_image_derivatives.delay(str(image_id))
+    except Exception:
+        logger.warning("Could not queue derivatives for image %s", image_id, exc_info=True)
 
 
-@router.get("/", response_model=list[ItemRead])
-def list_items(search: Optional[str] = None, db: Session = Depends(get_db)) -> list[ItemImageRead]:
-    query = select(Item)
+def _enqueue_prerender(item: Item) -> None:
+    # Like derivatives, pre-rendered labels only save time at print; a lost
+    # task means the label is drawn when it is printed.
+    try:
+        schedule_prerender(item)
+    except Exception:
+        logger.warning("Could not queue label pre-render for item %s", item.id, exc_info=True)
+
+
+def _request_suggestions(
+    item_id: uuid.UUID, key: str, image_path: Optional[str], text_hint: Optional[str]
+) -> Tuple[str, Optional[dict]]:
+    """Serve cached suggestions for ``key`` or queue an inference for them."""
+
+    suggestion_store.assign(str(item_id), key)
+    cached = suggestion_store.get(key)
+    if cached is not None:
+        return READY, cached
+    # Items created while the same photo and hint are being described share that inference.
+    if suggestion_store.claim(key):
+        try:
+            suggest_item_metadata.delay(key, image_path, text_hint)
+        except Exception:
+            suggestion_store.release(key)
+            logger.warning("Could not queue suggestions for item %s", item_id, exc_info=True)
+            return FAILED, None
+    return PENDING, None
+
+
+def _item_validators(item: Item) -> Tuple[str, datetime]:
+    # New images and their derivatives do not touch updated_at, so they feed the tag too.
+    images = [f"{image.id}:{','.join(sorted(image.derivatives or {}))}" for image in item.images]
+    last_modified = max([item.updated_at, *(image.created_at for image in item.images)])
+    return weak_etag(item.id, item.updated_at.isoformat(), *images), last_modified
+
+
+def _validate_size(size: str) -> str:
+    try:
+        parse_size(size)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return size
+
+
+def _validate_format(fmt: Optional[str], count: int = 1) -> Optional[str]:
+    if fmt is None:
+        return None
+    try:
+        label_format = get_format(fmt)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if count > 1 and not label_format.multi_page:
+        raise HTTPException(status_code=400, detail=f"The {fmt} format holds a single label")
+    return fmt
+
+
+def _submit_print(task, size: str, location: Optional[str], printer: Optional[str], priority: bool, **kwargs):
+    if printer is not None:
+        registered = get_printers().get(printer)
+        if registered is None:
+            raise HTTPException(status_code=400, detail=f"Unknown printer {printer!r}")
+        if not registered.supports(parse_size(size)):
+            raise HTTPException(status_code=400, detail=f"Printer {printer!r} does not take {size} labels")
+    try:
+        target = choose_printer(size, location, printer)
+    except NoPrinterAvailable as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    if kwargs.get("fmt"):
+        # A format override must still be something the chosen printer can print.
+        try:
+            check_language(target.uri, get_format(kwargs["fmt"]))
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+    return submit_print(task, size, printer=target.name, priority=priority, **kwargs)
+
+
+def _search_offset(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return decode_offset_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _items_query(query, search: Optional[str], cursor: Optional[str], db: Session, limit: Optional[int] = None):
+    """Apply search or keyset paging to ``query``.
+
+    Returns the query and, when the search backend cut a page short, the
+    cursor that continues after it.
+    """
+
     if search:
-        term = f"%{search.lower()}%"
-        query = query.where(
-            or_(
-                Item.title.ilike(term),
-                Item.description.ilike(term),
-                Item.tags.cast(String).ilike(term),
-            )
-        )
-    items = db.execute(query.order_by(Item.created_at.desc())).scalars().unique().all()
-    return items
+        query, next_offset = search_page(query, search, db, offset=_search_offset(cursor), limit=limit)
+        return query, None if next_offset is None else encode_offset_cursor(next_offset)
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        query = query.where(tuple_(Item.created_at, Item.id) < tuple_(created_at, last_id))
+    query = query.order_by(Item.created_at.desc(), Item.id.desc())
+    return (query if limit is None else query.limit(limit)), None
+
+
+def _page_cursor(search: Optional[str], cursor: Optional[str], limit: Optional[int], rows) -> Optional[str]:
+    """Return the cursor after ``rows`` if they fill a page of ``limit``."""
+
+    if limit is None or len(rows) < limit:
+        return None
+    if search:
+        return encode_offset_cursor(_search_offset(cursor) + limit)
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def _stream_items(query, output: str) -> Iterator[bytes]:
+    """Yield serialized rows in chunks from a server-side cursor.
+
+    The generator owns its session because it outlives the request handler.
+    """
+
+    json_array = output == "json-stream"
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=STREAM_CHUNK_ROWS))
+        if json_array:
+            yield b"["
+        first = True
+        for partition in result.partitions():
+            rows = [encode_item(row) for row in partition]
+            if json_array:
+                chunk = b",".join(rows)
+                yield chunk if first else b"," + chunk
+            else:
+                yield b"\n".join(rows) + b"\n"
+            first = False
+        if json_array:
+            yield b"]"
+
+
+@router.get("/", response_model=list[ItemRead])
+def list_items(
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    output: str = Query("json", alias="format", regex=r"^(json|ndjson|json-stream)$"),
+    db: Session = Depends(get_db),
+):
+    # Rows are encoded straight from columns; ItemRead only documents the shape.
+    query, next_cursor = _items_query(items_query(db.get_bind().dialect.name), search, cursor, db, limit)
+
+    if output != "json":
+        if next_cursor is None and limit is not None:
+            # Headers go out before the rows, so read the page's sort keys up front.
+            keys, _ = _items_query(select(Item.created_at, Item.id), search, cursor, db, limit)
+            next_cursor = _page_cursor(search, cursor, limit, db.execute(keys).all())
+        media_type = "application/x-ndjson" if output == "ndjson" else "application/json"
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return StreamingResponse(_stream_items(query, output), media_type=media_type, headers=headers)
+
+    rows = db.execute(query).all()
+    next_cursor = next_cursor or _page_cursor(search, cursor, limit, rows)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return Response(encode_items(rows), media_type="application/json", headers=headers)
+
+
+@router.get("/export")
+def export_items(
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fmt: str = Query("csv", alias="format", regex=r"^(csv|jsonl)$"),
+    gzip: bool = False,
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    query, next_cursor = _items_query(export_query(), search, cursor, db)
+    filename = f"items.{fmt}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else EXPORT_MEDIA_TYPES[fmt]
+
+    def stream() -> Iterator[bytes]:
+        # The response outlives the request session, so export on its own.
+        with SessionLocal() as export_db:
+            yield from export_stream(export_db, query, fmt, gzip=gzip)
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    return StreamingResponse(stream(), media_type=media_type, headers=headers)
 
 
 @router.post("/", response_model=ItemCreateResponse)
@@ -94,12 +296,12 @@ async def create_item(
     warranty_expiry: Optional[str] = Form(None),
     text_hint: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> ItemCreateResponse:
     data = Item(
         title=title,
         description=description,
-        tags=_parse_tags(tags),
+        tags=parse_tags(tags),
         category=category,
         brand=brand,
         model=model,
@@ -119,23 +321,88 @@ async def create_item(
             raise HTTPException(status_code=400, detail="Invalid warranty_expiry")
 
     db.add(data)
-    db.flush()
+    await db.flush()
 
-    saved_path = None
+    image_row = None
     if image:
-        saved = _save_upload(data.id, image)
-        saved_path = saved
-        db.add(ItemImage(item_id=data.id, path=str(saved.relative_to(settings.media_dir))))
-        db.flush()
-
-    suggestions = describe_item(
-        image_path=str(saved_path) if saved_path else None,
-        text_hint=text_hint,
+        saved = await _save_upload(image)
+        image_row = ItemImage(item_id=data.id, path=saved.relative_path, content_hash=saved.sha256)
+        db.add(image_row)
+        await db.flush()
+
+    await db.commit()
+    # Drop any negative entry left by scans that arrived before the item existed.
+    await run_in_threadpool(public_item_cache.invalidate, data.short_id)
+    if image_row is not None:
+        await run_in_threadpool(_enqueue_derivatives, image_row.id)
+    await run_in_threadpool(_enqueue_prerender, data)
+    suggestions_status, suggestions = await run_in_threadpool(
+        _request_suggestions,
+        data.id,
+        suggestion_key(image_row.content_hash if image_row else None, text_hint),
+        image_row.path if image_row else None,
+        text_hint,
     )
+    await db.refresh(data, ["images"])
+    return ItemCreateResponse(item=data, suggestions=suggestions, suggestions_status=suggestions_status)
 
-    db.commit()
-    db.refresh(data)
-    return ItemCreateResponse(item=data, suggestions=suggestions)
+
+@router.post("/import", response_model=ImportResponse)
+def import_items_file(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Form(None, alias="format"),
+    print_labels: bool = Form(False),
+    size: str = Form("50x30"),
+    copies: int = Form(1, ge=1, le=20),
+    db: Session = Depends(get_db),
+) -> ImportResponse:
+    fmt = fmt or detect_format(file.filename)
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(FORMATS)}")
+    if print_labels:
+        size = _validate_size(size)
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_items(db, iter_rows(stream, fmt))
+    finally:
+        stream.detach()
+
+    # The rows are committed by now, so a printing problem is reported rather than raised.
+    print_job_ids, print_error = [], None
+    if print_labels and report.item_ids:
+        try:
+            print_job_ids = queue_label_printing(report.item_ids, size=size, copies=copies)
+        except NoPrinterAvailable as exc:
+            print_error = str(exc)
+    return ImportResponse(
+        imported=report.imported,
+        failed=report.failed,
+        errors=report.errors,
+        print_job_ids=print_job_ids,
+        print_error=print_error,
+    )
+
+
+@router.post("/print", response_model=BatchPrintResponse)
+def print_item_labels(request: BatchPrintRequest) -> BatchPrintResponse:
+    item_ids = list(dict.fromkeys(str(item_id) for item_id in request.item_ids))
+    size = _validate_size(request.size)
+    fmt = _validate_format(request.format, count=len(item_ids))
+    with trace_context(new_trace_id()) as trace_id:
+        task, printer = _submit_print(
+            print_labels_batch,
+            size,
+            request.location,
+            request.printer,
+            request.priority,
+            item_ids=item_ids,
+            copies=request.copies,
+            fmt=fmt,
+        )
+    return BatchPrintResponse(
+        status="queued", job_id=str(task.id), count=len(item_ids), trace_id=trace_id, printer=printer.name
+    )
 
 
 @router.patch("/{item_id}", response_model=ItemRead)
@@ -147,7 +414,9 @@ def update_item(item_id: uuid.UUID, payload: ItemUpdate, db: Session = Depends(g
         setattr(item, field, value)
     db.add(item)
     db.commit()
+    public_item_cache.invalidate(item.short_id)
     db.refresh(item)
+    _enqueue_prerender(item)
     return item
 
 
@@ -155,29 +424,75 @@ def update_item(item_id: uuid.UUID, payload: ItemUpdate, db: Session = Depends(g
 async def upload_item_image(
     item_id: uuid.UUID,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[ItemImageRead]:
-    item = db.get(Item, item_id)
+    item = await db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    saved = _save_upload(item.id, image)
-    db.add(ItemImage(item_id=item.id, path=str(saved.relative_to(settings.media_dir))))
-    db.commit()
-    db.refresh(item)
+    saved = await _save_upload(image)
+    image_row = ItemImage(item_id=item.id, path=saved.relative_path, content_hash=saved.sha256)
+    db.add(image_row)
+    await db.commit()
+    await run_in_threadpool(public_item_cache.invalidate, item.short_id)
+    await run_in_threadpool(_enqueue_derivatives, image_row.id)
+    await db.refresh(item, ["images"])
     return item.images
 
 
-@router.get("/{item_id}/qr.png")
-def get_item_qr(item_id: uuid.UUID, db: Session = Depends(get_db)) -> StreamingResponse:
+@router.get("/{item_id}", response_model=ItemRead)
+def get_item(
+    item_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> Response:
     item = db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    url = settings.public_base_url.rstrip("/") + f"/i/{item.short_id}"
-    qr_img = make_qr_png(url)
-    buffer = io.BytesIO()
-    qr_img.save(buffer, format="PNG")
-    buffer.seek(0)
-    return StreamingResponse(buffer, media_type="image/png")
+    etag, last_modified = _item_validators(item)
+    return conditional_response(
+        lambda: ItemRead.from_orm(item).json().encode("utf-8"),
+        etag,
+        if_none_match=if_none_match,
+        if_modified_since=if_modified_since,
+        last_modified=last_modified,
+        accept_encoding=accept_encoding,
+        precompress=settings.json_precompress,
+    )
+
+
+@router.get("/{item_id}/qr.png")
+def get_item_qr(
+    item_id: uuid.UUID,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> Response:
+    # short_id never changes once assigned, so the lookup is memoized too.
+    short_id = _short_ids.get(item_id)
+    if short_id is None:
+        short_id = db.execute(select(Item.short_id).where(Item.id == item_id)).scalar_one_or_none()
+        if short_id is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        _short_ids.set(item_id, short_id)
+    url = settings.public_base_url.rstrip("/") + f"/i/{short_id}"
+    png, etag = qr_cache.png(url)
+    headers = {"ETag": etag, "Cache-Control": QR_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(png, media_type="image/png", headers=headers)
+
+
+@router.get("/{item_id}/suggestions", response_model=ItemSuggestions)
+def get_item_suggestions(item_id: uuid.UUID) -> ItemSuggestions:
+    try:
+        found = suggestion_store.status(str(item_id))
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Suggestions are temporarily unavailable")
+    if found is None:
+        raise HTTPException(status_code=404, detail="No suggestions for this item")
+    status, suggestions = found
+    return ItemSuggestions(status=status, suggestions=suggestions)
 
 
 @router.post("/{item_id}/print", response_model=PrintResponse)
@@ -189,6 +504,17 @@ def print_item_label(
     item = db.get(Item, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    size = request.size if request.size in SIZE_PRESETS else "50x30"
-    task = print_label.delay(str(item.id), size=size, copies=request.copies)
-    return PrintResponse(status="queued", job_id=str(task.id))
+    size = _validate_size(request.size)
+    fmt = _validate_format(request.format)
+    with trace_context(new_trace_id()) as trace_id:
+        task, printer = _submit_print(
+            print_label,
+            size,
+            item.location,
+            request.printer,
+            request.priority,
+            item_id=str(item.id),
+            copies=request.copies,
+            fmt=fmt,
+        )
+    return PrintResponse(status="queued", job_id=str(task.id), trace_id=trace_id, printer=printer.name)
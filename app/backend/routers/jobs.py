@@ -0,0 +1,102 @@
+"""Print job status endpoints, including a server-sent events stream."""
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator, Dict, List, Optional
+
+import redis
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from ..schemas.job import JobStatus
+from ..services.job_status import TERMINAL_STATES, job_status, job_status_hub
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+MAX_WATCHED_JOBS = 100
+HEARTBEAT_SECONDS = 15.0
+
+
+def _parse_ids(ids: str) -> List[str]:
+    job_ids = list(dict.fromkeys(job_id.strip() for job_id in ids.split(",") if job_id.strip()))
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="No job ids given")
+    if len(job_ids) > MAX_WATCHED_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_WATCHED_JOBS} jobs can be watched at once")
+    return job_ids
+
+
+def _event(status: dict, event: Optional[str] = None) -> bytes:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(status)}\n\n".encode("utf-8")
+
+
+async def job_events(job_ids: List[str], heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[bytes]:
+    """Yield SSE messages for ``job_ids`` until every job has finished.
+
+    The current state of each job is sent first; ids with no stored state get
+    an ``error`` event and are not watched. While waiting, the stored states
+    are re-read on every heartbeat so an update published before the
+    subscription was active is still delivered.
+    """
+
+    latest: Dict[str, float] = {}
+    pending = set(job_ids)
+
+    def fresh(status: dict) -> bool:
+        job_id = status["job_id"]
+        if job_id not in pending:
+            return False
+        # ``updated_at`` comes from the clock of whichever host published the
+        # state, so it only de-duplicates progress updates; a final state is
+        # always delivered.
+        if status["state"] in TERMINAL_STATES:
+            pending.discard(job_id)
+            return True
+        if status["updated_at"] <= latest.get(job_id, 0):
+            return False
+        latest[job_id] = status["updated_at"]
+        return True
+
+    async with job_status_hub.subscribe(job_ids) as queue:
+        snapshot = await run_in_threadpool(job_status.get_many, job_ids)
+        for status in snapshot:
+            if fresh(status):
+                yield _event(status)
+        known = {status["job_id"] for status in snapshot}
+        for job_id in [job_id for job_id in job_ids if job_id not in known]:
+            pending.discard(job_id)
+            yield _event({"job_id": job_id, "detail": "Job not found"}, event="error")
+        while pending:
+            try:
+                status = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                for status in await run_in_threadpool(job_status.get_many, sorted(pending)):
+                    if fresh(status):
+                        yield _event(status)
+                continue
+            if fresh(status):
+                yield _event(status)
+
+
+@router.get("/events")
+def stream_job_events(ids: str = Query(..., description="Comma-separated job ids")) -> StreamingResponse:
+    return StreamingResponse(
+        job_events(_parse_ids(ids)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+def get_job_status(job_id: str) -> dict:
+    try:
+        statuses = job_status.get_many([job_id])
+    except redis.RedisError:
+        raise HTTPException(status_code=503, detail="Job status is temporarily unavailable")
+    if not statuses:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return statuses[0]
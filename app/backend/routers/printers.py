@@ -0,0 +1,36 @@
+"""Printer registry and status endpoints."""
+from __future__ import annotations
+
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+
+from ..schemas.printer import PrinterInfo, PrinterStatus
+from ..services.printer_registry import NoPrinterAvailable, get_printer, get_printers, printer_router
+from ..services.printers import get_transport
+
+router = APIRouter(prefix="/api/printers", tags=["printers"])
+
+
+@router.get("", response_model=List[PrinterInfo])
+def list_printers() -> List[PrinterInfo]:
+    return [
+        PrinterInfo(
+            name=printer.name,
+            language=printer.language,
+            dpi=printer.dpi,
+            sizes=[f"{width}x{height}" for width, height in printer.sizes],
+            locations=list(printer.locations),
+            queued=printer_router.queue_length(printer),
+        )
+        for printer in get_printers().values()
+    ]
+
+
+@router.get("/{name}/status", response_model=PrinterStatus)
+def printer_status(name: str) -> PrinterStatus:
+    try:
+        printer = get_printer(name)
+    except NoPrinterAvailable as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    return PrinterStatus(**{**get_transport(printer.uri).status(), "printer": printer.name})
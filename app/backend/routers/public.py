@@ -1,13 +1,18 @@
 """Public read-only endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from typing import Optional
+
+import orjson
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
 
 from ..core.config import get_settings
 from ..core.db import SessionLocal
-from ..models.item import Item
 from ..schemas.item import ItemPublic
+from ..services.item_rows import public_item_values
+from ..services.public_cache import MISSING, public_item_cache
+from ..utils.http import conditional_response, strong_etag
 
 router = APIRouter(tags=["public"])
 settings = get_settings()
@@ -22,20 +27,37 @@ def get_db():
 
 
 @router.get("/i/{short_id}", response_model=ItemPublic)
-def get_public_item(short_id: str):
+def get_public_item(
+    short_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
+):
+    cached = public_item_cache.get(short_id)
+    if cached == MISSING:
+        raise HTTPException(status_code=404, detail="Item not found")
+    if cached is not None:
+        return _payload_response(cached, if_none_match, accept_encoding)
+
     with SessionLocal() as db:
-        item = db.execute(select(Item).where(Item.short_id == short_id)).scalar_one_or_none()
-        if not item:
-            raise HTTPException(status_code=404, detail="Item not found")
-        primary_image = None
-        if item.images:
-            primary_image = settings.public_base_url.rstrip("/") + "/media/" + item.images[0].path
-        return ItemPublic(
-            short_id=item.short_id,
-            title=item.title,
-            description=item.description,
-            tags=item.tags,
-            location=item.location,
-            status=item.status,
-            primary_image=primary_image,
-        )
+        values = public_item_values(db, short_id, settings.public_base_url.rstrip("/") + "/media/")
+    if values is None:
+        public_item_cache.set_missing(short_id)
+        raise HTTPException(status_code=404, detail="Item not found")
+    payload = orjson.dumps(values)
+    if values["primary_image"] and not values["primary_image_derivatives"]:
+        # The worker's invalidation only reaches this process through Redis, so
+        # keep this payload briefly and pick up the derivatives once they exist.
+        public_item_cache.set_pending(short_id, payload)
+    else:
+        public_item_cache.set(short_id, payload)
+    return _payload_response(payload, if_none_match, accept_encoding)
+
+
+def _payload_response(payload: bytes, if_none_match: Optional[str], accept_encoding: Optional[str]) -> Response:
+    return conditional_response(
+        payload,
+        "W/" + strong_etag(payload),
+        if_none_match=if_none_match,
+        accept_encoding=accept_encoding,
+        precompress=settings.json_precompress,
+    )
@@ -2,16 +2,21 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 
 
 class ItemImageRead(BaseModel):
     id: UUID
     path: str
     created_at: datetime
+    derivatives: Dict[str, str] = Field(default_factory=dict)
+
+    @validator("derivatives", pre=True)
+    def _default_derivatives(cls, value):
+        return value or {}
 
     class Config:
         orm_mode = True
@@ -68,11 +73,19 @@ class ItemPublic(BaseModel):
     location: Optional[str]
     status: str
     primary_image: Optional[str]
+    primary_image_derivatives: Dict[str, str] = Field(default_factory=dict)
 
 
 class ItemCreateResponse(BaseModel):
     item: ItemRead
-    suggestions: dict
+    # Filled in only when a cached result exists; otherwise poll the suggestions endpoint.
+    suggestions: Optional[dict] = None
+    suggestions_status: str
+
+
+class ItemSuggestions(BaseModel):
+    status: str
+    suggestions: Optional[dict] = None
 
 
 class QRResponse(BaseModel):
@@ -80,10 +93,48 @@ class QRResponse(BaseModel):
 
 
 class PrintRequest(BaseModel):
-    size: str = Field("50x30", regex=r"^(50x30|40x30|62x30)$")
+    size: str = Field("50x30", regex=r"^\d{1,3}x\d{1,3}$")
     copies: int = Field(1, ge=1, le=20)
+    # Defaults to the printer's configured format when omitted.
+    format: Optional[str] = None
+    # Pins the job to a registered printer instead of routing by location and load.
+    printer: Optional[str] = None
+    priority: bool = False
 
 
 class PrintResponse(BaseModel):
     status: str
     job_id: str
+    trace_id: Optional[str] = None
+    printer: Optional[str] = None
+
+
+class BatchPrintRequest(BaseModel):
+    item_ids: List[UUID] = Field(..., min_items=1, max_items=1000)
+    size: str = Field("50x30", regex=r"^\d{1,3}x\d{1,3}$")
+    copies: int = Field(1, ge=1, le=20)
+    format: Optional[str] = None
+    printer: Optional[str] = None
+    location: Optional[str] = None
+    priority: bool = False
+
+
+class BatchPrintResponse(BaseModel):
+    status: str
+    job_id: str
+    count: int
+    trace_id: Optional[str] = None
+    printer: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    print_job_ids: List[str] = Field(default_factory=list)
+    print_error: Optional[str] = None
@@ -0,0 +1,15 @@
+"""Pydantic schemas for print job status."""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    state: str
+    updated_at: float
+    task: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
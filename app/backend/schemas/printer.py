@@ -0,0 +1,23 @@
+"""Pydantic schemas for printers."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PrinterStatus(BaseModel):
+    backend: str
+    printer: str
+    online: bool
+    detail: Optional[str] = None
+    pooled: Optional[int] = None
+
+
+class PrinterInfo(BaseModel):
+    name: str
+    language: str
+    dpi: int
+    sizes: List[str]
+    locations: List[str]
+    queued: int
@@ -1,9 +1,21 @@
-"""Deterministic AI suggestion stub (replace with DeepSeek later)."""
+"""AI metadata suggestions behind a pluggable provider interface.
+
+``AI_PROVIDER`` selects the provider: a name registered in :data:`PROVIDERS`
+or a ``module:Class`` path to a :class:`SuggestionProvider` subclass. The
+bundled ``local`` provider is a deterministic stand-in that needs no external
+service (replace with DeepSeek later).
+"""
 from __future__ import annotations
 
 import hashlib
-from typing import Optional
+import importlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Optional, Type
+
+from ..core.config import get_settings
 
+settings = get_settings()
 
 _BASE_RESPONSE = {
     "title": "Stainless Steel Watering Can",
@@ -12,21 +24,67 @@ _BASE_RESPONSE = {
 }
 
 
+class SuggestionError(Exception):
+    """Raised when a provider cannot produce suggestions."""
+
+
+class SuggestionProvider(ABC):
+    """Turns an item photo and/or a free-text hint into metadata suggestions.
+
+    ``describe`` returns a dict with ``title``, ``description`` and ``tags``.
+    It may be slow (a remote model), so it only ever runs in a worker.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def describe(self, image_path: Optional[str] = None, text_hint: Optional[str] = None) -> dict:
+        """Return suggestions, raising :class:`SuggestionError` on failure."""
+
+
 def _rotate(values: list[str], offset: int) -> list[str]:
     return values[offset:] + values[:offset]
 
 
-def describe_item(image_path: Optional[str] = None, text_hint: Optional[str] = None) -> dict:
-    """Return deterministic mock suggestions based on inputs.
+class LocalProvider(SuggestionProvider):
+    """Deterministic mock suggestions based on the inputs.
 
     The goal is to emulate an AI assistant without external dependencies.
     The output is stable for the same combination of inputs.
     """
 
-    seed_input = (image_path or "") + "::" + (text_hint or "")
-    digest = hashlib.sha1(seed_input.encode("utf-8")).digest()
-    offset = digest[0] % len(_BASE_RESPONSE["tags"])
-    response = dict(_BASE_RESPONSE)
-    response["title"] = f"{response['title']} #{digest[1] % 9 + 1}"
-    response["tags"] = _rotate(response["tags"], offset)
-    return response
+    name = "local"
+
+    def describe(self, image_path: Optional[str] = None, text_hint: Optional[str] = None) -> dict:
+        seed_input = (image_path or "") + "::" + (text_hint or "")
+        digest = hashlib.sha1(seed_input.encode("utf-8")).digest()
+        offset = digest[0] % len(_BASE_RESPONSE["tags"])
+        response = dict(_BASE_RESPONSE)
+        response["title"] = f"{response['title']} #{digest[1] % 9 + 1}"
+        response["tags"] = _rotate(response["tags"], offset)
+        return response
+
+
+PROVIDERS: Dict[str, Type[SuggestionProvider]] = {"local": LocalProvider}
+
+
+@lru_cache(maxsize=None)
+def get_provider(name: Optional[str] = None) -> SuggestionProvider:
+    """Return the provider called ``name`` (``AI_PROVIDER`` by default)."""
+
+    name = name or settings.ai_provider
+    if name in PROVIDERS:
+        return PROVIDERS[name]()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown AI provider {name!r}; expected one of {', '.join(PROVIDERS)} or module:Class")
+    provider_class = getattr(importlib.import_module(module_name), class_name)
+    if not issubclass(provider_class, SuggestionProvider):
+        raise ValueError(f"{name} is not a SuggestionProvider")
+    return provider_class()
+
+
+def describe_item(image_path: Optional[str] = None, text_hint: Optional[str] = None) -> dict:
+    """Return suggestions from the configured provider."""
+
+    return get_provider().describe(image_path=image_path, text_hint=text_hint)
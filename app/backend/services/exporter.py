@@ -0,0 +1,117 @@
+"""Streaming export of items to CSV or JSON Lines."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from ..models.item import Item, ItemImage
+
+FORMATS = ("csv", "jsonl")
+CHUNK_ROWS = 1000
+
+EXPORT_COLUMNS = [
+    Item.id,
+    Item.short_id,
+    Item.title,
+    Item.description,
+    Item.tags,
+    Item.category,
+    Item.brand,
+    Item.model,
+    Item.serial_no,
+    Item.location,
+    Item.status,
+    Item.purchase_date,
+    Item.warranty_expiry,
+    Item.created_at,
+    Item.updated_at,
+]
+FIELDNAMES = [column.key for column in EXPORT_COLUMNS] + ["images"]
+
+
+def export_query() -> Select:
+    """Return the column-only select that export filters are applied to."""
+
+    return select(*EXPORT_COLUMNS)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    return str(value)
+
+
+def iter_export_rows(db: Session, query: Select, chunk_rows: int = CHUNK_ROWS) -> Iterator[List[Dict[str, Any]]]:
+    """Yield lists of row dicts, reading ``query`` through a server-side cursor.
+
+    Image paths are fetched with one query per chunk instead of a join, so an
+    item with many images does not multiply the row stream.
+    """
+
+    result = db.execute(query.execution_options(yield_per=chunk_rows))
+    for partition in result.partitions():
+        rows = [row._asdict() for row in partition]
+        images: Dict[Any, List[str]] = defaultdict(list)
+        image_rows = db.execute(
+            select(ItemImage.item_id, ItemImage.path)
+            .where(ItemImage.item_id.in_([row["id"] for row in rows]))
+            .order_by(ItemImage.created_at)
+        )
+        for item_id, path in image_rows:
+            images[item_id].append(path)
+        for row in rows:
+            row["images"] = images.get(row["id"], [])
+        yield [{key: _jsonable(value) for key, value in row.items()} for row in rows]
+
+
+def csv_chunks(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for rows in chunks:
+        for row in rows:
+            # Lists are written as JSON, which the importer reads back for tags.
+            row["tags"] = json.dumps(row["tags"] or [], ensure_ascii=False)
+            row["images"] = json.dumps(row["images"], ensure_ascii=False)
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def jsonl_chunks(chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream incrementally into gzip format."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(db: Session, query: Select, fmt: str, gzip: bool = False) -> Iterator[bytes]:
+    """Serialize ``query`` as ``fmt`` bytes, optionally gzip-compressed."""
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+    rows = iter_export_rows(db, query)
+    chunks = csv_chunks(rows) if fmt == "csv" else jsonl_chunks(rows)
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,61 @@
+"""Size-bounded derivatives of uploaded images."""
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+from PIL import Image, ImageOps
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class DerivativeSpec:
+    max_side: int
+    format: str
+    suffix: str
+    quality: int
+
+
+DERIVATIVE_SPECS: Dict[str, DerivativeSpec] = {
+    "thumb": DerivativeSpec(max_side=320, format="JPEG", suffix=".jpg", quality=80),
+    "medium": DerivativeSpec(max_side=1024, format="JPEG", suffix=".jpg", quality=82),
+    "webp": DerivativeSpec(max_side=1024, format="WEBP", suffix=".webp", quality=78),
+}
+
+
+def derivative_path(content_hash: str, name: str) -> Path:
+    spec = DERIVATIVE_SPECS[name]
+    return settings.media_dir / "derivatives" / content_hash[:2] / f"{content_hash}_{name}{spec.suffix}"
+
+
+def generate_derivatives(source: Path, content_hash: str) -> Dict[str, str]:
+    """Write every derivative of ``source`` and return their media-relative paths.
+
+    Derivatives are keyed by the source's content hash, so images shared by
+    several items are only processed once.
+    """
+
+    paths = {name: derivative_path(content_hash, name) for name in DERIVATIVE_SPECS}
+    missing = [name for name, path in paths.items() if not path.exists()]
+    if missing:
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original).convert("RGB")
+        for name in missing:
+            spec = DERIVATIVE_SPECS[name]
+            variant = image.copy()
+            variant.thumbnail((spec.max_side, spec.max_side), Image.Resampling.LANCZOS)
+            destination = paths[name]
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = destination.with_name(f".{uuid.uuid4().hex}.tmp")
+            try:
+                variant.save(tmp_path, spec.format, quality=spec.quality, optimize=True)
+                os.replace(tmp_path, destination)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+    return {name: str(path.relative_to(settings.media_dir)) for name, path in paths.items()}
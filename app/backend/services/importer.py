@@ -0,0 +1,142 @@
+"""Bulk import of items from CSV or JSON Lines."""
+from __future__ import annotations
+
+import csv
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..models.item import Item, allocate_short_ids
+from ..schemas.item import ItemCreate
+from ..utils.tags import parse_tags
+
+DEFAULT_BATCH_SIZE = 1000
+PRINT_CHUNK_SIZE = 500
+FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    item_ids: List[str] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """Guess the import format from a file name, defaulting to CSV."""
+
+    name = (filename or "").lower()
+    return "jsonl" if name.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Any]:
+    """Yield raw rows from ``stream`` without reading it all into memory.
+
+    JSON Lines that fail to parse are yielded as ``None`` so the importer can
+    report them against their row number.
+    """
+
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    elif fmt == "jsonl":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield None
+    else:
+        raise ValueError(f"Unsupported import format {fmt!r}")
+
+
+def _normalize(row: Dict[str, Any]) -> Dict[str, Any]:
+    # CSV has no nulls or lists: blank cells mean "not set" and tags may be a
+    # JSON list or comma-separated.
+    data = {key.strip(): value for key, value in row.items() if key}
+    data = {key: value for key, value in data.items() if value not in ("", None)}
+    if isinstance(data.get("tags"), str):
+        data["tags"] = parse_tags(data["tags"])
+    return data
+
+
+def _insert_batch(db: Session, batch: List[Dict[str, Any]]) -> None:
+    short_ids = allocate_short_ids(db.connection(), len(batch))
+    now = datetime.utcnow()
+    for values, short_id in zip(batch, short_ids):
+        values.update(id=uuid.uuid4(), short_id=short_id, created_at=now, updated_at=now)
+    db.execute(insert(Item), batch)
+
+
+def import_items(
+    db: Session,
+    rows: Iterable[Any],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> ImportReport:
+    """Validate ``rows`` against :class:`ItemCreate` and insert them in batches.
+
+    Each batch is committed on its own, so a database error only fails the rows
+    of that batch. Row numbers in the report start at 1 for the first data row.
+    """
+
+    report = ImportReport()
+    batch: List[Dict[str, Any]] = []
+    batch_rows: List[int] = []
+
+    def flush() -> None:
+        if not batch:
+            return
+        try:
+            _insert_batch(db, batch)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            report.errors.extend({"row": number, "errors": [str(exc)]} for number in batch_rows)
+        else:
+            report.imported += len(batch)
+            report.item_ids.extend(str(values["id"]) for values in batch)
+        batch.clear()
+        batch_rows.clear()
+
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            report.errors.append({"row": number, "errors": ["Row is not a JSON object"]})
+            continue
+        data = _normalize(row)
+        if not data:
+            continue
+        try:
+            item = ItemCreate.parse_obj(data)
+        except ValidationError as exc:
+            messages = [f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors()]
+            report.errors.append({"row": number, "errors": messages})
+            continue
+        batch.append(item.dict())
+        batch_rows.append(number)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return report
+
+
+def queue_label_printing(item_ids: List[str], size: str = "50x30", copies: int = 1) -> List[str]:
+    """Queue batch print jobs for imported items and return their task ids."""
+
+    from ..tasks.print_tasks import print_labels_batch, submit_print
+
+    job_ids = []
+    for start in range(0, len(item_ids), PRINT_CHUNK_SIZE):
+        chunk = item_ids[start : start + PRINT_CHUNK_SIZE]
+        task, _ = submit_print(print_labels_batch, size, item_ids=chunk, copies=copies)
+        job_ids.append(str(task.id))
+    return job_ids
@@ -0,0 +1,130 @@
+"""Column-only item reads serialized straight to JSON bytes.
+
+Listings and public pages skip ORM instances and pydantic models: they select
+plain columns, let the database aggregate each item's images, and encode the
+resulting dicts with orjson. The output matches ``ItemRead`` and
+``ItemPublic`` field for field.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import JSON, Select, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session, aliased
+
+from ..models.item import Item, ItemImage
+
+# In ``ItemRead`` field order, so the JSON matches the pydantic output.
+ITEM_COLUMNS = [
+    Item.title,
+    Item.description,
+    Item.tags,
+    Item.category,
+    Item.brand,
+    Item.model,
+    Item.serial_no,
+    Item.location,
+    Item.status,
+    Item.purchase_date,
+    Item.warranty_expiry,
+    Item.id,
+    Item.short_id,
+    Item.created_at,
+    Item.updated_at,
+]
+PUBLIC_COLUMNS = [Item.short_id, Item.title, Item.description, Item.tags, Item.location, Item.status]
+
+
+def _images_column(dialect: str):
+    """Return a correlated subquery aggregating an item's images into a JSON array.
+
+    Each image is a ``[id, path, created_at, derivatives]`` array, oldest first.
+    """
+
+    if dialect == "postgresql":
+        image = func.json_build_array(ItemImage.id, ItemImage.path, ItemImage.created_at, ItemImage.derivatives)
+        aggregate = func.json_agg(aggregate_order_by(image, ItemImage.created_at, ItemImage.id), type_=JSON)
+        return select(aggregate).where(ItemImage.item_id == Item.id).scalar_subquery()
+
+    # SQLite cannot order inside an aggregate, so it aggregates an ordered subquery.
+    ordered = (
+        select(ItemImage.id, ItemImage.path, ItemImage.created_at, ItemImage.derivatives)
+        .where(ItemImage.item_id == Item.id)
+        .order_by(ItemImage.created_at, ItemImage.id)
+        .correlate(Item)
+        .subquery()
+    )
+    image = func.json_array(ordered.c.id, ordered.c.path, ordered.c.created_at, func.json(ordered.c.derivatives))
+    return select(func.json_group_array(image, type_=JSON)).scalar_subquery()
+
+
+def items_query(dialect: str) -> Select:
+    """Return the listing select; filters and ordering are applied by the caller."""
+
+    return select(*ITEM_COLUMNS, _images_column(dialect).label("images"))
+
+
+def _image(raw: List[Any]) -> Dict[str, Any]:
+    image_id, path, created_at, derivatives = raw
+    return {
+        "id": uuid.UUID(image_id),
+        "path": path,
+        "created_at": datetime.fromisoformat(created_at),
+        "derivatives": derivatives or {},
+    }
+
+
+def item_dict(row: Any) -> Dict[str, Any]:
+    """Turn a row of :func:`items_query` into an ``ItemRead``-shaped dict."""
+
+    values = row._asdict()
+    values["tags"] = values["tags"] or []
+    values["images"] = [_image(image) for image in values["images"] or ()]
+    return values
+
+
+def encode_item(row: Any) -> bytes:
+    return orjson.dumps(item_dict(row))
+
+
+def encode_items(rows: Iterable[Any]) -> bytes:
+    """Encode rows of :func:`items_query` as a JSON array."""
+
+    return orjson.dumps([item_dict(row) for row in rows])
+
+
+def public_item_values(db: Session, short_id: str, media_url: str) -> Optional[dict]:
+    """Return the ``ItemPublic`` fields for ``short_id``, or ``None`` if it does not exist.
+
+    Only the item's first image is read, with one indexed lookup.
+    """
+
+    first = aliased(ItemImage)
+    first_image_id = (
+        select(first.id).where(first.item_id == Item.id).order_by(first.created_at, first.id).limit(1).scalar_subquery()
+    )
+    row = db.execute(
+        select(*PUBLIC_COLUMNS, ItemImage.path, ItemImage.derivatives)
+        .outerjoin(ItemImage, ItemImage.id == first_image_id)
+        .where(Item.short_id == short_id)
+    ).one_or_none()
+    if row is None:
+        return None
+    values = row._asdict()
+    path = values.pop("path")
+    derivatives = values.pop("derivatives") or {}
+    values["tags"] = values["tags"] or []
+    values["primary_image"] = media_url + path if path else None
+    values["primary_image_derivatives"] = {name: media_url + value for name, value in derivatives.items()} if path else {}
+    return values
+
+
+def public_item_payload(db: Session, short_id: str, media_url: str) -> Optional[bytes]:
+    """Return the ``ItemPublic`` JSON for ``short_id``, or ``None`` if it does not exist."""
+
+    values = public_item_values(db, short_id, media_url)
+    return None if values is None else orjson.dumps(values)
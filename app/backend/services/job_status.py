@@ -0,0 +1,141 @@
+"""Print job status records and their fan-out to API subscribers.
+
+Workers (and the API when it queues a job) publish each state change to a
+Redis channel and keep the latest state under a per-job key. Each API process
+runs a single channel subscriber and forwards updates to the SSE clients
+watching the affected jobs.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+
+from ..core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RENDERING = "rendering"
+SPOOLING = "spooling"
+DONE = "done"
+FAILED = "failed"
+STATES = (QUEUED, RENDERING, SPOOLING, DONE, FAILED)
+TERMINAL_STATES = (DONE, FAILED)
+
+CHANNEL = "job-status"
+KEY_PREFIX = "job-status:"
+STATUS_TTL = 24 * 60 * 60
+# The subscriber backs off exponentially between reconnects and stops after
+# this many consecutive failures; the next SSE client starts it again.
+RECONNECT_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+RECONNECT_ATTEMPTS = 8
+
+
+def status_record(job_id: str, state: str, **detail: object) -> dict:
+    if state not in STATES:
+        raise ValueError(f"Unknown job state {state!r}")
+    return {"job_id": job_id, "state": state, "updated_at": time.time(), **detail}
+
+
+class JobStatusPublisher:
+    """Synchronous writer used by Celery tasks and signal handlers."""
+
+    def __init__(self, client: Optional[redis.Redis] = None) -> None:
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.redis_url, socket_timeout=1)
+        return self._client
+
+    def publish(self, job_id: str, state: str, **detail: object) -> None:
+        """Record and broadcast a state change; Redis errors are only logged.
+
+        Status updates are advisory, so an unavailable Redis must never fail
+        the print job itself.
+        """
+
+        payload = json.dumps(status_record(job_id, state, **detail))
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.set(KEY_PREFIX + job_id, payload, ex=STATUS_TTL)
+            pipe.publish(CHANNEL, payload)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Could not publish status %s for job %s", state, job_id, exc_info=True)
+
+    def get_many(self, job_ids: Iterable[str]) -> List[dict]:
+        keys = [KEY_PREFIX + job_id for job_id in job_ids]
+        if not keys:
+            return []
+        return [json.loads(raw) for raw in self.client.mget(keys) if raw is not None]
+
+
+class JobStatusHub:
+    """Fans one Redis subscription out to per-client asyncio queues."""
+
+    def __init__(self, url: Optional[str] = None) -> None:
+        self.url = url
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    async def _listen(self) -> None:
+        failures = 0
+        while True:
+            client = aioredis.Redis.from_url(self.url or settings.redis_url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    failures = 0
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(json.loads(message["data"]))
+            except aioredis.RedisError:
+                failures += 1
+                if failures >= RECONNECT_ATTEMPTS:
+                    # Watchers still see progress through their heartbeat re-reads.
+                    logger.error("Job status subscription failed %d times; giving up", failures, exc_info=True)
+                    return
+                logger.warning("Job status subscription lost; reconnecting", exc_info=True)
+            finally:
+                await client.aclose()
+            if failures:
+                await asyncio.sleep(min(RECONNECT_DELAY * 2 ** (failures - 1), RECONNECT_MAX_DELAY))
+
+    def dispatch(self, status: dict) -> None:
+        for queue in self._subscribers.get(status.get("job_id"), ()):
+            queue.put_nowait(status)
+
+    @asynccontextmanager
+    async def subscribe(self, job_ids: Iterable[str]) -> AsyncIterator[asyncio.Queue]:
+        """Yield a queue receiving every status published for ``job_ids``."""
+
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        queue: asyncio.Queue = asyncio.Queue()
+        ids = set(job_ids)
+        for job_id in ids:
+            self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            for job_id in ids:
+                watchers = self._subscribers.get(job_id)
+                if watchers is not None:
+                    watchers.discard(queue)
+                    if not watchers:
+                        del self._subscribers[job_id]
+
+
+job_status = JobStatusPublisher()
+job_status_hub = JobStatusHub()
@@ -0,0 +1,173 @@
+"""Content-addressed on-disk cache for rendered labels."""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterator, Tuple
+
+from ..core.config import get_settings
+from ..core.metrics import CACHE_REQUESTS
+from ..models.item import Item
+from .label_formats import get_format
+from .label_templates import get_template
+from .labels import render_label
+
+settings = get_settings()
+
+
+def label_cache_key(
+    item: Item, size_mm: Tuple[int, int], public_base_url: str, fmt: str = "pdf", dpi: int | None = None
+) -> str:
+    """Return a hash of every field that ends up printed on the label."""
+
+    payload = {
+        "title": item.title,
+        "description": item.description,
+        "short_id": item.short_id,
+        "serial_no": item.serial_no,
+        "location": item.location,
+        "size": list(size_mm),
+        "format": fmt,
+        "public_base_url": public_base_url.rstrip("/"),
+        "template": dataclasses.asdict(get_template(tuple(size_mm), dpi)),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LabelCache:
+    """Size-bounded LRU cache of rendered labels keyed by :func:`label_cache_key`.
+
+    Recency is tracked through file modification times, so the cache is shared
+    by every worker process using the same media directory. Eviction runs in a
+    background thread once a store pushes the cache over ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path | None = None, max_bytes: int | None = None) -> None:
+        self._directory = directory
+        self.max_bytes = settings.label_cache_max_bytes if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._evicting = threading.Event()
+        self._approx_bytes: int | None = None
+
+    @property
+    def directory(self) -> Path:
+        directory = self._directory or settings.media_dir / "labels" / "cache"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def path_for(self, key: str, suffix: str = ".pdf") -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def _entries(self) -> Iterator[Path]:
+        # Dot-files are renders still being written.
+        return self.directory.glob("[!.]*")
+
+    def get(self, key: str, suffix: str = ".pdf") -> Path | None:
+        """Return the cached label for ``key`` and mark it as recently used."""
+
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            CACHE_REQUESTS.labels(cache="label", result="miss").inc()
+            return None
+        with self._lock:
+            self.hits += 1
+        CACHE_REQUESTS.labels(cache="label", result="hit").inc()
+        return path
+
+    def render(
+        self,
+        item: Item,
+        size_mm: Tuple[int, int],
+        public_base_url: str | None = None,
+        fmt: str = "pdf",
+        dpi: int | None = None,
+    ) -> Path:
+        """Return a cached label in ``fmt`` for ``item``, rendering it on a miss."""
+
+        label_format = get_format(fmt)
+        base_url = public_base_url or settings.public_base_url
+        key = label_cache_key(item, size_mm, base_url, label_format.name, dpi)
+        cached = self.get(key, label_format.suffix)
+        if cached is not None:
+            return cached
+
+        path = self.path_for(key, label_format.suffix)
+        tmp_path = path.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        try:
+            render_label(
+                item, size_mm=size_mm, public_base_url=base_url, fmt=label_format, destination=tmp_path, dpi=dpi
+            )
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self._schedule_eviction(path.stat().st_size)
+        return path
+
+    def size_bytes(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits ``max_bytes``.
+
+        Returns the number of files removed.
+        """
+
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        with self._lock:
+            self._approx_bytes = total
+        return removed
+
+    def _schedule_eviction(self, added_bytes: int) -> None:
+        # The running total only counts this process's writes; a full rescan
+        # happens on first use and whenever eviction runs.
+        with self._lock:
+            if self._approx_bytes is None:
+                self._approx_bytes = self.size_bytes()
+            else:
+                self._approx_bytes += added_bytes
+            over_budget = self._approx_bytes > self.max_bytes
+        if not over_budget or self._evicting.is_set():
+            return
+        self._evicting.set()
+
+        def run() -> None:
+            try:
+                self.evict()
+            finally:
+                self._evicting.clear()
+
+        threading.Thread(target=run, name="label-cache-evict", daemon=True).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "max_bytes": self.max_bytes}
+
+
+label_cache = LabelCache()
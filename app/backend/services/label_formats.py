@@ -0,0 +1,105 @@
+"""Output formats for rendered labels.
+
+``pdf`` is the original full-colour raster PDF. The other formats render on a
+1-bit canvas end to end, which is what monochrome thermal printers print
+anyway: ``pdf-g4`` and ``png`` are CCITT G4 / 1-bit encoded images for CUPS,
+while ``zpl`` and ``tspl`` are raw printer languages sent without conversion.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import io
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class LabelFormat:
+    name: str
+    mode: str
+    suffix: str
+    multi_page: bool = True
+    # Raw formats are printer languages that the spooler must pass through untouched.
+    raw: bool = False
+
+
+LABEL_FORMATS: Dict[str, LabelFormat] = {
+    "pdf": LabelFormat("pdf", mode="RGB", suffix=".pdf"),
+    "pdf-g4": LabelFormat("pdf-g4", mode="1", suffix=".pdf"),
+    "png": LabelFormat("png", mode="1", suffix=".png", multi_page=False),
+    "zpl": LabelFormat("zpl", mode="1", suffix=".zpl", raw=True),
+    "tspl": LabelFormat("tspl", mode="1", suffix=".tspl", raw=True),
+}
+
+
+_INVERT = bytes(255 - value for value in range(256))
+
+
+def get_format(name: str) -> LabelFormat:
+    """Return the format called ``name``, raising ``ValueError`` if unknown."""
+
+    try:
+        return LABEL_FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown label format {name!r}; expected one of {', '.join(LABEL_FORMATS)}") from None
+
+
+def _pad_to_bytes(image: Image.Image) -> Image.Image:
+    # Row padding bits would otherwise print as a black strip on the right.
+    width = -(-image.width // 8) * 8
+    if width == image.width:
+        return image
+    padded = Image.new("1", (width, image.height), 1)
+    padded.paste(image, (0, 0))
+    return padded
+
+
+def zpl_page(image: Image.Image) -> bytes:
+    """Encode a 1-bit image as a ZPL label using a compressed ``^GF`` field."""
+
+    # ZPL prints set bits; Pillow's 1-bit images use set bits for white.
+    bitmap = _pad_to_bytes(image.convert("1"))
+    data = bitmap.tobytes().translate(_INVERT)
+    row_bytes = bitmap.width // 8
+    encoded = base64.b64encode(zlib.compress(data))
+    crc = binascii.crc_hqx(encoded, 0)
+    field = f"{len(data)},{len(data)},{row_bytes},:Z64:{encoded.decode('ascii')}:{crc:04x}"
+    return f"^XA^PW{image.width}^LL{image.height}^FO0,0^GFA,{field}^FS^XZ\n".encode("ascii")
+
+
+def tspl_page(image: Image.Image, size_mm: Tuple[int, int]) -> bytes:
+    """Encode a 1-bit image as a TSPL label using a ``BITMAP`` command."""
+
+    # TSPL bitmaps use cleared bits for printed dots, matching Pillow's layout.
+    bitmap = _pad_to_bytes(image.convert("1"))
+    header = (
+        f"SIZE {size_mm[0]} mm,{size_mm[1]} mm\r\n"
+        "CLS\r\n"
+        f"BITMAP 0,0,{bitmap.width // 8},{bitmap.height},0,"
+    ).encode("ascii")
+    return header + bitmap.tobytes() + b"\r\nPRINT 1\r\n"
+
+
+def encode_labels(pages: Sequence[Image.Image], fmt: LabelFormat, size_mm: Tuple[int, int], dpi: int) -> bytes:
+    """Encode rendered label canvases as one document in ``fmt``."""
+
+    if not pages:
+        raise ValueError("At least one page is required")
+    if len(pages) > 1 and not fmt.multi_page:
+        raise ValueError(f"The {fmt.name} format holds a single label")
+    if fmt.name == "zpl":
+        return b"".join(zpl_page(page) for page in pages)
+    if fmt.name == "tspl":
+        return b"".join(tspl_page(page, size_mm) for page in pages)
+
+    buffer = io.BytesIO()
+    if fmt.name == "png":
+        pages[0].save(buffer, "PNG", optimize=True, dpi=(dpi, dpi))
+    else:
+        # Pillow writes 1-bit pages with CCITT G4 compression when built with libtiff.
+        pages[0].save(buffer, "PDF", resolution=dpi, save_all=True, append_images=list(pages[1:]))
+    return buffer.getvalue()
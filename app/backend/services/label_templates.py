@@ -0,0 +1,208 @@
+"""Declarative label templates compiled into reusable layouts."""
+from __future__ import annotations
+
+import json
+import math
+import re
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import ImageFont
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+LABEL_DPI = 300
+MIN_SIZE_MM = 15
+MAX_SIZE_MM = 200
+
+SIZE_PRESETS = {
+    "50x30": (50, 30),
+    "40x30": (40, 30),
+    "62x30": (62, 30),
+}
+
+# Item fields a label can carry as a Code128 next to the QR code.
+BARCODE_FIELDS = ("short_id", "serial_no")
+# Narrowest Code128 bar that handheld scanners read reliably; a barcode that
+# would need thinner bars is left off the label.
+MIN_BARCODE_MODULE_MM = 0.15
+
+_SIZE_RE = re.compile(r"^(\d{1,3})x(\d{1,3})$")
+
+# Layout constants below are tuned for 30 mm tall labels; other heights scale
+# them proportionally.
+_REFERENCE_HEIGHT_MM = 30
+
+
+@lru_cache(maxsize=None)
+def load_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
+    """Load a system font with graceful fallback, once per process."""
+
+    try:
+        if bold:
+            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+    except Exception:  # pragma: no cover - fallback path
+        return ImageFont.load_default()
+
+
+@dataclass(frozen=True)
+class LabelTemplate:
+    """Layout parameters for one label size, in pixels at ``dpi``."""
+
+    width_mm: int
+    height_mm: int
+    dpi: int = LABEL_DPI
+    margin: int = 10
+    padding: int = 20
+    title_size: int = 48
+    body_size: int = 28
+    small_size: int = 24
+    meta_offset: int = 60
+    description_offset: int = 110
+    footer_offset: int = 40
+    title_chars: int = 60
+    description_chars: int = 140
+    # One of BARCODE_FIELDS to print as a Code128 above the footer; ``None`` for none.
+    barcode: Optional[str] = None
+    barcode_size: int = 60
+
+    def __post_init__(self) -> None:
+        if self.barcode is not None and self.barcode not in BARCODE_FIELDS:
+            raise ValueError(f"barcode must be one of {', '.join(BARCODE_FIELDS)}")
+
+    @classmethod
+    def for_size(cls, width_mm: int, height_mm: int, dpi: int = LABEL_DPI) -> "LabelTemplate":
+        """Return the default template scaled to an arbitrary label size and resolution."""
+
+        base = cls(width_mm=width_mm, height_mm=height_mm, dpi=dpi, barcode=settings.label_barcode)
+        return base._scaled(height_mm / _REFERENCE_HEIGHT_MM * dpi / LABEL_DPI)
+
+    def at_dpi(self, dpi: int) -> "LabelTemplate":
+        """Return this template with its pixel measures rescaled to ``dpi``."""
+
+        return replace(self._scaled(dpi / self.dpi), dpi=dpi)
+
+    def _scaled(self, scale: float) -> "LabelTemplate":
+        if scale == 1:
+            return self
+        scaled = {
+            field.name: max(1, round(getattr(self, field.name) * scale))
+            for field in fields(self)
+            if field.name.endswith(("_size", "_offset")) or field.name in ("margin", "padding")
+        }
+        return replace(self, **scaled)
+
+
+@dataclass(frozen=True)
+class CompiledLabelTemplate:
+    """Pixel geometry and loaded fonts for a :class:`LabelTemplate`."""
+
+    template: LabelTemplate
+    width_px: int
+    height_px: int
+    qr_size: int
+    qr_origin: Tuple[int, int]
+    title_origin: Tuple[int, int]
+    meta_origin: Tuple[int, int]
+    description_origin: Tuple[int, int]
+    footer_origin: Tuple[int, int]
+    barcode_origin: Tuple[int, int]
+    barcode_width: int
+    barcode_min_module: int
+    title_font: ImageFont.ImageFont
+    body_font: ImageFont.ImageFont
+    small_font: ImageFont.ImageFont
+
+
+def compile_template(template: LabelTemplate) -> CompiledLabelTemplate:
+    """Resolve ``template`` into absolute positions and preloaded fonts."""
+
+    width_px = int(template.width_mm / 25.4 * template.dpi)
+    height_px = int(template.height_mm / 25.4 * template.dpi)
+    qr_size = min(height_px - 2 * template.margin, width_px // 2)
+    qr_x = template.margin
+    qr_y = (height_px - qr_size) // 2
+    text_x = qr_x + qr_size + template.padding
+    footer_y = height_px - template.footer_offset
+    return CompiledLabelTemplate(
+        template=template,
+        width_px=width_px,
+        height_px=height_px,
+        qr_size=qr_size,
+        qr_origin=(qr_x, qr_y),
+        title_origin=(text_x, qr_y),
+        meta_origin=(text_x, qr_y + template.meta_offset),
+        description_origin=(text_x, qr_y + template.description_offset),
+        footer_origin=(text_x, footer_y),
+        barcode_origin=(text_x, footer_y - template.margin - template.barcode_size),
+        barcode_width=width_px - text_x - template.margin,
+        barcode_min_module=math.ceil(MIN_BARCODE_MODULE_MM / 25.4 * template.dpi),
+        title_font=load_font(template.title_size, bold=True),
+        body_font=load_font(template.body_size),
+        small_font=load_font(template.small_size),
+    )
+
+
+def _load_configured_templates(path: Optional[Path]) -> Dict[Tuple[int, int], LabelTemplate]:
+    """Read template overrides keyed by ``WxH`` from a JSON file."""
+
+    if path is None:
+        return {}
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    templates = {}
+    for name, overrides in raw.items():
+        size_mm = parse_size(name)
+        base = LabelTemplate.for_size(*size_mm, dpi=overrides.get("dpi", LABEL_DPI))
+        templates[size_mm] = replace(base, **overrides)
+    return templates
+
+
+@lru_cache(maxsize=None)
+def _declared_templates() -> Dict[Tuple[int, int], LabelTemplate]:
+    templates = {size_mm: LabelTemplate.for_size(*size_mm) for size_mm in SIZE_PRESETS.values()}
+    templates.update(_load_configured_templates(settings.label_templates_path))
+    return templates
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """Parse a ``WxH`` millimetre size, raising ``ValueError`` when out of range."""
+
+    if size in SIZE_PRESETS:
+        return SIZE_PRESETS[size]
+    match = _SIZE_RE.match(size)
+    if not match:
+        raise ValueError(f"Invalid label size {size!r}")
+    width_mm, height_mm = int(match.group(1)), int(match.group(2))
+    for value in (width_mm, height_mm):
+        if not MIN_SIZE_MM <= value <= MAX_SIZE_MM:
+            raise ValueError(f"Label dimensions must be between {MIN_SIZE_MM} and {MAX_SIZE_MM} mm")
+    return width_mm, height_mm
+
+
+def get_template(size_mm: Tuple[int, int], dpi: Optional[int] = None) -> LabelTemplate:
+    """Return the declared template for ``size_mm`` or a scaled default.
+
+    ``dpi`` rescales the template for printers with a different resolution.
+    """
+
+    template = _declared_templates().get(tuple(size_mm)) or LabelTemplate.for_size(*size_mm)
+    return template if dpi is None or dpi == template.dpi else template.at_dpi(dpi)
+
+
+@lru_cache(maxsize=64)
+def get_compiled_template(size_mm: Tuple[int, int], dpi: Optional[int] = None) -> CompiledLabelTemplate:
+    """Return the compiled layout for ``size_mm``, compiling it on first use."""
+
+    return compile_template(get_template(size_mm, dpi))
+
+
+def preload_templates() -> None:
+    """Compile every declared template so fonts are parsed before the first job."""
+
+    for size_mm in _declared_templates():
+        get_compiled_template(size_mm)
@@ -1,90 +1,188 @@
 """Label rendering helpers."""
 from __future__ import annotations
 
+import uuid
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Sequence, Tuple
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
 from ..core.config import get_settings
+from ..core.metrics import LABEL_RENDER_SECONDS
 from ..models.item import Item
-from .qrcode_utils import make_qr_png
+from .label_formats import LabelFormat, encode_labels, get_format
+from .label_templates import SIZE_PRESETS, CompiledLabelTemplate, get_compiled_template
+from .qrcode_utils import draw_code128, draw_qr
 
 settings = get_settings()
 
 
-def _load_font(size: int, bold: bool = False) -> ImageFont.ImageFont:
-    """Load a system font with graceful fallback."""
-
-    try:
-        if bold:
-            return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", size)
-        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
-    except Exception:  # pragma: no cover - fallback path
-        return ImageFont.load_default()
-
-
 def _truncate(text: str, max_chars: int) -> str:
     return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
 
 
-SIZE_PRESETS = {
-    "50x30": (50, 30),
-    "40x30": (40, 30),
-    "62x30": (62, 30),
-}
+def render_label_image(
+    item: Item,
+    size_mm: Tuple[int, int] | None = None,
+    public_base_url: str | None = None,
+    mode: str = "RGB",
+    dpi: int | None = None,
+) -> Image.Image:
+    """Draw the label for ``item`` onto a fresh canvas in ``mode`` and return it.
 
-
-def render_label_pdf(item: Item, size_mm: Tuple[int, int] | None = None, public_base_url: str | None = None) -> Path:
-    """Render the label into a PDF and return the path."""
+    Use mode ``"1"`` for monochrome printers: everything, including the QR
+    code, is then drawn without colour or anti-aliasing. ``dpi`` overrides the
+    template resolution to match the target printer.
+    """
 
     if size_mm is None:
         size_mm = SIZE_PRESETS["50x30"]
-    width_mm, height_mm = size_mm
-    dpi = 300
-    width_px = int(width_mm / 25.4 * dpi)
-    height_px = int(height_mm / 25.4 * dpi)
+    with LABEL_RENDER_SECONDS.labels(size=f"{size_mm[0]}x{size_mm[1]}").time():
+        return _draw_label(item, get_compiled_template(tuple(size_mm), dpi), public_base_url, mode)
 
-    canvas = Image.new("RGB", (width_px, height_px), "white")
-    draw = ImageDraw.Draw(canvas)
-
-    public_url = (public_base_url or settings.public_base_url).rstrip("/") + f"/i/{item.short_id}"
-    qr_img = make_qr_png(public_url, box_size=max(2, width_px // 120))
-    qr_size = min(height_px - 20, width_px // 2)
-    qr_img = qr_img.resize((qr_size, qr_size))
-    qr_x = 10
-    qr_y = (height_px - qr_size) // 2
-    canvas.paste(qr_img, (qr_x, qr_y))
 
-    padding = 20
-    text_x = qr_x + qr_size + padding
+def _draw_label(item: Item, layout: CompiledLabelTemplate, public_base_url: str | None, mode: str) -> Image.Image:
+    template = layout.template
 
-    title_font = _load_font(48, bold=True)
-    body_font = _load_font(28)
-    small_font = _load_font(24)
+    canvas = Image.new(mode, (layout.width_px, layout.height_px), "white")
+    draw = ImageDraw.Draw(canvas)
 
-    title = _truncate(item.title or "Untitled Item", 60)
-    draw.text((text_x, qr_y), title, fill="black", font=title_font)
+    public_url = (public_base_url or settings.public_base_url).rstrip("/") + f"/i/{item.short_id}"
+    draw_qr(canvas, public_url, layout.qr_origin, layout.qr_size)
+
+    barcode_value = getattr(item, template.barcode) if template.barcode else None
+    if barcode_value:
+        try:
+            draw_code128(
+                canvas,
+                barcode_value,
+                layout.barcode_origin,
+                layout.barcode_width,
+                template.barcode_size,
+                min_scale=layout.barcode_min_module,
+            )
+        except ValueError:
+            # Too long to print legibly on this label; the value is still printed as text where it is shown.
+            pass
+
+    title = _truncate(item.title or "Untitled Item", template.title_chars)
+    draw.text(layout.title_origin, title, fill="black", font=layout.title_font)
 
     meta_text = f"#{item.short_id} • Loc: {item.location or '-'}"
-    draw.text((text_x, qr_y + 60), meta_text, fill="black", font=body_font)
+    draw.text(layout.meta_origin, meta_text, fill="black", font=layout.body_font)
 
     short_url = public_url.replace("http://", "").replace("https://", "")
-    draw.text((text_x, height_px - 40), short_url, fill="black", font=small_font)
+    draw.text(layout.footer_origin, short_url, fill="black", font=layout.small_font)
 
     # Optional: wrap description
-    desc = _truncate(item.description or "", 140)
+    desc = _truncate(item.description or "", template.description_chars)
     draw.multiline_text(
-        (text_x, qr_y + 110),
+        layout.description_origin,
         desc,
         fill="black",
-        font=body_font,
+        font=layout.body_font,
         spacing=4,
     )
+    return canvas
+
 
+def _labels_dir() -> Path:
     labels_dir = settings.media_dir / "labels"
     labels_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"label_{item.id}_{width_mm}x{height_mm}.pdf"
-    pdf_path = labels_dir / filename
-    canvas.save(pdf_path, "PDF", resolution=dpi)
-    return pdf_path
+    return labels_dir
+
+
+def _resolve_format(fmt: str | LabelFormat) -> LabelFormat:
+    return fmt if isinstance(fmt, LabelFormat) else get_format(fmt)
+
+
+def render_label(
+    item: Item,
+    size_mm: Tuple[int, int] | None = None,
+    public_base_url: str | None = None,
+    fmt: str | LabelFormat = "pdf",
+    destination: Path | None = None,
+    dpi: int | None = None,
+) -> Path:
+    """Render the label in ``fmt`` and return the path.
+
+    The file is written to ``destination`` when given, otherwise to a per-item
+    file under ``media/labels``.
+    """
+
+    if size_mm is None:
+        size_mm = SIZE_PRESETS["50x30"]
+    label_format = _resolve_format(fmt)
+    width_mm, height_mm = size_mm
+    layout = get_compiled_template(tuple(size_mm), dpi)
+    canvas = render_label_image(
+        item, size_mm=size_mm, public_base_url=public_base_url, mode=label_format.mode, dpi=dpi
+    )
+
+    path = destination or _labels_dir() / f"label_{item.id}_{width_mm}x{height_mm}{label_format.suffix}"
+    path.write_bytes(encode_labels([canvas], label_format, size_mm, layout.template.dpi))
+    return path
+
+
+def render_label_pdf(
+    item: Item,
+    size_mm: Tuple[int, int] | None = None,
+    public_base_url: str | None = None,
+    destination: Path | None = None,
+) -> Path:
+    """Render the label into a full-colour PDF and return the path."""
+
+    return render_label(item, size_mm=size_mm, public_base_url=public_base_url, destination=destination)
+
+
+def render_labels(
+    items: Sequence[Item],
+    size_mm: Tuple[int, int] | None = None,
+    public_base_url: str | None = None,
+    batch_id: str | None = None,
+    on_page: Callable[[int, Item], None] | None = None,
+    fmt: str | LabelFormat = "pdf",
+    dpi: int | None = None,
+) -> Path:
+    """Render several labels into one document in ``fmt`` and return the path.
+
+    ``on_page`` is called with the zero-based page index and the item after
+    each label has been drawn, which lets callers report progress.
+    """
+
+    if not items:
+        raise ValueError("At least one item is required")
+    if size_mm is None:
+        size_mm = SIZE_PRESETS["50x30"]
+    label_format = _resolve_format(fmt)
+    if len(items) > 1 and not label_format.multi_page:
+        raise ValueError(f"The {label_format.name} format holds a single label")
+    width_mm, height_mm = size_mm
+
+    pages: list[Image.Image] = []
+    for index, item in enumerate(items):
+        pages.append(
+            render_label_image(
+                item, size_mm=size_mm, public_base_url=public_base_url, mode=label_format.mode, dpi=dpi
+            )
+        )
+        if on_page is not None:
+            on_page(index, item)
+
+    filename = f"labels_{batch_id or uuid.uuid4()}_{width_mm}x{height_mm}{label_format.suffix}"
+    path = _labels_dir() / filename
+    resolution = get_compiled_template(tuple(size_mm), dpi).template.dpi
+    path.write_bytes(encode_labels(pages, label_format, size_mm, resolution))
+    return path
+
+
+def render_labels_pdf(
+    items: Sequence[Item],
+    size_mm: Tuple[int, int] | None = None,
+    public_base_url: str | None = None,
+    batch_id: str | None = None,
+    on_page: Callable[[int, Item], None] | None = None,
+) -> Path:
+    """Render several labels into one full-colour multi-page PDF."""
+
+    return render_labels(items, size_mm=size_mm, public_base_url=public_base_url, batch_id=batch_id, on_page=on_page)
@@ -0,0 +1,114 @@
+"""Coalescing of single-label print jobs into one spool document.
+
+Jobs are buffered in a Redis list per printer, size and format, shared by all
+worker processes. The first job in an empty buffer schedules a flush after the
+coalescing window; reaching the job limit flushes immediately.
+"""
+from __future__ import annotations
+
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.item import Item
+
+settings = get_settings()
+
+Outcome = Union[dict, Exception]
+
+
+@dataclass
+class PrintJob:
+    task_id: str
+    item_id: str
+    copies: int = 1
+
+    def dumps(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, raw: Union[str, bytes]) -> "PrintJob":
+        return cls(**json.loads(raw))
+
+
+class JobBuffer:
+    """Redis lists of pending :class:`PrintJob` entries keyed by target."""
+
+    def __init__(self, client: Optional[redis.Redis] = None, prefix: str = "print-coalesce:") -> None:
+        self._client = client
+        self.prefix = prefix
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(settings.redis_url)
+        return self._client
+
+    def key(self, printer: str, size: str, fmt: str) -> str:
+        return f"{self.prefix}{printer}|{size}|{fmt}"
+
+    def push(self, key: str, job: PrintJob) -> int:
+        """Append ``job`` and return the number of jobs now waiting."""
+
+        return self.client.rpush(key, job.dumps())
+
+    def take(self, key: str, limit: int) -> List[PrintJob]:
+        """Atomically remove and return up to ``limit`` jobs in arrival order."""
+
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrange(key, 0, limit - 1)
+        pipe.ltrim(key, limit, -1)
+        raw, _ = pipe.execute()
+        return [PrintJob.loads(entry) for entry in raw]
+
+    def pending(self, key: str) -> int:
+        return self.client.llen(key)
+
+
+def print_jobs(
+    session: Session,
+    jobs: Sequence[PrintJob],
+    render: Callable[[List[Item]], object],
+    spool: Callable[[object], dict],
+) -> Dict[str, Outcome]:
+    """Print ``jobs`` as one document and return the outcome per task id.
+
+    Each job contributes ``copies`` consecutive pages, in job order. Jobs whose
+    item no longer exists fail on their own; a render or spool error fails
+    every remaining job.
+    """
+
+    wanted = {uuid.UUID(job.item_id) for job in jobs}
+    rows = session.execute(select(Item).where(Item.id.in_(wanted))).scalars().unique()
+    found = {item.id: item for item in rows}
+
+    outcomes: Dict[str, Outcome] = {}
+    pages: List[Item] = []
+    printable: List[PrintJob] = []
+    for job in jobs:
+        item = found.get(uuid.UUID(job.item_id))
+        if item is None:
+            outcomes[job.task_id] = ValueError(f"Item {job.item_id} not found")
+            continue
+        pages.extend([item] * job.copies)
+        printable.append(job)
+    if not printable:
+        return outcomes
+
+    try:
+        result = spool(render(pages))
+    except Exception as exc:
+        outcomes.update({job.task_id: exc for job in printable})
+        return outcomes
+    for job in printable:
+        outcomes[job.task_id] = {**result, "coalesced": len(printable), "pages": len(pages)}
+    return outcomes
+
+
+job_buffer = JobBuffer()
@@ -0,0 +1,205 @@
+"""Registry of label printers, their capabilities and job routing.
+
+Printers are declared in a JSON file (``PRINTERS_PATH``)::
+
+    [{"name": "office", "uri": "socket://10.0.0.5:9100", "language": "zpl",
+      "dpi": 203, "sizes": ["50x30", "62x30"], "locations": ["Office"]}]
+
+Without one, the single printer configured by ``LABEL_PRINTER``/
+``LABEL_PRINTER_URI`` is registered as ``default``. Each printer has its own
+Celery queue plus a priority queue that its workers consume first.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+import redis
+
+from ..core.config import get_settings
+from ..utils.lru import LRUCache
+from .label_formats import get_format
+from .label_templates import LABEL_DPI, parse_size
+from .printers import check_language, default_printer_uri, get_transport
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+QUEUE_PREFIX = "print."
+STATUS_TTL = 10.0
+PROBE_WORKERS = 4
+
+
+class NoPrinterAvailable(LookupError):
+    """Raised when no registered printer can take a job."""
+
+
+@dataclass(frozen=True)
+class Printer:
+    name: str
+    uri: str
+    language: str = "pdf"
+    dpi: int = LABEL_DPI
+    # Empty means any size.
+    sizes: Tuple[Tuple[int, int], ...] = ()
+    locations: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        check_language(self.uri, get_format(self.language))
+
+    @property
+    def queue(self) -> str:
+        return f"{QUEUE_PREFIX}{self.name}"
+
+    @property
+    def priority_queue(self) -> str:
+        return f"{QUEUE_PREFIX}{self.name}.priority"
+
+    def supports(self, size_mm: Tuple[int, int]) -> bool:
+        return not self.sizes or tuple(size_mm) in self.sizes
+
+    def serves(self, location: Optional[str]) -> bool:
+        return bool(location) and location.strip().lower() in {entry.lower() for entry in self.locations}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Printer":
+        language = get_format(data.get("language", "pdf")).name
+        return cls(
+            name=data["name"],
+            uri=data["uri"],
+            language=language,
+            dpi=int(data.get("dpi", LABEL_DPI)),
+            sizes=tuple(parse_size(size) for size in data.get("sizes", ())),
+            locations=tuple(data.get("locations", ())),
+        )
+
+
+def load_printers(path: Optional[Path]) -> Dict[str, Printer]:
+    """Read the printer registry, falling back to the single configured printer."""
+
+    if path is None:
+        default = Printer(name="default", uri=default_printer_uri(), language=settings.label_printer_format)
+        return {default.name: default}
+    printers = [Printer.from_dict(entry) for entry in json.loads(Path(path).read_text(encoding="utf-8"))]
+    if not printers:
+        raise ValueError(f"No printers declared in {path}")
+    return {printer.name: printer for printer in printers}
+
+
+@lru_cache(maxsize=None)
+def get_printers() -> Dict[str, Printer]:
+    return load_printers(settings.printers_path)
+
+
+def get_printer(name: Optional[str] = None) -> Printer:
+    """Return the printer called ``name``, or the first registered one."""
+
+    printers = get_printers()
+    if name is None:
+        return next(iter(printers.values()))
+    try:
+        return printers[name]
+    except KeyError:
+        raise NoPrinterAvailable(f"Unknown printer {name!r}") from None
+
+
+class PrinterRouter:
+    """Pick a printer for a job from size, location and current load.
+
+    A printer serving the job's location is preferred, then any printer that
+    supports the size; among those the first one that is online and not busy
+    wins. If every candidate is busy, the least-loaded online one is used.
+
+    Status checks can take seconds (``lpstat``, a TCP connect), so they never
+    run while a job is routed: the last known state is used (online until a
+    first check says otherwise) and stale entries are re-checked in background
+    threads. Results are cached for :data:`STATUS_TTL` seconds.
+    """
+
+    def __init__(
+        self,
+        printers: Callable[[], Dict[str, Printer]] = get_printers,
+        queue_length: Optional[Callable[[Printer], int]] = None,
+        is_online: Optional[Callable[[Printer], bool]] = None,
+        busy_threshold: Optional[int] = None,
+    ) -> None:
+        self._printers = printers
+        self.queue_length = queue_length or self._redis_queue_length
+        self.is_online = is_online or self._cached_online
+        self.busy_threshold = settings.printer_busy_queue_length if busy_threshold is None else busy_threshold
+        self._status: LRUCache[str, bool] = LRUCache(256, ttl=STATUS_TTL)
+        self._last_known: Dict[str, bool] = {}
+        self._probing: Set[str] = set()
+        self._probe_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._redis: Optional[redis.Redis] = None
+
+    def _redis_queue_length(self, printer: Printer) -> int:
+        # With the Redis broker each Celery queue is a list named after it.
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5)
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.llen(printer.queue)
+            pipe.llen(printer.priority_queue)
+            return sum(pipe.execute())
+        except redis.RedisError:
+            logger.warning("Could not read queue length for printer %s", printer.name, exc_info=True)
+            return 0
+
+    def _cached_online(self, printer: Printer) -> bool:
+        online = self._status.get(printer.name)
+        if online is None:
+            self.probe(printer)
+            return self._last_known.get(printer.name, True)
+        return online
+
+    def probe(self, printer: Printer) -> None:
+        """Check ``printer``'s status in a background thread, once at a time."""
+
+        with self._probe_lock:
+            if printer.name in self._probing:
+                return
+            self._probing.add(printer.name)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(PROBE_WORKERS, thread_name_prefix="printer-probe")
+        self._executor.submit(self._probe, printer)
+
+    def _probe(self, printer: Printer) -> None:
+        try:
+            online = bool(get_transport(printer.uri).status().get("online"))
+        except Exception:
+            logger.warning("Status check of printer %s failed", printer.name, exc_info=True)
+            online = False
+        self._last_known[printer.name] = online
+        self._status.set(printer.name, online)
+        with self._probe_lock:
+            self._probing.discard(printer.name)
+
+    def select(self, size_mm: Tuple[int, int], location: Optional[str] = None) -> Printer:
+        capable = [printer for printer in self._printers().values() if printer.supports(size_mm)]
+        if not capable:
+            raise NoPrinterAvailable(f"No printer supports {size_mm[0]}x{size_mm[1]} mm labels")
+        if len(capable) == 1:
+            return capable[0]
+        # Stable sort keeps registry order as the tie-breaker.
+        candidates = sorted(capable, key=lambda printer: not printer.serves(location))
+        online = [printer for printer in candidates if self.is_online(printer)]
+        if not online:
+            # Queue anyway; the job waits until a printer comes back.
+            logger.warning("No printer for %sx%s mm is online", *size_mm)
+            online = candidates
+        loads = {printer.name: self.queue_length(printer) for printer in online}
+        for printer in online:
+            if loads[printer.name] < self.busy_threshold:
+                return printer
+        return min(online, key=lambda printer: loads[printer.name])
+
+
+printer_router = PrinterRouter()
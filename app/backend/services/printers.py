@@ -0,0 +1,278 @@
+"""Printer transports: how a rendered label document reaches the device.
+
+A transport is selected by URI. ``lp://NAME`` hands the file to CUPS, while
+``socket://HOST[:PORT]`` writes it straight to the printer's raw TCP port
+(9100 / JetDirect) over pooled, persistent connections.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from abc import ABC, abstractmethod
+import select
+import socket
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from ..core.config import get_settings
+from .label_formats import LABEL_FORMATS, LabelFormat
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+RAW_PORT = 9100
+_LP_REQUEST_RE = re.compile(r"request id is (\S+)")
+
+
+class PrinterError(RuntimeError):
+    """Raised when a document could not be delivered to the printer."""
+
+
+class PrinterTransport(ABC):
+    """Base class for printer backends."""
+
+    name = "base"
+    printer = ""
+
+    @abstractmethod
+    def send(self, path: Path, size_mm: Tuple[int, int], copies: int, label_format: LabelFormat) -> dict:
+        """Deliver the document at ``path`` and return details of the outcome."""
+
+    @abstractmethod
+    def status(self) -> dict:
+        """Return whether the printer is reachable, plus backend details."""
+
+    def close(self) -> None:
+        """Release any resources held by the transport."""
+
+
+class LpTransport(PrinterTransport):
+    """Submit jobs to a CUPS queue with ``lp``."""
+
+    name = "lp"
+
+    def __init__(self, printer: str) -> None:
+        self.printer = printer
+
+    def command(self, path: Path, size_mm: Tuple[int, int], copies: int, label_format: LabelFormat) -> list:
+        command = ["lp", "-d", self.printer, "-n", str(copies)]
+        if label_format.raw:
+            # Printer-language documents must reach the device unconverted.
+            command += ["-o", "raw"]
+        else:
+            command += ["-o", f"media=Custom.{size_mm[0]}x{size_mm[1]}mm", "-o", "fit-to-page"]
+        command.append(str(path))
+        return command
+
+    def send(self, path: Path, size_mm: Tuple[int, int], copies: int, label_format: LabelFormat) -> dict:
+        command = self.command(path, size_mm, copies, label_format)
+        process = subprocess.run(command, capture_output=True, text=True, check=False)
+        if process.returncode != 0:
+            detail = (process.stderr or process.stdout).strip()
+            raise PrinterError(f"lp exited with {process.returncode}: {detail}")
+        logger.debug("lp %s: %s", command, process.stdout.strip())
+        match = _LP_REQUEST_RE.search(process.stdout)
+        return {"backend": self.name, "printer": self.printer, "request_id": match.group(1) if match else None}
+
+    def status(self) -> dict:
+        try:
+            process = subprocess.run(
+                ["lpstat", "-p", self.printer], capture_output=True, text=True, check=False, timeout=5
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            return {"backend": self.name, "printer": self.printer, "online": False, "detail": str(exc)}
+        detail = (process.stdout or process.stderr).strip()
+        online = process.returncode == 0 and "disabled" not in detail
+        return {"backend": self.name, "printer": self.printer, "online": online, "detail": detail}
+
+
+class ConnectionPool:
+    """Idle TCP connections to one printer, reused across jobs."""
+
+    def __init__(self, address: Tuple[str, int], size: int, timeout: float) -> None:
+        self.address = address
+        self.size = size
+        self.timeout = timeout
+        self._idle: Deque[socket.socket] = deque()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_alive(sock: socket.socket) -> bool:
+        # Printers drop idle connections; a readable socket with no data means
+        # the peer closed it and writing would silently lose the next job.
+        try:
+            readable, _, _ = select.select([sock], [], [], 0)
+            return not readable or bool(sock.recv(1024, socket.MSG_PEEK))
+        except OSError:
+            return False
+
+    def acquire(self) -> socket.socket:
+        while True:
+            with self._lock:
+                sock = self._idle.pop() if self._idle else None
+            if sock is None:
+                return socket.create_connection(self.address, timeout=self.timeout)
+            if self._is_alive(sock):
+                return sock
+            sock.close()
+
+    def release(self, sock: socket.socket) -> None:
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(sock)
+                return
+        sock.close()
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return len(self._idle)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for sock in idle:
+            sock.close()
+
+
+class RawSocketTransport(PrinterTransport):
+    """Write documents to a printer's raw TCP port, retrying with backoff.
+
+    Only failures before the first byte is written are retried: a printer
+    that received part of a job may already have printed labels from it.
+    """
+
+    name = "socket"
+
+    def __init__(
+        self,
+        host: str,
+        port: int = RAW_PORT,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 2,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.retries = retries
+        self.backoff = backoff
+        self.pool = ConnectionPool((host, port), size=pool_size, timeout=timeout)
+        self._sleep = sleep
+
+    @property
+    def printer(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def send(self, path: Path, size_mm: Tuple[int, int], copies: int, label_format: LabelFormat) -> dict:
+        if not label_format.raw:
+            raise PrinterError(f"{self.printer} takes raw printer languages, not {label_format.name!r} documents")
+        # Raw printers have no job options, so copies are sent back to back.
+        data = memoryview(path.read_bytes() * copies)
+        last_error: Optional[OSError] = None
+        for attempt in range(1, self.retries + 2):
+            sock = None
+            sent = 0
+            try:
+                sock = self.pool.acquire()
+                while sent < len(data):
+                    sent += sock.send(data[sent:])
+            except OSError as exc:
+                last_error = exc
+                if sock is not None:
+                    sock.close()
+                if sent:
+                    raise PrinterError(
+                        f"Printing to {self.printer} failed after {sent} of {len(data)} bytes: {exc}"
+                    ) from exc
+                logger.warning("Printer %s: attempt %d failed: %s", self.printer, attempt, exc)
+                if attempt <= self.retries:
+                    self._sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+            self.pool.release(sock)
+            return {"backend": self.name, "printer": self.printer, "bytes": len(data), "attempts": attempt}
+        raise PrinterError(f"Printing to {self.printer} failed after {self.retries + 1} attempts: {last_error}")
+
+    def status(self) -> dict:
+        status = {"backend": self.name, "printer": self.printer, "pooled": self.pool.idle_count()}
+        try:
+            sock = self.pool.acquire()
+        except OSError as exc:
+            return {**status, "online": False, "detail": str(exc)}
+        self.pool.release(sock)
+        return {**status, "online": True, "detail": "connected"}
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _lp_from_uri(parts) -> PrinterTransport:
+    return LpTransport(unquote(parts.netloc + parts.path).strip("/") or settings.label_printer)
+
+
+def _socket_from_uri(parts) -> PrinterTransport:
+    if not parts.hostname:
+        raise ValueError("socket:// printer URIs need a host")
+    return RawSocketTransport(
+        parts.hostname,
+        parts.port or RAW_PORT,
+        timeout=settings.printer_timeout,
+        retries=settings.printer_retries,
+        backoff=settings.printer_retry_backoff,
+        pool_size=settings.printer_pool_size,
+    )
+
+
+# URI scheme -> factory; register additional backends here.
+TRANSPORTS: Dict[str, Callable[..., PrinterTransport]] = {
+    "lp": _lp_from_uri,
+    "socket": _socket_from_uri,
+}
+
+# Schemes whose transport passes documents through unconverted, so only raw
+# printer languages can be sent to them.
+RAW_ONLY_SCHEMES = {"socket"}
+
+_transports: Dict[str, PrinterTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def default_printer_uri() -> str:
+    return settings.label_printer_uri or f"lp://{settings.label_printer}"
+
+
+def check_language(uri: str, label_format: LabelFormat) -> None:
+    """Raise ``ValueError`` if the printer at ``uri`` cannot take ``label_format`` documents."""
+
+    if urlsplit(uri).scheme in RAW_ONLY_SCHEMES and not label_format.raw:
+        raw = ", ".join(name for name, entry in LABEL_FORMATS.items() if entry.raw)
+        raise ValueError(f"Printer {uri!r} needs a raw label language ({raw}), not {label_format.name!r}")
+
+
+def get_transport(uri: Optional[str] = None) -> PrinterTransport:
+    """Return the transport for ``uri``, shared per process so pools persist."""
+
+    uri = uri or default_printer_uri()
+    with _transports_lock:
+        transport = _transports.get(uri)
+        if transport is None:
+            parts = urlsplit(uri)
+            try:
+                factory = TRANSPORTS[parts.scheme]
+            except KeyError:
+                raise ValueError(f"Unsupported printer URI {uri!r}") from None
+            transport = _transports[uri] = factory(parts)
+        return transport
+
+
+def close_transports() -> None:
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
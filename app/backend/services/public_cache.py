@@ -0,0 +1,112 @@
+"""Read-through cache for serialized public item payloads."""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+import redis
+
+from ..core.config import get_settings
+from ..core.metrics import CACHE_REQUESTS
+from ..utils.lru import LRUCache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Stored for short ids that do not exist so repeated misses skip the database.
+MISSING = b""
+
+
+class PublicItemCache:
+    """TTL + LRU cache of ``ItemPublic`` JSON keyed by short id.
+
+    When a Redis client is supplied it is consulted after the in-process layer
+    and shared between API workers; the local layer then keeps entries only
+    briefly so invalidations on other workers become visible quickly. Without
+    Redis, invalidations only reach the calling process, so payloads that are
+    about to change from elsewhere (see :meth:`set_pending`) are kept briefly.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 300,
+        negative_ttl: float = 30,
+        local_ttl: Optional[float] = None,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "public-item:",
+    ) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.local_ttl = local_ttl
+        self.client = client
+        self.prefix = prefix
+        self._local: LRUCache[str, bytes] = LRUCache(maxsize)
+
+    def _local_ttl(self, ttl: float) -> float:
+        return ttl if self.local_ttl is None else min(ttl, self.local_ttl)
+
+    def get(self, short_id: str) -> Optional[bytes]:
+        """Return the cached payload, :data:`MISSING`, or ``None`` when unknown."""
+
+        payload = self._local.get(short_id)
+        if payload is None and self.client is not None:
+            try:
+                payload = self.client.get(self.prefix + short_id)
+            except redis.RedisError:
+                logger.warning("Public item cache: Redis unavailable", exc_info=True)
+            if payload is not None:
+                ttl = self.negative_ttl if payload == MISSING else self.ttl
+                self._local.set(short_id, payload, ttl=self._local_ttl(ttl))
+        CACHE_REQUESTS.labels(cache="public_item", result="miss" if payload is None else "hit").inc()
+        return payload
+
+    def _store(self, short_id: str, payload: bytes, ttl: float) -> None:
+        self._local.set(short_id, payload, ttl=self._local_ttl(ttl))
+        if self.client is None:
+            return
+        try:
+            self.client.set(self.prefix + short_id, payload, ex=max(1, int(ttl)))
+        except redis.RedisError:
+            logger.warning("Public item cache: Redis unavailable", exc_info=True)
+
+    def set(self, short_id: str, payload: bytes) -> None:
+        self._store(short_id, payload, self.ttl)
+
+    def set_missing(self, short_id: str) -> None:
+        self._store(short_id, MISSING, self.negative_ttl)
+
+    def set_pending(self, short_id: str, payload: bytes) -> None:
+        """Cache a payload whose image derivatives are still being generated by a worker."""
+
+        self._store(short_id, payload, self.negative_ttl)
+
+    def invalidate(self, short_id: str) -> None:
+        self._local.pop(short_id)
+        if self.client is None:
+            return
+        try:
+            self.client.delete(self.prefix + short_id)
+        except redis.RedisError:
+            logger.warning("Public item cache: Redis unavailable", exc_info=True)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+def _build_cache() -> PublicItemCache:
+    client = None
+    local_ttl = None
+    if settings.public_cache_redis:
+        client = redis.Redis.from_url(settings.redis_url, socket_timeout=0.25)
+        local_ttl = settings.public_cache_local_ttl
+    return PublicItemCache(
+        maxsize=settings.public_cache_size,
+        ttl=settings.public_cache_ttl,
+        negative_ttl=settings.public_cache_negative_ttl,
+        local_ttl=local_ttl,
+        client=client,
+    )
+
+
+public_item_cache = _build_cache()
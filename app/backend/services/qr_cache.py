@@ -0,0 +1,67 @@
+"""Memoized, ready-encoded QR code PNGs."""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..core.config import get_settings
+from ..core.metrics import CACHE_REQUESTS
+from ..utils.http import strong_etag
+from ..utils.lru import LRUCache
+from .qrcode_utils import make_qr_png
+
+settings = get_settings()
+
+
+class QRCache:
+    """Two-level cache of encoded QR PNGs keyed by the encoded URL.
+
+    The first level is an in-process LRU; the optional second level is a
+    directory that survives restarts and is shared between workers.
+    """
+
+    def __init__(self, maxsize: int = 2048, directory: Optional[Path] = None) -> None:
+        self._memory: LRUCache[str, Tuple[bytes, str]] = LRUCache(maxsize)
+        self.directory = directory
+
+    def _disk_path(self, url: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / (hashlib.sha256(url.encode("utf-8")).hexdigest() + ".png")
+
+    def png(self, url: str) -> Tuple[bytes, str]:
+        """Return the PNG bytes and strong ETag for a QR code encoding ``url``."""
+
+        cached = self._memory.get(url)
+        if cached is not None:
+            CACHE_REQUESTS.labels(cache="qr", result="hit").inc()
+            return cached
+        CACHE_REQUESTS.labels(cache="qr", result="miss").inc()
+
+        data = None
+        disk_path = self._disk_path(url)
+        if disk_path is not None and disk_path.exists():
+            data = disk_path.read_bytes()
+        if data is None:
+            buffer = io.BytesIO()
+            make_qr_png(url).save(buffer, format="PNG")
+            data = buffer.getvalue()
+            if disk_path is not None:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = disk_path.with_name(f".{uuid.uuid4().hex}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, disk_path)
+
+        entry = (data, strong_etag(data))
+        self._memory.set(url, entry)
+        return entry
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+
+qr_cache = QRCache(maxsize=settings.qr_cache_size, directory=settings.qr_cache_dir)
@@ -1,28 +1,103 @@
-"""Utilities for creating QR and Code128 images."""
+"""Utilities for creating QR and Code128 symbols.
+
+Symbols are encoded into module matrices and drawn straight onto a canvas at
+an integer number of pixels per module, so module edges stay sharp on both
+1-bit and RGB canvases and no intermediate image is resampled.
+"""
 from __future__ import annotations
 
-import io
+from typing import List, Sequence, Tuple
 
 import qrcode
 from PIL import Image
 from barcode import Code128
-from barcode.writer import ImageWriter
+
+from ..core.metrics import QR_ENCODE_SECONDS
+
+Matrix = Sequence[Sequence[bool]]
+
+# Code128 needs ten modules of white on each side to scan reliably.
+CODE128_QUIET_ZONE = 10
+
+
+def qr_matrix(data: str, border: int = 2) -> List[List[bool]]:
+    """Return the QR module matrix for ``data``, including a ``border``-module quiet zone."""
+
+    with QR_ENCODE_SECONDS.time():
+        qr = qrcode.QRCode(border=border)
+        qr.add_data(data)
+        qr.make(fit=True)
+        return qr.get_matrix()
+
+
+def code128_modules(data: str) -> List[bool]:
+    """Return the Code128 bars for ``data`` as one dark/light flag per module."""
+
+    return [module == "1" for module in Code128(data).build()[0]]
+
+
+def draw_modules(
+    canvas: Image.Image, matrix: Matrix, origin: Tuple[int, int], scale: int, height: int | None = None
+) -> Tuple[int, int]:
+    """Paint the dark modules of ``matrix`` onto ``canvas`` and return the drawn size.
+
+    Each module becomes a ``scale`` × ``scale`` block. ``height`` stretches a
+    one-row matrix (a linear barcode) to that many pixels. Light modules are
+    left as they are, so the canvas background shows through.
+    """
+
+    rows, columns = len(matrix), len(matrix[0])
+    mask = Image.frombytes("L", (columns, rows), bytes(255 if dark else 0 for row in matrix for dark in row))
+    size = (columns * scale, height if height is not None else rows * scale)
+    mask = mask.resize(size, Image.NEAREST)
+    canvas.paste("black", (*origin, origin[0] + size[0], origin[1] + size[1]), mask)
+    return size
+
+
+def draw_qr(canvas: Image.Image, data: str, origin: Tuple[int, int], size: int, border: int = 2) -> int:
+    """Draw the largest whole-module QR code for ``data`` that fits a ``size`` square.
+
+    The symbol is centred in the square. Returns the module scale in pixels.
+    """
+
+    matrix = qr_matrix(data, border=border)
+    scale = max(1, size // len(matrix))
+    offset = (size - len(matrix) * scale) // 2
+    draw_modules(canvas, matrix, (origin[0] + offset, origin[1] + offset), scale)
+    return scale
+
+
+def draw_code128(
+    canvas: Image.Image, data: str, origin: Tuple[int, int], width: int, height: int, min_scale: int = 1
+) -> int:
+    """Draw a Code128 of ``data`` at the widest whole-module scale fitting ``width``.
+
+    ``width`` includes the quiet zones. Returns the module scale, or raises
+    ``ValueError`` when fewer than ``min_scale`` pixels per module fit.
+    """
+
+    modules = code128_modules(data)
+    scale = width // (len(modules) + 2 * CODE128_QUIET_ZONE)
+    if scale < max(1, min_scale):
+        raise ValueError(f"Code128 of {data!r} does not fit in {width}px at {min_scale}px per module")
+    draw_modules(canvas, [modules], (origin[0] + CODE128_QUIET_ZONE * scale, origin[1]), scale, height=height)
+    return scale
 
 
-def make_qr_png(url: str, box_size: int = 8, border: int = 2) -> Image.Image:
-    """Create a QR code PNG image pointing to the given URL."""
+def make_qr_png(url: str, box_size: int = 8, border: int = 2, mode: str = "RGB") -> Image.Image:
+    """Create a QR code image in ``mode`` pointing to the given URL."""
 
-    qr = qrcode.QRCode(box_size=box_size, border=border)
-    qr.add_data(url)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    return img.convert("RGB")
+    matrix = qr_matrix(url, border=border)
+    side = len(matrix) * box_size
+    img = Image.new(mode, (side, side), "white")
+    draw_modules(img, matrix, (0, 0), box_size)
+    return img
 
 
-def make_code128_png(data: str) -> Image.Image:
-    """Create a Code128 barcode as a PIL image."""
+def make_code128_png(data: str, module_width: int = 2, height: int = 120, mode: str = "RGB") -> Image.Image:
+    """Create a Code128 barcode (bars and quiet zones only) as a PIL image."""
 
-    buffer = io.BytesIO()
-    Code128(data, writer=ImageWriter()).write(buffer)
-    buffer.seek(0)
-    return Image.open(buffer).convert("RGB")
+    modules = code128_modules(data)
+    img = Image.new(mode, ((len(modules) + 2 * CODE128_QUIET_ZONE) * module_width, height), "white")
+    draw_modules(img, [modules], (CODE128_QUIET_ZONE * module_width, 0), module_width, height=height)
+    return img
@@ -0,0 +1,225 @@
+"""Ranked item search.
+
+PostgreSQL uses the ``search_vector`` column and trigram indexes created by
+migration 0003. Other databases (SQLite in development and tests) fall back to
+an in-process inverted index that is rebuilt whenever the table changes.
+"""
+from __future__ import annotations
+
+import bisect
+import re
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import Select, case, false, func, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Session
+
+from ..models.item import Item
+
+# The fallback orders matches with one CASE branch per id, so a single query
+# carries at most this many; later matches are reached by paging.
+MAX_FALLBACK_RESULTS = 1000
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Relative weight of each indexed field, mirroring the A/B/C weights of the
+# PostgreSQL search vector.
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "short_id": 3.0,
+    "serial_no": 3.0,
+    "brand": 2.0,
+    "model": 2.0,
+    "tags": 2.0,
+    "description": 1.0,
+}
+
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+SUBSTRING_MATCH = 0.5
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i : i + 3] for i in range(len(token) - 2)}
+
+
+class InvertedIndex:
+    """Token → document postings with prefix and substring lookup."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Dict[uuid.UUID, float]] = {}
+        self._tokens: List[str] = []
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+
+    def add(self, doc_id: uuid.UUID, fields: Dict[str, Iterable[str]]) -> None:
+        """Index ``fields`` (field name → tokens) for ``doc_id``."""
+
+        for field, tokens in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                    bisect.insort(self._tokens, token)
+                    for trigram in _trigrams(token):
+                        self._trigram_tokens.setdefault(trigram, set()).add(token)
+                postings[doc_id] = max(postings.get(doc_id, 0.0), weight)
+
+    def _expand(self, query_token: str) -> Dict[str, float]:
+        """Return indexed tokens matching ``query_token`` with their match quality."""
+
+        matches: Dict[str, float] = {}
+        start = bisect.bisect_left(self._tokens, query_token)
+        for token in self._tokens[start:]:
+            if not token.startswith(query_token):
+                break
+            matches[token] = EXACT_MATCH if token == query_token else PREFIX_MATCH
+
+        trigrams = _trigrams(query_token)
+        if trigrams:
+            candidates = set.intersection(*(self._trigram_tokens.get(t, set()) for t in trigrams))
+            for token in candidates:
+                if query_token in token:
+                    matches.setdefault(token, SUBSTRING_MATCH)
+        return matches
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[Tuple[uuid.UUID, float]]:
+        """Return ``(doc_id, score)`` pairs matching every query token, best first."""
+
+        query_tokens = tokenize(text)
+        if not query_tokens:
+            return []
+
+        scores: Optional[Dict[uuid.UUID, float]] = None
+        for query_token in query_tokens:
+            token_scores: Dict[uuid.UUID, float] = {}
+            for token, quality in self._expand(query_token).items():
+                for doc_id, weight in self._postings[token].items():
+                    token_scores[doc_id] = max(token_scores.get(doc_id, 0.0), weight * quality)
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    doc_id: score + token_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in token_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+
+class FallbackSearch:
+    """Inverted index over the ``items`` table for databases without FTS."""
+
+    def __init__(self) -> None:
+        self._index = InvertedIndex()
+        self._version: Optional[Tuple[int, object]] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, db: Session) -> None:
+        version = tuple(db.execute(select(func.count(Item.id), func.max(Item.updated_at))).one())
+        if version == self._version:
+            return
+        index = InvertedIndex()
+        rows = db.execute(
+            select(
+                Item.id,
+                Item.title,
+                Item.description,
+                Item.tags,
+                Item.short_id,
+                Item.serial_no,
+                Item.brand,
+                Item.model,
+            )
+        )
+        for row in rows:
+            index.add(
+                row.id,
+                {
+                    "title": tokenize(row.title),
+                    "description": tokenize(row.description),
+                    "tags": [token for tag in row.tags or [] for token in tokenize(tag)],
+                    "short_id": tokenize(row.short_id),
+                    "serial_no": tokenize(row.serial_no),
+                    "brand": tokenize(row.brand),
+                    "model": tokenize(row.model),
+                },
+            )
+        self._index, self._version = index, version
+
+    def search(self, db: Session, text: str) -> List[Tuple[uuid.UUID, float]]:
+        with self._lock:
+            self._refresh(db)
+            return self._index.search(text)
+
+
+_fallback = FallbackSearch()
+
+
+def _prefix_tsquery(tokens: Sequence[str]) -> str:
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def _apply_postgres_search(query: Select, text: str) -> Select:
+    vector = literal_column("items.search_vector", type_=TSVECTOR)
+    conditions = [
+        Item.title.op("%")(text),
+        Item.serial_no.icontains(text, autoescape=True),
+        Item.short_id.icontains(text, autoescape=True),
+    ]
+    ranks = [
+        func.similarity(Item.title, text),
+        func.similarity(func.coalesce(Item.serial_no, ""), text),
+    ]
+    tokens = tokenize(text)
+    if tokens:
+        ts_query = func.to_tsquery("simple", _prefix_tsquery(tokens))
+        conditions.append(vector.op("@@")(ts_query))
+        ranks.append(func.ts_rank_cd(vector, ts_query))
+    rank = func.greatest(*ranks)
+    return query.where(or_(*conditions)).order_by(rank.desc(), Item.created_at.desc(), Item.id.desc())
+
+
+def search_page(
+    query: Select, text: str, db: Session, offset: int = 0, limit: Optional[int] = None
+) -> Tuple[Select, Optional[int]]:
+    """Restrict ``query`` to one page of the items matching ``text``, best first.
+
+    Returns the query for rows ``offset`` to ``offset + limit`` and, when
+    matches after those rows were left out although ``limit`` allowed more,
+    the offset to continue from: the fallback returns at most
+    :data:`MAX_FALLBACK_RESULTS` rows per query.
+    """
+
+    if db.get_bind().dialect.name == "postgresql":
+        query = _apply_postgres_search(query, text)
+        if offset:
+            query = query.offset(offset)
+        return (query if limit is None else query.limit(limit)), None
+
+    ranked = _fallback.search(db, text)
+    window = MAX_FALLBACK_RESULTS if limit is None else min(limit, MAX_FALLBACK_RESULTS)
+    page = ranked[offset : offset + window]
+    capped = limit is None or limit > MAX_FALLBACK_RESULTS
+    next_offset = offset + window if capped and len(ranked) > offset + window else None
+    if not page:
+        return query.where(false()), None
+    ids = [doc_id for doc_id, _ in page]
+    position = case({doc_id: index for index, doc_id in enumerate(ids)}, value=Item.id)
+    return query.where(Item.id.in_(ids)).order_by(position), next_offset
+
+
+def apply_search(query: Select, text: str, db: Session) -> Select:
+    """Restrict ``query`` to items matching ``text``, ordered by relevance."""
+
+    return search_page(query, text, db)[0]
@@ -0,0 +1,98 @@
+"""Content-addressed storage for uploaded media."""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+CHUNK_SIZE = 1024 * 1024
+
+_MAGIC_SUFFIXES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    path: Path
+    sha256: str
+    size: int
+
+    @property
+    def relative_path(self) -> str:
+        return str(self.path.relative_to(settings.media_dir))
+
+
+def _sniff_suffix(head: bytes, filename: Optional[str]) -> str:
+    for magic, suffix in _MAGIC_SUFFIXES:
+        if head.startswith(magic):
+            return suffix
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+        return ".heic"
+    return Path(filename or "").suffix.lower() or ".bin"
+
+
+def blob_path(sha256: str, suffix: str) -> Path:
+    return settings.media_dir / "blobs" / sha256[:2] / sha256[2:4] / f"{sha256}{suffix}"
+
+
+def store_stream(source: BinaryIO, filename: Optional[str] = None, max_bytes: Optional[int] = None) -> StoredBlob:
+    """Copy ``source`` into the blob store in chunks, hashing as it goes.
+
+    Identical content is stored once; the existing blob is returned instead of
+    writing a duplicate.
+    """
+
+    limit = settings.max_upload_bytes if max_bytes is None else max_bytes
+    tmp_dir = settings.media_dir / "blobs" / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = tmp_dir / uuid.uuid4().hex
+
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    try:
+        with tmp_path.open("wb") as buffer:
+            while chunk := source.read(CHUNK_SIZE):
+                if not head:
+                    head = chunk[:16]
+                size += len(chunk)
+                if size > limit:
+                    raise UploadTooLarge(f"Upload exceeds {limit} bytes")
+                digest.update(chunk)
+                buffer.write(chunk)
+
+        sha256 = digest.hexdigest()
+        destination = blob_path(sha256, _sniff_suffix(head, filename))
+        if destination.exists():
+            return StoredBlob(destination, sha256, size)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp_path, destination)
+        return StoredBlob(destination, sha256, size)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+async def store_upload(upload: UploadFile, max_bytes: Optional[int] = None) -> StoredBlob:
+    """Store an uploaded file without blocking the event loop."""
+
+    return await run_in_threadpool(store_stream, upload.file, upload.filename, max_bytes)
@@ -0,0 +1,144 @@
+"""Cached AI suggestions keyed by image content and text hint.
+
+The API records which suggestion key each new item is waiting for and queues
+an inference only when neither a cached result nor an in-flight inference for
+that key exists, so a duplicate photo with the same hint never reaches the
+provider twice. Workers store the result under the key and the API reads it
+back from the follow-up endpoint.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Optional, Tuple
+
+import redis
+
+from ..core.config import get_settings
+from ..core.metrics import CACHE_REQUESTS
+from ..utils.lru import LRUCache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+def suggestion_key(content_hash: Optional[str], text_hint: Optional[str], provider: Optional[str] = None) -> str:
+    """Return the cache key for a photo (by SHA-256) and hint under ``provider``."""
+
+    seed = "\0".join((provider or settings.ai_provider, content_hash or "", (text_hint or "").strip()))
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+
+class SuggestionStore:
+    """Suggestion results, in-flight markers and item assignments.
+
+    Without a Redis client everything lives in process, which is enough for a
+    single process running tasks eagerly (tests, the CLI).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30 * 24 * 60 * 60,
+        timeout: float = 300,
+        client: Optional[redis.Redis] = None,
+        prefix: str = "ai-suggestion:",
+        maxsize: int = 10000,
+    ) -> None:
+        self.ttl = ttl
+        self.timeout = timeout
+        self.client = client
+        self.prefix = prefix
+        self._local: LRUCache[str, str] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> Optional[str]:
+        if self.client is None:
+            return self._local.get(name)
+        raw = self.client.get(self.prefix + name)
+        return None if raw is None else raw.decode("utf-8")
+
+    def _set(self, name: str, value: str, ttl: float, nx: bool = False) -> bool:
+        if self.client is None:
+            with self._lock:
+                if nx and self._local.get(name) is not None:
+                    return False
+                self._local.set(name, value, ttl=ttl)
+            return True
+        return bool(self.client.set(self.prefix + name, value, ex=max(1, int(ttl)), nx=nx))
+
+    def _delete(self, name: str) -> None:
+        if self.client is None:
+            self._local.pop(name)
+        else:
+            self.client.delete(self.prefix + name)
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached suggestions for ``key``, if any."""
+
+        try:
+            raw = self._get("result:" + key)
+        except redis.RedisError:
+            logger.warning("Suggestion cache: Redis unavailable", exc_info=True)
+            raw = None
+        CACHE_REQUESTS.labels(cache="ai_suggestion", result="miss" if raw is None else "hit").inc()
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, suggestions: dict) -> None:
+        self._set("result:" + key, json.dumps(suggestions), self.ttl)
+
+    def claim(self, key: str) -> bool:
+        """Mark an inference for ``key`` as in flight; ``False`` if one already is.
+
+        An unreachable Redis counts as claimed by the caller: a duplicate
+        inference is better than none.
+        """
+
+        try:
+            return self._set("inflight:" + key, "1", self.timeout, nx=True)
+        except redis.RedisError:
+            logger.warning("Suggestion cache: Redis unavailable", exc_info=True)
+            return True
+
+    def release(self, key: str) -> None:
+        try:
+            self._delete("inflight:" + key)
+        except redis.RedisError:
+            logger.warning("Suggestion cache: Redis unavailable", exc_info=True)
+
+    def in_flight(self, key: str) -> bool:
+        return self._get("inflight:" + key) is not None
+
+    def assign(self, item_id: str, key: str) -> None:
+        """Remember that ``item_id`` waits for the suggestions under ``key``."""
+
+        try:
+            self._set("item:" + item_id, key, self.ttl)
+        except redis.RedisError:
+            logger.warning("Suggestion cache: Redis unavailable", exc_info=True)
+
+    def status(self, item_id: str) -> Optional[Tuple[str, Optional[dict]]]:
+        """Return ``(state, suggestions)`` for an item, or ``None`` if none were requested."""
+
+        key = self._get("item:" + item_id)
+        if key is None:
+            return None
+        suggestions = self.get(key)
+        if suggestions is not None:
+            return READY, suggestions
+        return (PENDING if self.in_flight(key) else FAILED), None
+
+    def clear(self) -> None:
+        self._local.clear()
+
+
+suggestion_store = SuggestionStore(
+    ttl=settings.ai_suggestion_ttl,
+    timeout=settings.ai_suggestion_timeout,
+    client=redis.Redis.from_url(settings.redis_url, socket_timeout=0.25),
+)
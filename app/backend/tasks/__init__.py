@@ -1,4 +1,4 @@
 """Task package for Celery."""
-from . import print_tasks  # noqa: F401
+from . import ai_tasks, celery_app, image_tasks, print_tasks  # noqa: F401
 
-__all__ = ["print_tasks"]
+__all__ = ["ai_tasks", "celery_app", "image_tasks", "print_tasks"]
@@ -0,0 +1,35 @@
+"""Celery tasks for AI metadata suggestions."""
+from __future__ import annotations
+
+from typing import Optional
+
+from celery import shared_task
+
+from ..core.config import get_settings
+from ..core.metrics import span
+from ..services.ai import get_provider
+from ..services.suggestions import suggestion_store
+
+settings = get_settings()
+
+
+@shared_task(name="suggest_item_metadata")
+def suggest_item_metadata(key: str, image_path: Optional[str] = None, text_hint: Optional[str] = None) -> dict:
+    """Run the configured provider and cache its suggestions under ``key``.
+
+    ``image_path`` is relative to ``MEDIA_DIR``. The in-flight marker is
+    released whether or not the provider succeeds.
+    """
+
+    try:
+        cached = suggestion_store.get(key)
+        if cached is not None:
+            return cached
+        provider = get_provider()
+        source = str(settings.media_dir / image_path) if image_path else None
+        with span("suggest", provider=provider.name):
+            suggestions = provider.describe(image_path=source, text_hint=text_hint)
+        suggestion_store.set(key, suggestions)
+        return suggestions
+    finally:
+        suggestion_store.release(key)
@@ -4,8 +4,11 @@ from __future__ import annotations
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 from ..core.config import get_settings
+from ..services.label_templates import preload_templates
+from . import instrumentation, job_events  # noqa: F401
 
 settings = get_settings()
 os.environ.setdefault("CELERY_TIMEZONE", "UTC")
@@ -15,6 +18,25 @@ celery_app = Celery(
     broker=settings.redis_url,
     backend=settings.redis_url,
 )
-celery_app.conf.update(task_serializer="json", result_serializer="json", accept_content=["json"])
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    # Workers consume queues strictly in the order given to -Q, so a printer's
+    # priority queue is always drained first, and reserve one task at a time
+    # so queued batches don't sit in a busy worker's prefetch buffer.
+    broker_transport_options={"queue_order_strategy": "priority"},
+    worker_prefetch_multiplier=1,
+)
+# Make this the app shared tasks resolve to in every thread, including the
+# API's threadpool, not just the importing thread.
+celery_app.set_default()
 
 celery_app.autodiscover_tasks(["backend.tasks"])
+
+
+@worker_process_init.connect
+def _preload_label_templates(**_: object) -> None:
+    """Parse fonts and compile label layouts once per worker process."""
+
+    preload_templates()
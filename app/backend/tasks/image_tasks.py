@@ -0,0 +1,33 @@
+"""Celery tasks for image processing."""
+from __future__ import annotations
+
+import hashlib
+import uuid
+
+from celery import shared_task
+
+from ..core.config import get_settings
+from ..core.db import session_scope
+from ..models.item import ItemImage
+from ..services.images import generate_derivatives
+from ..services.public_cache import public_item_cache
+
+settings = get_settings()
+
+
+@shared_task(name="generate_image_derivatives")
+def generate_image_derivatives(image_id: str) -> dict:
+    """Create thumbnail, medium and WebP versions of an uploaded image."""
+
+    with session_scope() as session:
+        image = session.get(ItemImage, uuid.UUID(image_id))
+        if not image:
+            raise ValueError(f"Image {image_id} not found")
+        source = settings.media_dir / image.path
+        content_hash = image.content_hash or hashlib.sha256(source.read_bytes()).hexdigest()
+        image.derivatives = generate_derivatives(source, content_hash)
+        short_id = image.item.short_id
+        derivatives = dict(image.derivatives)
+
+    public_item_cache.invalidate(short_id)
+    return derivatives
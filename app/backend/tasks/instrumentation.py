@@ -0,0 +1,81 @@
+"""Celery signal hooks that export task metrics and carry trace context."""
+from __future__ import annotations
+
+import os
+import time
+
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+
+from ..core.config import get_settings
+from ..core.metrics import (
+    CELERY_QUEUE_WAIT_SECONDS,
+    CELERY_TASK_FAILURES,
+    CELERY_TASK_SECONDS,
+    current_trace_id,
+    trace_id_var,
+)
+
+settings = get_settings()
+
+# task id -> (start time, trace context token) for tasks running in this process.
+_running: dict = {}
+
+
+@before_task_publish.connect
+def _stamp_headers(headers=None, **_: object) -> None:
+    if headers is None:
+        return
+    headers.setdefault("published_at", time.time())
+    trace_id = current_trace_id()
+    if trace_id:
+        headers.setdefault("trace_id", trace_id)
+
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **_: object) -> None:
+    published_at = task.request.get("published_at")
+    if published_at:
+        CELERY_QUEUE_WAIT_SECONDS.labels(task=task.name).observe(max(0.0, time.time() - published_at))
+    token = trace_id_var.set(task.request.get("trace_id"))
+    _running[task_id] = (time.perf_counter(), token)
+
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **_: object) -> None:
+    started = _running.pop(task_id, None)
+    if started is None:
+        return
+    began, token = started
+    CELERY_TASK_SECONDS.labels(task=task.name, state=state or "UNKNOWN").observe(time.perf_counter() - began)
+    trace_id_var.reset(token)
+
+
+@task_failure.connect
+def _task_failed(sender=None, **_: object) -> None:
+    CELERY_TASK_FAILURES.labels(task=getattr(sender, "name", "unknown")).inc()
+
+
+@worker_init.connect
+def _start_metrics_server(**_: object) -> None:
+    if not settings.worker_metrics_port:
+        return
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(settings.worker_metrics_port, registry=registry)
+    else:
+        start_http_server(settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+def _mark_process_dead(pid=None, **_: object) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,26 @@
+"""Celery signal hooks that publish print job status changes."""
+from __future__ import annotations
+
+from celery.signals import before_task_publish, task_failure, task_success
+
+from ..services.job_status import DONE, FAILED, QUEUED, job_status
+
+TRACKED_TASKS = {"print_label", "print_labels_batch"}
+
+
+@before_task_publish.connect
+def _job_queued(sender=None, headers=None, **_: object) -> None:
+    if sender in TRACKED_TASKS and headers and headers.get("id"):
+        job_status.publish(headers["id"], QUEUED, task=sender)
+
+
+@task_success.connect
+def _job_done(sender=None, result=None, **_: object) -> None:
+    if getattr(sender, "name", None) in TRACKED_TASKS and sender.request.id:
+        job_status.publish(sender.request.id, DONE, result=result)
+
+
+@task_failure.connect
+def _job_failed(sender=None, task_id=None, exception=None, **_: object) -> None:
+    if getattr(sender, "name", None) in TRACKED_TASKS and task_id:
+        job_status.publish(task_id, FAILED, error=str(exception))
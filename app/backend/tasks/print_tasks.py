@@ -1,50 +1,295 @@
 """Celery tasks for label printing."""
 from __future__ import annotations
 
-import subprocess
+import time
 import uuid
+from pathlib import Path
+from typing import Set, Tuple
 
 from celery import shared_task
+from celery.exceptions import Ignore
+from celery.result import AsyncResult
+from sqlalchemy import select
 
 from ..core.config import get_settings
 from ..core.db import session_scope
+from ..core.metrics import PRINT_FAILURES, PRINT_SPOOL_SECONDS, span
 from ..models.item import Item
-from ..services.labels import SIZE_PRESETS, render_label_pdf
+from ..services.job_status import DONE, FAILED, RENDERING, SPOOLING, job_status
+from ..services.label_cache import label_cache
+from ..services.label_formats import LabelFormat, get_format
+from ..services.label_templates import parse_size
+from ..services.labels import render_labels
+from ..services.print_coalescing import PrintJob, job_buffer, print_jobs
+from ..services.printer_registry import Printer, get_printer, get_printers, printer_router
+from ..services.printers import PrinterError, get_transport
 
 settings = get_settings()
 
 
+def choose_printer(size: str, location: str | None = None, printer: str | None = None) -> Printer:
+    """Return the registered ``printer``, or the one the router picks for ``size`` and ``location``."""
+
+    return get_printer(printer) if printer else printer_router.select(parse_size(size), location)
+
+
+def submit_print(
+    task,
+    size: str,
+    location: str | None = None,
+    printer: str | None = None,
+    priority: bool = False,
+    **kwargs: object,
+) -> Tuple[AsyncResult, Printer]:
+    """Queue a print task on the queue of the printer chosen for it.
+
+    ``printer`` pins the job to a registered printer; otherwise one is picked
+    by size, location and load. Priority jobs go to the printer's priority
+    queue, which its workers drain before the regular one, and the task is
+    told so through its ``priority`` argument.
+    """
+
+    target = choose_printer(size, location, printer)
+    queue = target.priority_queue if priority else target.queue
+    kwargs = {**kwargs, "size": size, "printer": target.name, "priority": priority}
+    return task.apply_async(kwargs=kwargs, queue=queue), target
+
+
+def schedule_prerender(item: Item) -> None:
+    """Queue a pre-render of ``item``'s labels after ``LABEL_PRERENDER_DELAY`` seconds.
+
+    The task carries the item's ``updated_at``, so when several edits land
+    within the delay only the task for the latest one renders anything.
+    """
+
+    if not settings.label_prerender_sizes:
+        return
+    prerender_labels.apply_async(
+        (str(item.id), item.updated_at.isoformat()),
+        countdown=settings.label_prerender_delay,
+        queue=settings.label_prerender_queue,
+    )
+
+
+def _prerender_targets(size_mm: Tuple[int, int]) -> Set[Tuple[str, int]]:
+    return {(printer.language, printer.dpi) for printer in get_printers().values() if printer.supports(size_mm)}
+
+
+def _spool(path: Path, size_mm: Tuple[int, int], copies: int, label_format: LabelFormat, printer: Printer) -> dict:
+    """Send a rendered label through the printer's transport."""
+
+    transport = get_transport(printer.uri)
+    started = time.perf_counter()
+    try:
+        with span("spool", backend=transport.name, printer=printer.name):
+            return {**transport.send(path, size_mm, copies, label_format), "printer": printer.name}
+    except PrinterError:
+        PRINT_FAILURES.labels(backend=transport.name).inc()
+        raise
+    finally:
+        PRINT_SPOOL_SECONDS.labels(backend=transport.name).observe(time.perf_counter() - started)
+
+
+def _publish(task_ids: list[str | None], state: str, **detail: object) -> None:
+    for task_id in task_ids:
+        if task_id:
+            job_status.publish(task_id, state, **detail)
+
+
 @shared_task(bind=True, name="print_label")
-def print_label(self, item_id: str, size: str = "50x30", copies: int = 1) -> dict:
-    """Render a label and send it to the configured printer."""
+def print_label(
+    self,
+    item_id: str,
+    size: str = "50x30",
+    copies: int = 1,
+    fmt: str | None = None,
+    printer: str | None = None,
+    priority: bool = False,
+) -> dict:
+    """Render a label and send it to ``printer`` (the first registered one by default).
+
+    ``fmt`` overrides the printer's language. Priority jobs are never held
+    back for coalescing.
+    """
+
+    target = get_printer(printer)
+    label_format = get_format(fmt or target.language)
+    coalesce = settings.print_coalesce_window > 0 and label_format.multi_page and not priority
+    if coalesce and not self.request.is_eager:
+        parse_size(size)
+        _coalesce(PrintJob(self.request.id, item_id, copies), size, label_format, target)
+        # flush_print_jobs records this task's result once the merged job is spooled.
+        raise Ignore()
 
     with session_scope() as session:
         item = session.get(Item, uuid.UUID(item_id))
         if not item:
             raise ValueError(f"Item {item_id} not found")
-        size_mm = SIZE_PRESETS.get(size, SIZE_PRESETS["50x30"])
-        pdf_path = render_label_pdf(item, size_mm=size_mm, public_base_url=settings.public_base_url)
-
-    media_option = f"Custom.{size_mm[0]}x{size_mm[1]}mm"
-    command = [
-        "lp",
-        "-d",
-        settings.label_printer,
-        "-n",
-        str(copies),
-        "-o",
-        f"media={media_option}",
-        "-o",
-        "fit-to-page",
-        str(pdf_path),
-    ]
-    process = subprocess.run(command, capture_output=True, text=True, check=False)
-    result = {
-        "command": command,
-        "returncode": process.returncode,
-        "stdout": process.stdout,
-        "stderr": process.stderr,
-    }
-    if process.returncode != 0:
-        raise RuntimeError(f"Printing failed: {result}")
-    return result
+        size_mm = parse_size(size)
+        _publish([self.request.id], RENDERING)
+        with span("render", item_id=item_id, size=size, format=label_format.name):
+            path = label_cache.render(
+                item,
+                size_mm=size_mm,
+                public_base_url=settings.public_base_url,
+                fmt=label_format.name,
+                dpi=target.dpi,
+            )
+
+    _publish([self.request.id], SPOOLING)
+    return _spool(path, size_mm, copies, label_format, target)
+
+
+@shared_task(name="prerender_labels", ignore_result=True)
+def prerender_labels(item_id: str, version: str) -> dict:
+    """Render an item's labels into the label cache ahead of the first print.
+
+    Labels are drawn for each ``LABEL_PRERENDER_SIZES`` size in the language
+    and resolution of every printer that takes it, which are exactly the
+    cache entries ``print_label`` looks up. Nothing is rendered when the item
+    has changed since ``version`` (its ``updated_at``) was taken.
+    """
+
+    rendered = 0
+    with session_scope() as session:
+        item = session.get(Item, uuid.UUID(item_id))
+        if item is None or item.updated_at.isoformat() != version:
+            return {"rendered": 0, "superseded": True}
+        for size in settings.label_prerender_sizes:
+            size_mm = parse_size(size)
+            for fmt, dpi in sorted(_prerender_targets(size_mm)):
+                label_cache.render(item, size_mm=size_mm, public_base_url=settings.public_base_url, fmt=fmt, dpi=dpi)
+                rendered += 1
+    return {"rendered": rendered, "superseded": False}
+
+
+def _schedule_flush(key: str, size: str, fmt: str, printer: Printer, waiting: int) -> None:
+    countdown = 0 if waiting >= settings.print_coalesce_max_jobs else settings.print_coalesce_window
+    flush_print_jobs.apply_async((key, size, fmt, printer.name), countdown=countdown, queue=printer.queue)
+
+
+def _coalesce(job: PrintJob, size: str, label_format: LabelFormat, printer: Printer) -> None:
+    key = job_buffer.key(printer.name, size, label_format.name)
+    waiting = job_buffer.push(key, job)
+    # The first job opens the window; later ones only matter once the batch is full.
+    if waiting == 1 or waiting == settings.print_coalesce_max_jobs:
+        _schedule_flush(key, size, label_format.name, printer, waiting)
+
+
+@shared_task(bind=True, name="flush_print_jobs")
+def flush_print_jobs(self, key: str, size: str, fmt: str, printer: str | None = None) -> dict:
+    """Print the buffered jobs for ``key`` as one document.
+
+    Every coalesced ``print_label`` task is marked done or failed individually.
+    """
+
+    target = get_printer(printer)
+    jobs = job_buffer.take(key, settings.print_coalesce_max_jobs)
+    remaining = job_buffer.pending(key)
+    if remaining:
+        _schedule_flush(key, size, fmt, target, remaining)
+    if not jobs:
+        return {"jobs": 0, "failed": 0}
+
+    size_mm = parse_size(size)
+    label_format = get_format(fmt)
+    task_ids = [job.task_id for job in jobs]
+    _publish(task_ids, RENDERING)
+
+    def render(pages: list[Item]) -> Path:
+        with span("render", items=len(pages), size=size, format=label_format.name):
+            return render_labels(
+                pages,
+                size_mm=size_mm,
+                public_base_url=settings.public_base_url,
+                batch_id=self.request.id,
+                fmt=label_format,
+                dpi=target.dpi,
+            )
+
+    def spool(path: Path) -> dict:
+        _publish(task_ids, SPOOLING)
+        return _spool(path, size_mm, 1, label_format, target)
+
+    with session_scope() as session:
+        outcomes = print_jobs(session, jobs, render, spool)
+
+    # Coalesced tasks never finish on their own, so no task signals fire for them.
+    failed = 0
+    for task_id, outcome in outcomes.items():
+        if isinstance(outcome, Exception):
+            failed += 1
+            self.backend.mark_as_failure(task_id, outcome)
+            job_status.publish(task_id, FAILED, error=str(outcome))
+        else:
+            self.backend.mark_as_done(task_id, outcome)
+            job_status.publish(task_id, DONE, result=outcome)
+    return {"jobs": len(jobs), "failed": failed}
+
+
+@shared_task(bind=True, name="print_labels_batch")
+def print_labels_batch(
+    self,
+    item_ids: list[str],
+    size: str = "50x30",
+    copies: int = 1,
+    fmt: str | None = None,
+    printer: str | None = None,
+    priority: bool = False,
+) -> dict:
+    """Render many labels and send them to the printer in a few large jobs.
+
+    Items are loaded with one query and printed in the requested order. Ids that
+    no longer exist are skipped and reported in the result. The labels are
+    spooled in chunks of ``PRINT_BATCH_CHUNK_SIZE`` so that a priority job can
+    reach the printer between two chunks of a long batch; the result lists the
+    spool outcome of every chunk under ``jobs``. ``priority`` only decides the
+    queue the batch was sent to.
+    """
+
+    target = get_printer(printer)
+    size_mm = parse_size(size)
+    label_format = get_format(fmt or target.language)
+    wanted = [uuid.UUID(item_id) for item_id in item_ids]
+
+    with session_scope() as session:
+        found = {
+            item.id: item
+            for item in session.execute(select(Item).where(Item.id.in_(wanted))).scalars().unique()
+        }
+        # Rendering and spooling happen after the session closes.
+        session.expunge_all()
+    items = [found[item_id] for item_id in wanted if item_id in found]
+    missing = [str(item_id) for item_id in wanted if item_id not in found]
+    if not items:
+        raise ValueError("None of the requested items were found")
+
+    step = settings.print_batch_chunk_size
+    chunks = [items[start : start + step] for start in range(0, len(items), step)]
+    printed = 0
+    jobs: list[dict] = []
+    for number, chunk in enumerate(chunks):
+
+        def report(index: int, item: Item, offset: int = printed) -> None:
+            if self.request.id:
+                self.update_state(
+                    state="PROGRESS",
+                    meta={"current": offset + index + 1, "total": len(items), "item_id": str(item.id)},
+                )
+
+        _publish([self.request.id], RENDERING)
+        with span("render", items=len(chunk), size=size, format=label_format.name):
+            path = render_labels(
+                chunk,
+                size_mm=size_mm,
+                public_base_url=settings.public_base_url,
+                batch_id=f"{self.request.id or uuid.uuid4()}-{number}",
+                on_page=report,
+                fmt=label_format,
+                dpi=target.dpi,
+            )
+        _publish([self.request.id], SPOOLING)
+        jobs.append(_spool(path, size_mm, copies, label_format, target))
+        printed += len(chunk)
+
+    return {"printer": target.name, "jobs": jobs, "printed": printed, "missing": missing, "chunks": len(chunks)}
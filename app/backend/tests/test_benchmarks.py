@@ -0,0 +1,45 @@
+import tempfile
+
+from backend.benchmarks import runner
+from backend.benchmarks.__main__ import main
+from backend.core.config import get_settings
+
+
+def test_measure_reports_per_call_time():
+    result = runner.measure("noop", lambda: ((lambda: None), 10), rounds=2, min_round=0.001)
+    assert result.calls >= 1
+    assert result.seconds > 0
+    assert result.size_bytes == 10
+
+
+def test_compare_flags_slower_and_larger_results():
+    baseline = {
+        "fast": {"seconds": 1.0, "size_bytes": 100},
+        "slow": {"seconds": 1.0, "size_bytes": 100},
+    }
+    results = [
+        runner.Result("fast", seconds=1.1, stdev=0, rounds=1, calls=1, size_bytes=101),
+        runner.Result("slow", seconds=2.0, stdev=0, rounds=1, calls=1, size_bytes=200),
+        runner.Result("new", seconds=9.0, stdev=0, rounds=1, calls=1),
+    ]
+    regressions = runner.compare(results, baseline)
+    assert [(r.name, r.metric) for r in regressions] == [("slow", "seconds"), ("slow", "size_bytes")]
+
+
+def test_cli_saves_and_checks_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["generate_short_id", "describe_item", "--rounds", "2", "--min-round", "0.001", "--baseline", str(baseline)]
+    assert main(args + ["--save"]) == 0
+    assert set(runner.load_baseline(baseline)) == {"generate_short_id", "describe_item"}
+    assert main(args + ["--check", "--tolerance", "100"]) == 0
+
+
+def test_cli_renders_into_a_scratch_media_dir(monkeypatch, tmp_path):
+    scratch = tmp_path / "tmp"
+    scratch.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(scratch))
+    media_dir = get_settings().media_dir
+    args = ["label_pdf[50x30]", "--rounds", "1", "--min-round", "0.001", "--baseline", str(tmp_path / "b.json")]
+    assert main(args) == 0
+    assert get_settings().media_dir == media_dir
+    assert list(scratch.iterdir()) == []
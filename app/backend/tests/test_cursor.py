@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from backend.utils.cursor import decode_cursor, decode_offset_cursor, encode_cursor, encode_offset_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    item_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_offset_cursor_round_trip():
+    assert decode_offset_cursor(encode_offset_cursor(1000)) == 1000
+    with pytest.raises(ValueError):
+        decode_offset_cursor(encode_cursor(datetime(2024, 5, 1), uuid.uuid4()))
@@ -0,0 +1,39 @@
+import csv
+import gzip
+import io
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item, ItemImage
+from backend.services.exporter import export_query, export_stream
+
+
+def _db():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    drill = Item(short_id="aaa1111", title="Drill", tags=["tools"])
+    db.add_all([drill, Item(short_id="bbb2222", title="Mug")])
+    db.flush()
+    db.add_all([ItemImage(item_id=drill.id, path="blobs/a.jpg"), ItemImage(item_id=drill.id, path="blobs/b.jpg")])
+    db.commit()
+    return db
+
+
+def test_csv_export_includes_image_paths():
+    with _db() as db:
+        body = b"".join(export_stream(db, export_query().order_by(Item.title), "csv")).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [row["title"] for row in rows] == ["Drill", "Mug"]
+    assert json.loads(rows[0]["images"]) == ["blobs/a.jpg", "blobs/b.jpg"]
+    assert json.loads(rows[0]["tags"]) == ["tools"]
+
+
+def test_gzip_jsonl_export():
+    with _db() as db:
+        body = gzip.decompress(b"".join(export_stream(db, export_query(), "jsonl", gzip=True)))
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert {row["short_id"] for row in rows} == {"aaa1111", "bbb2222"}
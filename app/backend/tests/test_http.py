@@ -0,0 +1,63 @@
+import gzip
+import json
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.utils.http import conditional_response, http_date, not_modified, preferred_encoding, weak_etag
+from backend.utils.media import MediaFiles
+
+
+def test_validators_prefer_etag_over_dates():
+    etag = weak_etag("item", "2024-05-01T10:00:00.123456")
+    modified = datetime(2024, 5, 1, 10, 0, 0, 123456)
+    assert etag.startswith('W/"') and etag != weak_etag("item", "2024-05-01T10:00:01")
+    assert not_modified(etag[2:], None, etag, modified)
+    assert not not_modified('"other"', http_date(modified), etag, modified)
+    assert not_modified(None, http_date(modified), etag, modified)
+    assert not not_modified(None, http_date(datetime(2024, 5, 1, 9, 59, 59)), etag, modified)
+    assert not not_modified(None, "yesterday", etag, modified)
+
+
+def test_conditional_response_compresses_once_and_skips_body_on_304():
+    body = json.dumps({"description": "x" * 2000}).encode()
+    calls = []
+
+    def render():
+        calls.append(1)
+        return body
+
+    etag = weak_etag("compress-test")
+    assert preferred_encoding("gzip;q=0, identity") is None
+    response = conditional_response(render, etag, accept_encoding="gzip, deflate", precompress=True)
+    assert response.headers["content-encoding"] == "gzip" and response.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.body) == body
+
+    plain = conditional_response(body, etag, accept_encoding="gzip")
+    assert "content-encoding" not in plain.headers and plain.body == body
+
+    cached = conditional_response(render, etag, if_none_match=etag, precompress=True)
+    assert cached.status_code == 304 and cached.headers["etag"] == etag
+    assert len(calls) == 1
+
+
+def test_media_files_cache_content_addressed_uploads(tmp_path):
+    digest = "ab" * 32
+    (tmp_path / "blobs" / "ab" / "ab").mkdir(parents=True)
+    (tmp_path / "blobs" / "ab" / "ab" / f"{digest}.jpg").write_bytes(b"jpeg")
+    (tmp_path / "labels").mkdir()
+    (tmp_path / "labels" / "label.pdf").write_bytes(b"pdf")
+    app = FastAPI()
+    app.mount("/media", MediaFiles(directory=tmp_path, cache_control="public, max-age=60, immutable"))
+    client = TestClient(app)
+
+    blob = client.get(f"/media/blobs/ab/ab/{digest}.jpg")
+    assert blob.headers["etag"] == f'"{digest}"'
+    assert blob.headers["cache-control"] == "public, max-age=60, immutable"
+    assert client.get(f"/media/blobs/ab/ab/{digest}.jpg", headers={"If-None-Match": f'"{digest}"'}).status_code == 304
+
+    label = client.get("/media/labels/label.pdf")
+    assert label.headers["cache-control"] == "no-cache"
+    again = client.get("/media/labels/label.pdf", headers={"If-Modified-Since": label.headers["last-modified"]})
+    assert again.status_code == 304
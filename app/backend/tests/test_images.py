@@ -0,0 +1,17 @@
+from PIL import Image
+
+from backend.services import images
+from backend.services.images import DERIVATIVE_SPECS, generate_derivatives
+
+
+def test_generate_derivatives_bounds_size(tmp_path):
+    images.settings.media_dir = tmp_path
+    source = tmp_path / "original.jpg"
+    Image.new("RGB", (3000, 2000), "red").save(source, "JPEG")
+
+    paths = generate_derivatives(source, "ab" * 32)
+    assert set(paths) == set(DERIVATIVE_SPECS)
+    for name, relative in paths.items():
+        with Image.open(tmp_path / relative) as derived:
+            assert max(derived.size) == DERIVATIVE_SPECS[name].max_side
+            assert derived.format == DERIVATIVE_SPECS[name].format
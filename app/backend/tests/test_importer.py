@@ -0,0 +1,40 @@
+import io
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item
+from backend.services.importer import import_items, iter_rows
+
+CSV = """title,description,tags,location,purchase_date
+Drill,Cordless,"power,tools",Shelf 1,2024-01-05
+Saw,,["tools"],,not-a-date
+Ladder,,,,
+"""
+
+
+def test_import_csv_reports_bad_rows_and_batches_the_rest():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        report = import_items(db, iter_rows(io.StringIO(CSV), "csv"), batch_size=1)
+
+        assert report.imported == 2
+        assert [error["row"] for error in report.errors] == [2]
+        assert "purchase_date" in report.errors[0]["errors"][0]
+        items = {item.title: item for item in db.execute(select(Item)).unique().scalars()}
+        assert items["Drill"].tags == ["power", "tools"]
+        assert items["Drill"].location == "Shelf 1"
+        assert len({item.short_id for item in items.values()}) == 2
+
+
+def test_import_jsonl_reports_invalid_lines():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    lines = '{"title": "Kettle"}\n\nnot json\n{"title": "Mug", "tags": ["kitchen"]}\n'
+    with Session(engine) as db:
+        report = import_items(db, iter_rows(io.StringIO(lines), "jsonl"))
+        assert report.imported == 2
+        assert [error["row"] for error in report.errors] == [2]
+        assert db.execute(select(func.count(Item.id))).scalar_one() == 2
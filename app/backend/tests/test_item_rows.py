@@ -0,0 +1,58 @@
+import json
+from datetime import date, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item, ItemImage
+from backend.schemas.item import ItemPublic, ItemRead
+from backend.services.item_rows import encode_items, items_query, public_item_payload
+
+
+def _db():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    created = datetime(2024, 5, 1, 10, 0, 0, 250000)
+    photographed = Item(
+        short_id="pho1234",
+        title="Drill",
+        tags=["tools", "ünïcode"],
+        purchase_date=date(2023, 2, 1),
+        created_at=created,
+        updated_at=created,
+    )
+    photographed.images = [
+        ItemImage(path="blobs/b.jpg", created_at=created + timedelta(seconds=2), derivatives={"thumb": "d/b.jpg"}),
+        ItemImage(path="blobs/a.jpg", created_at=created + timedelta(seconds=1)),
+    ]
+    bare = Item(short_id="bar1234", title="Mug", created_at=created + timedelta(hours=1), updated_at=created)
+    db.add_all([photographed, bare])
+    db.commit()
+    return db
+
+
+def test_lean_listing_matches_item_read():
+    db = _db()
+    order = (Item.created_at.desc(), Item.id.desc())
+    lean = json.loads(encode_items(db.execute(items_query("sqlite").order_by(*order)).all()))
+    items = db.execute(select(Item).order_by(*order)).unique().scalars().all()
+    expected = jsonable_encoder([ItemRead.from_orm(item) for item in items])
+    for item in expected:
+        item["images"].sort(key=lambda image: image["created_at"])
+    assert lean == expected
+    assert [image["path"] for image in lean[1]["images"]] == ["blobs/a.jpg", "blobs/b.jpg"]
+
+
+def test_public_payload_uses_first_image_only():
+    db = _db()
+    payload = json.loads(public_item_payload(db, "pho1234", "http://x/media/"))
+    assert ItemPublic(**payload).primary_image == "http://x/media/blobs/a.jpg"
+    assert payload["primary_image_derivatives"] == {}
+    assert payload["tags"] == ["tools", "ünïcode"]
+
+    bare = json.loads(public_item_payload(db, "bar1234", "http://x/media/"))
+    assert bare["primary_image"] is None and bare["primary_image_derivatives"] == {}
+    assert public_item_payload(db, "nope123", "http://x/media/") is None
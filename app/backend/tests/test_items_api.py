@@ -0,0 +1,171 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.core.config import get_settings
+from backend.core.db import async_database_url
+from backend.main import app
+from backend.models import Base
+from backend.routers import items
+from backend.services import search
+from backend.services.printer_registry import NoPrinterAvailable, get_printers
+from backend.services.suggestions import SuggestionStore
+from backend.tasks import ai_tasks, print_tasks
+from backend.tasks.celery_app import celery_app
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'items.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(async_database_url(url))
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def get_db():
+        with Session(engine) as db:
+            yield db
+
+    async def get_async_db():
+        async with sessions() as db:
+            yield db
+
+    store = SuggestionStore()
+    monkeypatch.setattr(get_settings(), "media_dir", tmp_path / "media")
+    monkeypatch.setattr(items, "suggestion_store", store)
+    monkeypatch.setattr(ai_tasks, "suggestion_store", store)
+    monkeypatch.setattr(items, "_enqueue_derivatives", lambda image_id: None)
+    monkeypatch.setattr(items, "_enqueue_prerender", lambda item: None)
+    monkeypatch.setattr(items.public_item_cache, "invalidate", lambda short_id: None)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(items, "SessionLocal", sessionmaker(engine))
+    monkeypatch.setitem(app.dependency_overrides, items.get_db, get_db)
+    monkeypatch.setitem(app.dependency_overrides, items.get_async_db, get_async_db)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_create_and_upload_run_on_the_async_session(client):
+    response = client.post(
+        "/api/items/",
+        data={"title": "Watering can", "tags": "garden, shed"},
+        files={"image": ("can.png", PNG, "image/png")},
+    )
+    assert response.status_code == 200
+    item = response.json()["item"]
+    assert item["tags"] == ["garden", "shed"] and len(item["short_id"]) == get_settings().short_id_length
+    [first] = item["images"]
+    assert (get_settings().media_dir / first["path"]).read_bytes() == PNG
+
+    uploaded = client.post(f"/api/items/{item['id']}/images", files={"image": ("back.png", PNG + b"1", "image/png")})
+    assert uploaded.status_code == 200
+    assert [image["id"] for image in uploaded.json()][0] == first["id"]
+    assert len(uploaded.json()) == 2
+
+    missing = client.post(f"/api/items/{first['id']}/images", files={"image": ("x.png", PNG, "image/png")})
+    assert missing.status_code == 404
+
+
+def test_suggestions_are_queued_on_create_and_reused_for_duplicates(client):
+    form = {"title": "Can", "text_hint": "watering can"}
+    created = client.post("/api/items/", data=form, files={"image": ("can.png", PNG, "image/png")}).json()
+    assert (created["suggestions_status"], created["suggestions"]) == ("pending", None)
+
+    # Celery runs eagerly here, so the inference has finished by the time the client asks.
+    followup = client.get(f"/api/items/{created['item']['id']}/suggestions")
+    assert followup.status_code == 200
+    assert followup.json()["status"] == "ready"
+    assert set(followup.json()["suggestions"]) == {"title", "description", "tags"}
+
+    duplicate = client.post("/api/items/", data=form, files={"image": ("copy.png", PNG, "image/png")}).json()
+    assert duplicate["suggestions_status"] == "ready"
+    assert duplicate["suggestions"] == followup.json()["suggestions"]
+    assert client.get(f"/api/items/{duplicate['item']['id']}/suggestions").json()["status"] == "ready"
+
+    assert client.get(f"/api/items/{created['item']['images'][0]['id']}/suggestions").status_code == 404
+
+
+def test_search_results_page_with_a_cursor(client, monkeypatch):
+    for n in range(5):
+        client.post("/api/items/", data={"title": f"Box {n}"})
+    client.post("/api/items/", data={"title": "Kettle"})
+
+    titles, params = [], {"search": "box", "limit": 2}
+    while True:
+        response = client.get("/api/items/", params=params)
+        assert response.status_code == 200
+        titles += [item["title"] for item in response.json()]
+        if items.NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[items.NEXT_CURSOR_HEADER]
+    assert sorted(titles) == [f"Box {n}" for n in range(5)]
+
+    # Without a limit the fallback index stops at MAX_FALLBACK_RESULTS and says where to resume.
+    monkeypatch.setattr(search, "MAX_FALLBACK_RESULTS", 3)
+    first = client.get("/api/items/", params={"search": "box"})
+    assert len(first.json()) == 3
+    rest = client.get("/api/items/", params={"search": "box", "cursor": first.headers[items.NEXT_CURSOR_HEADER]})
+    assert len(rest.json()) == 2 and items.NEXT_CURSOR_HEADER not in rest.headers
+
+    keyset = client.get("/api/items/", params={"limit": 1}).headers[items.NEXT_CURSOR_HEADER]
+    assert client.get("/api/items/", params={"search": "box", "cursor": keyset}).status_code == 400
+
+
+@pytest.mark.parametrize("output", ["ndjson", "json-stream"])
+def test_streamed_listings_page_with_a_cursor(client, output):
+    for n in range(5):
+        client.post("/api/items/", data={"title": f"Box {n}"})
+
+    titles, params = [], {"format": output, "limit": 2}
+    while True:
+        response = client.get("/api/items/", params=params)
+        assert response.status_code == 200
+        if output == "ndjson":
+            page = [json.loads(line) for line in response.text.splitlines()]
+        else:
+            page = response.json()
+        titles += [item["title"] for item in page]
+        if items.NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[items.NEXT_CURSOR_HEADER]
+    assert titles == [f"Box {n}" for n in reversed(range(5))]
+
+
+def test_print_format_must_suit_the_chosen_printer(client, tmp_path, monkeypatch):
+    registry = tmp_path / "printers.json"
+    registry.write_text(json.dumps([{"name": "office", "uri": "socket://127.0.0.1:9", "language": "zpl"}]))
+    monkeypatch.setattr(get_settings(), "printers_path", registry)
+    get_printers.cache_clear()
+    try:
+        item = client.post("/api/items/", data={"title": "Drill"}).json()["item"]
+        body = {"size": "50x30", "printer": "office", "format": "pdf"}
+        response = client.post(f"/api/items/{item['id']}/print", json=body)
+        batch = client.post("/api/items/print", json={**body, "item_ids": [item["id"]]})
+    finally:
+        get_printers.cache_clear()
+    assert response.status_code == 422 and "raw label language" in response.json()["detail"]
+    assert batch.status_code == 422
+
+
+def test_import_reports_labels_it_could_not_queue(client, monkeypatch):
+    def select(size, location=None):
+        raise NoPrinterAvailable("No printer takes 50x30 labels")
+
+    monkeypatch.setattr(print_tasks.printer_router, "select", select)
+    rows = "title,location\nDrill,Shed\nMug,Kitchen\n"
+    response = client.post(
+        "/api/items/import",
+        files={"file": ("items.csv", rows, "text/csv")},
+        data={"print_labels": "true"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["imported"], body["print_job_ids"]) == (2, [])
+    assert body["print_error"] == "No printer takes 50x30 labels"
+    assert len(client.get("/api/items/").json()) == 2
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+import redis
+from fastapi import HTTPException
+
+from backend.routers import jobs
+from backend.services import job_status as job_status_module
+from backend.services.job_status import JobStatusHub, status_record
+
+
+def test_status_record_validates_state():
+    record = status_record("job-1", "spooling", task="print_label")
+    assert record["job_id"] == "job-1" and record["task"] == "print_label"
+    with pytest.raises(ValueError):
+        status_record("job-1", "paused")
+
+
+def test_job_events_stream_until_jobs_finish(monkeypatch):
+    hub = JobStatusHub()
+
+    async def idle_listener():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(hub, "_listen", idle_listener)
+    monkeypatch.setattr(jobs, "job_status_hub", hub)
+    snapshot = [status_record("a", "queued"), status_record("b", "done")]
+    monkeypatch.setattr(
+        job_status_module.job_status, "get_many", lambda ids: [s for s in snapshot if s["job_id"] in ids]
+    )
+
+    async def collect():
+        events = []
+        stream = jobs.job_events(["a", "b"], heartbeat=0.05)
+        events.append(await stream.__anext__())
+        events.append(await stream.__anext__())
+        hub.dispatch(status_record("a", "rendering"))
+        hub.dispatch(status_record("other", "done"))
+        hub.dispatch(status_record("a", "done"))
+        events.extend([event async for event in stream])
+        hub._listener.cancel()
+        return events
+
+    events = asyncio.run(collect())
+    states = [(data["job_id"], data["state"]) for data in (json.loads(e[len(b"data: "):]) for e in events)]
+    assert states == [("a", "queued"), ("b", "done"), ("a", "rendering"), ("a", "done")]
+    assert hub._subscribers == {}
+
+
+def test_job_events_deliver_final_states_and_report_unknown_jobs(monkeypatch):
+    hub = JobStatusHub()
+
+    async def idle_listener():
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(hub, "_listen", idle_listener)
+    monkeypatch.setattr(jobs, "job_status_hub", hub)
+    rendering = status_record("a", "rendering")
+    monkeypatch.setattr(job_status_module.job_status, "get_many", lambda ids: [rendering] if "a" in ids else [])
+
+    async def collect():
+        stream = jobs.job_events(["a", "missing"], heartbeat=0.05)
+        events = [await stream.__anext__(), await stream.__anext__()]
+        # The worker's clock runs behind the API's: its final state looks older.
+        hub.dispatch({**status_record("a", "done"), "updated_at": rendering["updated_at"] - 5})
+        events.extend([event async for event in stream])
+        hub._listener.cancel()
+        return events
+
+    events = asyncio.run(collect())
+    assert events[1] == b'event: error\ndata: {"job_id": "missing", "detail": "Job not found"}\n\n'
+    assert [json.loads(event[len(b"data: "):])["state"] for event in (events[0], events[2])] == ["rendering", "done"]
+    assert len(events) == 3
+
+
+def test_listener_backs_off_and_gives_up(monkeypatch):
+    connects, delays = [], []
+
+    class Down:
+        def __init__(self):
+            connects.append(self)
+
+        def pubsub(self):
+            raise job_status_module.aioredis.ConnectionError("refused")
+
+        async def aclose(self):
+            pass
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(job_status_module.aioredis.Redis, "from_url", lambda url: Down())
+    monkeypatch.setattr(job_status_module.asyncio, "sleep", sleep)
+    monkeypatch.setattr(job_status_module, "RECONNECT_ATTEMPTS", 5)
+    monkeypatch.setattr(job_status_module, "RECONNECT_MAX_DELAY", 4.0)
+    asyncio.run(JobStatusHub()._listen())
+
+    assert len(connects) == 5
+    assert delays == [1.0, 2.0, 4.0, 4.0]
+
+
+def test_job_status_is_503_while_redis_is_down(monkeypatch):
+    def get_many(ids):
+        raise redis.ConnectionError("refused")
+
+    monkeypatch.setattr(job_status_module.job_status, "get_many", get_many)
+    with pytest.raises(HTTPException) as raised:
+        jobs.get_job_status("job-1")
+    assert raised.value.status_code == 503
@@ -0,0 +1,78 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item
+from backend.services.label_cache import LabelCache, label_cache_key
+from backend.services.label_formats import get_format
+from backend.services.printer_registry import get_printer
+from backend.tasks import print_tasks
+
+
+def _item(**overrides):
+    values = dict(id=uuid.uuid4(), short_id="abc1234", title="Drill", description="", tags=[], status="active")
+    values.update(overrides)
+    return Item(**values)
+
+
+def test_cache_key_tracks_printed_fields():
+    item = _item()
+    key = label_cache_key(item, (50, 30), "http://example.com/")
+    assert key == label_cache_key(_item(id=uuid.uuid4()), (50, 30), "http://example.com")
+    assert key != label_cache_key(_item(location="Shelf 2"), (50, 30), "http://example.com")
+    assert key != label_cache_key(item, (62, 30), "http://example.com")
+
+
+def test_render_reuses_cached_pdf(tmp_path):
+    cache = LabelCache(directory=tmp_path, max_bytes=10 * 1024 * 1024)
+    item = _item()
+    first = cache.render(item, (50, 30), "http://example.com")
+    second = cache.render(item, (50, 30), "http://example.com")
+    assert first == second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    cache = LabelCache(directory=tmp_path, max_bytes=10 * 1024 * 1024)
+    old = cache.render(_item(title="Old"), (50, 30), "http://example.com")
+    new = cache.render(_item(title="New"), (50, 30), "http://example.com")
+    os.utime(old, (1, 1))
+    cache.max_bytes = new.stat().st_size
+    assert cache.evict() == 1
+    assert not old.exists()
+    assert new.exists()
+
+
+def test_prerender_fills_the_entries_print_label_reads(tmp_path, monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(_item(short_id="pre1234"))
+        db.commit()
+        item_id = db.execute(select(Item.id)).scalar_one()
+
+    @contextmanager
+    def scope():
+        with Session(engine) as session:
+            yield session
+            session.commit()
+
+    cache = LabelCache(directory=tmp_path, max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(print_tasks, "session_scope", scope)
+    monkeypatch.setattr(print_tasks, "label_cache", cache)
+    monkeypatch.setattr(print_tasks.settings, "label_prerender_sizes", ["50x30"])
+
+    assert print_tasks.prerender_labels(str(item_id), "2000-01-01T00:00:00")["superseded"]
+    assert not list(tmp_path.iterdir())
+
+    with Session(engine) as db:
+        item = db.get(Item, item_id)
+        assert print_tasks.prerender_labels(str(item_id), item.updated_at.isoformat())["rendered"] == 1
+        printer = get_printer()
+        key = label_cache_key(item, (50, 30), print_tasks.settings.public_base_url, printer.language, printer.dpi)
+    assert cache.get(key, get_format(printer.language).suffix) is not None
@@ -0,0 +1,61 @@
+import base64
+import binascii
+import re
+import uuid
+import zlib
+
+import pytest
+from PIL import Image
+
+from backend.models.item import Item
+from backend.services import labels
+from backend.services.label_formats import LABEL_FORMATS, encode_labels, get_format, tspl_page, zpl_page
+
+
+def _item(index=0):
+    return Item(id=uuid.uuid4(), short_id=f"abc123{index}", title="Test Item", description="Desc", status="active")
+
+
+def test_mono_pdf_is_g4_and_smaller(tmp_path):
+    labels.settings.media_dir = tmp_path
+    item = _item()
+    rgb = labels.render_label(item, fmt="pdf", destination=tmp_path / "rgb.pdf")
+    mono = labels.render_label(item, fmt="pdf-g4", destination=tmp_path / "mono.pdf")
+    assert b"/CCITTFaxDecode" in mono.read_bytes()
+    assert mono.stat().st_size * 5 < rgb.stat().st_size
+
+
+def test_png_is_one_bit_and_single_label(tmp_path):
+    labels.settings.media_dir = tmp_path
+    path = labels.render_label(_item(), fmt="png")
+    assert path.suffix == ".png"
+    assert Image.open(path).mode == "1"
+    with pytest.raises(ValueError):
+        labels.render_labels([_item(1), _item(2)], fmt="png")
+
+
+def test_zpl_graphic_field_round_trips():
+    image = Image.new("1", (13, 4), 1)
+    image.putpixel((0, 0), 0)
+    document = zpl_page(image).decode("ascii")
+    match = re.search(r"\^GFA,(\d+),\d+,(\d+),:Z64:([^:]+):([0-9a-f]{4})\^FS", document)
+    total, row_bytes, encoded, crc = match.groups()
+    data = zlib.decompress(base64.b64decode(encoded))
+    assert (int(total), int(row_bytes)) == (len(data), 2)
+    assert int(crc, 16) == binascii.crc_hqx(encoded.encode("ascii"), 0)
+    # Only the one black dot is set; row padding stays white.
+    assert data == b"\x80" + b"\x00" * 7
+
+
+def test_tspl_bitmap_and_multi_page():
+    image = Image.new("1", (16, 2), 1)
+    page = tspl_page(image, (50, 30))
+    assert page.startswith(b"SIZE 50 mm,30 mm\r\nCLS\r\nBITMAP 0,0,2,2,0,")
+    assert page.endswith(b"\xff" * 4 + b"\r\nPRINT 1\r\n")
+    assert encode_labels([image, image], get_format("tspl"), (50, 30), 300) == page * 2
+
+
+def test_unknown_format_rejected():
+    assert set(LABEL_FORMATS) >= {"pdf", "pdf-g4", "png", "zpl", "tspl"}
+    with pytest.raises(ValueError):
+        get_format("bmp")
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from backend.core.config import Settings
+from backend.services import label_templates
+from backend.services.label_templates import LabelTemplate, get_compiled_template, parse_size
+
+
+def test_parse_size_accepts_presets_and_custom_sizes():
+    assert parse_size("50x30") == (50, 30)
+    assert parse_size("100x50") == (100, 50)
+    with pytest.raises(ValueError):
+        parse_size("5x5")
+    with pytest.raises(ValueError):
+        parse_size("large")
+
+
+def test_custom_sizes_scale_from_reference_layout():
+    template = LabelTemplate.for_size(100, 60)
+    assert template.title_size == 96
+    assert template.meta_offset == 120
+
+
+def test_lower_resolution_scales_layout():
+    template = LabelTemplate.for_size(50, 30, dpi=150)
+    assert template.dpi == 150
+    assert template.title_size == 24
+
+
+def test_compiled_templates_are_reused():
+    layout = get_compiled_template((50, 30))
+    assert get_compiled_template((50, 30)) is layout
+    assert layout.qr_size == min(layout.height_px - 20, layout.width_px // 2)
+
+
+def test_configured_templates_override_defaults(tmp_path):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({"50x30": {"title_size": 40}, "70x40": {"title_chars": 20}}))
+    templates = label_templates._load_configured_templates(path)
+    assert templates[(50, 30)].title_size == 40
+    assert templates[(70, 40)].title_chars == 20
+
+
+def test_templates_rescale_for_printer_dpi():
+    layout = get_compiled_template((50, 30), 203)
+    assert layout.template.dpi == 203
+    assert layout.width_px == int(50 / 25.4 * 203)
+    assert layout.template.title_size == round(48 * 203 / 300)
+
+
+def test_barcode_module_minimum_follows_dpi():
+    assert get_compiled_template((50, 30)).barcode_min_module == 2
+    assert get_compiled_template((50, 30), 600).barcode_min_module == 4
+
+
+def test_empty_barcode_setting_means_none():
+    assert Settings(label_barcode="").label_barcode is None
@@ -1,7 +1,11 @@
 import uuid
+from dataclasses import replace
+
+import pytest
 
 from backend.models.item import Item
 from backend.services import labels
+from backend.services.label_templates import LabelTemplate, get_compiled_template
 
 
 def test_render_label_pdf(tmp_path):
@@ -17,3 +21,31 @@ def test_render_label_pdf(tmp_path):
     pdf_path = labels.render_label_pdf(item)
     assert pdf_path.exists()
     assert pdf_path.suffix == ".pdf"
+
+
+def test_render_labels_pdf_one_page_per_item(tmp_path):
+    labels.settings.media_dir = tmp_path
+    items = [
+        Item(id=uuid.uuid4(), short_id=f"abc123{i}", title=f"Item {i}", description="", tags=[], status="active")
+        for i in range(3)
+    ]
+    seen = []
+    pdf_path = labels.render_labels_pdf(items, batch_id="test", on_page=lambda index, item: seen.append(item))
+    assert pdf_path.exists()
+    assert seen == items
+    assert pdf_path.read_bytes().count(b"/Type /Page\n") == 3
+
+
+def test_label_carries_code128_of_configured_field():
+    layout = get_compiled_template((62, 30))
+    item = Item(id=uuid.uuid4(), short_id="abc1234", serial_no="SN-42", title="Item", description="", tags=[])
+    x, y = layout.barcode_origin
+    box = (x, y, x + layout.barcode_width, y + layout.template.barcode_size)
+
+    plain = labels._draw_label(item, layout, None, "1")
+    assert plain.crop(box).getextrema() == (255, 255)
+
+    with_barcode = replace(layout, template=replace(layout.template, barcode="serial_no"))
+    assert labels._draw_label(item, with_barcode, None, "1").crop(box).getextrema() == (0, 255)
+    with pytest.raises(ValueError):
+        LabelTemplate(width_mm=50, height_mm=30, barcode="title")
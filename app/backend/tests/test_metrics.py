@@ -0,0 +1,41 @@
+import logging
+
+from backend.core import metrics
+from backend.core.config import Settings
+
+
+def _sample(name, **labels):
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_trace_context_binds_and_resets():
+    assert metrics.current_trace_id() is None
+    with metrics.trace_context("abc") as trace_id:
+        assert trace_id == "abc"
+        assert metrics.current_trace_id() == "abc"
+    assert metrics.current_trace_id() is None
+
+
+def test_span_logs_trace_id(caplog):
+    caplog.set_level(logging.INFO, logger=metrics.__name__)
+    with metrics.trace_context("trace-1"):
+        with metrics.span("render", size="50x30"):
+            pass
+    assert "span render trace=trace-1" in caplog.text
+    assert "size=50x30" in caplog.text
+
+
+def test_render_latest_exposes_histograms():
+    before = _sample("label_render_seconds_count", size="10x10")
+    with metrics.LABEL_RENDER_SECONDS.labels(size="10x10").time():
+        pass
+    body, content_type = metrics.render_latest()
+    assert content_type.startswith("text/plain")
+    assert b"label_render_seconds_bucket" in body
+    assert _sample("label_render_seconds_count", size="10x10") == before + 1
+
+
+def test_empty_worker_metrics_port_disables_the_exporter():
+    assert Settings(worker_metrics_port="").worker_metrics_port is None
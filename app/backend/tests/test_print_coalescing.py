@@ -0,0 +1,110 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from celery.exceptions import Ignore
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item
+from backend.services.print_coalescing import PrintJob, print_jobs
+from backend.tasks import print_tasks
+
+
+def _db():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    db.add_all([Item(short_id="aaa1111", title="Drill"), Item(short_id="bbb2222", title="Mug")])
+    db.commit()
+    return db
+
+
+def test_jobs_merge_in_order_and_report_individually():
+    with _db() as db:
+        drill = db.query(Item).filter_by(title="Drill").one()
+        mug = db.query(Item).filter_by(title="Mug").one()
+        jobs = [
+            PrintJob("t1", str(mug.id), copies=2),
+            PrintJob("t2", str(uuid.uuid4())),
+            PrintJob("t3", str(drill.id)),
+        ]
+        rendered = []
+
+        def render(pages):
+            rendered.append([item.title for item in pages])
+            return "doc.pdf"
+
+        outcomes = print_jobs(db, jobs, render, lambda path: {"backend": "lp", "path": path})
+
+    assert rendered == [["Mug", "Mug", "Drill"]]
+    assert outcomes["t1"] == {"backend": "lp", "path": "doc.pdf", "coalesced": 2, "pages": 3}
+    assert outcomes["t3"]["coalesced"] == 2
+    assert isinstance(outcomes["t2"], ValueError)
+
+
+def test_spool_failure_fails_every_job():
+    def spool(path):
+        raise RuntimeError("printer offline")
+
+    with _db() as db:
+        ids = [str(item.id) for item in db.query(Item)]
+        outcomes = print_jobs(db, [PrintJob("a", ids[0]), PrintJob("b", ids[1])], lambda pages: "doc", spool)
+    assert [str(outcomes[task_id]) for task_id in ("a", "b")] == ["printer offline"] * 2
+
+
+def test_print_job_round_trip():
+    job = PrintJob("task", "item", copies=3)
+    assert PrintJob.loads(job.dumps().encode()) == job
+
+
+def test_batch_reports_the_spool_result_of_every_chunk(monkeypatch):
+    db = _db()
+
+    @contextmanager
+    def scope():
+        yield db
+
+    spooled = []
+
+    def spool(path, size_mm, copies, label_format, printer):
+        spooled.append(path)
+        return {"backend": "lp", "request_id": f"P-{len(spooled)}", "printer": printer.name}
+
+    monkeypatch.setattr(print_tasks, "session_scope", scope)
+    monkeypatch.setattr(print_tasks, "render_labels", lambda chunk, **kwargs: [item.title for item in chunk])
+    monkeypatch.setattr(print_tasks, "_spool", spool)
+    monkeypatch.setattr(print_tasks.settings, "print_batch_chunk_size", 1)
+
+    ids = [str(item.id) for item in db.query(Item).order_by(Item.title)] + [str(uuid.uuid4())]
+    result = print_tasks.print_labels_batch(ids)
+    db.close()
+
+    assert spooled == [["Drill"], ["Mug"]]
+    assert [job["request_id"] for job in result["jobs"]] == ["P-1", "P-2"]
+    assert (result["printed"], result["chunks"], result["missing"]) == (2, 2, ids[2:])
+
+
+def test_priority_labels_skip_coalescing(monkeypatch):
+    db = _db()
+
+    @contextmanager
+    def scope():
+        yield db
+
+    coalesced, spooled = [], []
+    monkeypatch.setattr(print_tasks.settings, "print_coalesce_window", 0.5)
+    monkeypatch.setattr(print_tasks, "session_scope", scope)
+    monkeypatch.setattr(print_tasks, "_coalesce", lambda job, *args: coalesced.append(job.item_id))
+    monkeypatch.setattr(print_tasks.label_cache, "render", lambda item, **kwargs: item.title)
+    monkeypatch.setattr(print_tasks, "_spool", lambda path, *args: spooled.append(path) or {"backend": "lp"})
+
+    item_id = str(db.query(Item).filter_by(title="Mug").one().id)
+    with pytest.raises(Ignore):
+        print_tasks.print_label(item_id, fmt="pdf")
+    assert print_tasks.print_label(item_id, fmt="pdf", priority=True) == {"backend": "lp"}
+    db.close()
+
+    assert coalesced == [item_id]
+    assert spooled == ["Mug"]
@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+
+import pytest
+
+from backend.core.config import Settings
+from backend.services import printer_registry
+from backend.services.printer_registry import NoPrinterAvailable, Printer, PrinterRouter, load_printers
+
+
+def _registry():
+    return {
+        "office": Printer("office", "socket://office", language="zpl", dpi=203, locations=("Office",)),
+        "shed": Printer("shed", "lp://shed", sizes=((50, 30),), locations=("Shed",)),
+        "lab": Printer("lab", "lp://lab", sizes=((62, 30),)),
+    }
+
+
+def _router(loads=None, offline=()):
+    loads = loads or {}
+    return PrinterRouter(
+        printers=_registry,
+        queue_length=lambda printer: loads.get(printer.name, 0),
+        is_online=lambda printer: printer.name not in offline,
+        busy_threshold=5,
+    )
+
+
+def test_load_printers_from_file(tmp_path):
+    path = tmp_path / "printers.json"
+    entry = {"name": "office", "uri": "socket://10.0.0.5", "language": "zpl", "sizes": ["50x30"]}
+    path.write_text(json.dumps([entry]))
+    printer = load_printers(path)["office"]
+    assert (printer.language, printer.dpi, printer.sizes) == ("zpl", 300, ((50, 30),))
+    assert printer.queue == "print.office" and printer.priority_queue == "print.office.priority"
+    assert list(load_printers(None)) == ["default"]
+    assert Settings(printers_path="").printers_path is None
+
+
+def test_raw_socket_printers_need_a_raw_language(tmp_path):
+    path = tmp_path / "printers.json"
+    path.write_text(json.dumps([{"name": "office", "uri": "socket://10.0.0.5"}]))
+    with pytest.raises(ValueError, match="raw label language"):
+        load_printers(path)
+    assert Printer("office", "lp://office").language == "pdf"
+
+
+def test_routes_by_location_then_size():
+    router = _router()
+    assert router.select((50, 30), "shed").name == "shed"
+    assert router.select((50, 30), "Office").name == "office"
+    assert router.select((62, 30)).name == "office"
+    assert router.select((62, 30), "Shed").name == "office"
+
+
+def test_busy_or_offline_printers_fall_back_to_least_loaded():
+    assert _router(loads={"shed": 9}).select((50, 30), "Shed").name == "office"
+    assert _router(offline={"shed"}).select((50, 30), "Shed").name == "office"
+    assert _router(loads={"shed": 9, "office": 12}).select((50, 30), "Shed").name == "shed"
+
+
+def test_no_printer_for_size():
+    router = PrinterRouter(printers=lambda: {"shed": _registry()["shed"]}, queue_length=lambda p: 0)
+    with pytest.raises(NoPrinterAvailable):
+        router.select((100, 50))
+
+
+def test_status_checks_never_block_routing(monkeypatch):
+    checked = threading.Event()
+
+    class SlowTransport:
+        def __init__(self, uri):
+            self.uri = uri
+
+        def status(self):
+            checked.wait(2)
+            return {"online": self.uri != "lp://shed"}
+
+    monkeypatch.setattr(printer_registry, "get_transport", SlowTransport)
+    router = PrinterRouter(printers=_registry, queue_length=lambda printer: 0, busy_threshold=5)
+    started = time.perf_counter()
+    # Nothing is known yet, so every printer counts as online.
+    assert router.select((50, 30), "Shed").name == "shed"
+    assert time.perf_counter() - started < 1
+
+    checked.set()
+    router._executor.shutdown(wait=True)
+    assert router.select((50, 30), "Shed").name == "office"
@@ -0,0 +1,159 @@
+import socket
+import subprocess
+import threading
+
+import pytest
+
+from backend.services import printers
+from backend.services.label_formats import get_format
+from backend.services.printers import LpTransport, PrinterError, RawSocketTransport
+
+
+class FakePrinter:
+    """A local TCP server that records what each connection receives."""
+
+    def __init__(self, close_after_job=False):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.connections = []
+        self.close_after_job = close_after_job
+        self.received = threading.Event()
+        self.disconnected = threading.Event()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            buffer = bytearray()
+            self.connections.append(buffer)
+            threading.Thread(target=self._read, args=(conn, buffer), daemon=True).start()
+
+    def _read(self, conn, buffer):
+        with conn:
+            while True:
+                chunk = conn.recv(65536)
+                buffer.extend(chunk)
+                if not chunk or self.close_after_job:
+                    break
+                self.received.set()
+        self.disconnected.set()
+        self.received.set()
+
+    def wait(self):
+        assert self.received.wait(2)
+        self.received.clear()
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def label(tmp_path):
+    path = tmp_path / "label.zpl"
+    path.write_bytes(b"^XA^XZ")
+    return path
+
+
+def test_raw_socket_reuses_pooled_connection(label):
+    printer = FakePrinter()
+    transport = RawSocketTransport("127.0.0.1", printer.port, sleep=lambda _: None)
+    first = transport.send(label, (50, 30), 1, get_format("zpl"))
+    printer.wait()
+    transport.send(label, (50, 30), 2, get_format("zpl"))
+    printer.wait()
+    assert first == {"backend": "socket", "printer": f"127.0.0.1:{printer.port}", "bytes": 6, "attempts": 1}
+    assert len(printer.connections) == 1
+    while len(printer.connections[0]) < 18:
+        printer.wait()
+    assert bytes(printer.connections[0]) == b"^XA^XZ" * 3
+    transport.close()
+    printer.close()
+
+
+def test_raw_socket_reconnects_when_printer_drops_connection(label):
+    printer = FakePrinter(close_after_job=True)
+    transport = RawSocketTransport("127.0.0.1", printer.port, sleep=lambda _: None)
+    transport.send(label, (50, 30), 1, get_format("zpl"))
+    assert printer.disconnected.wait(2)
+    printer.received.clear()
+    transport.send(label, (50, 30), 1, get_format("zpl"))
+    printer.wait()
+    assert [bytes(data) for data in printer.connections] == [b"^XA^XZ", b"^XA^XZ"]
+    transport.close()
+    printer.close()
+
+
+def test_raw_socket_retries_with_backoff_then_fails(label):
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+    server.close()
+    delays = []
+    transport = RawSocketTransport("127.0.0.1", port, retries=2, backoff=0.1, sleep=delays.append)
+    with pytest.raises(PrinterError):
+        transport.send(label, (50, 30), 1, get_format("zpl"))
+    assert delays == [0.1, 0.2]
+    assert transport.status()["online"] is False
+
+
+def test_raw_socket_rejects_non_raw_formats(label):
+    transport = RawSocketTransport("127.0.0.1", 9, sleep=lambda _: None)
+    with pytest.raises(PrinterError, match="'pdf'"):
+        transport.send(label, (50, 30), 1, get_format("pdf"))
+
+
+def test_raw_socket_does_not_resend_after_partial_write(label):
+    class DroppingSocket:
+        """Accepts the first three bytes, then loses the connection."""
+
+        def __init__(self):
+            self.sent = False
+
+        def send(self, data):
+            if self.sent:
+                raise ConnectionResetError("reset by peer")
+            self.sent = True
+            return 3
+
+        def close(self):
+            pass
+
+    sockets = []
+
+    def acquire():
+        sockets.append(DroppingSocket())
+        return sockets[-1]
+
+    transport = RawSocketTransport("127.0.0.1", 9, retries=2, sleep=lambda _: None)
+    transport.pool.acquire = acquire
+    with pytest.raises(PrinterError, match="after 3 of 6 bytes"):
+        transport.send(label, (50, 30), 1, get_format("zpl"))
+    assert len(sockets) == 1
+
+
+def test_lp_transport_builds_raw_and_pdf_commands(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, 0, "request id is P-1", "")
+
+    monkeypatch.setattr(printers.subprocess, "run", fake_run)
+    transport = LpTransport("Zebra")
+    result = transport.send(tmp_path / "a.zpl", (50, 30), 2, get_format("zpl"))
+    transport.send(tmp_path / "a.pdf", (50, 30), 1, get_format("pdf"))
+    assert result == {"backend": "lp", "printer": "Zebra", "request_id": "P-1"}
+    assert calls[0] == ["lp", "-d", "Zebra", "-n", "2", "-o", "raw", str(tmp_path / "a.zpl")]
+    assert "media=Custom.50x30mm" in calls[1]
+
+
+def test_get_transport_selects_backend_by_uri():
+    assert isinstance(printers.get_transport("lp://Office"), LpTransport)
+    transport = printers.get_transport("socket://10.0.0.5")
+    assert isinstance(transport, RawSocketTransport) and transport.port == 9100
+    assert printers.get_transport("socket://10.0.0.5") is transport
+    with pytest.raises(ValueError):
+        printers.get_transport("ipp://printer")
+    printers.close_transports()
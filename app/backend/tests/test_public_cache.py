@@ -0,0 +1,39 @@
+import time
+
+from backend.services.public_cache import MISSING, PublicItemCache
+from backend.utils.lru import LRUCache
+
+
+def test_lru_cache_evicts_and_expires():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("d") is None
+
+
+def test_public_item_cache_positive_negative_and_invalidate():
+    cache = PublicItemCache(maxsize=10, ttl=60, negative_ttl=60)
+    assert cache.get("abc1234") is None
+
+    cache.set_missing("zzz9999")
+    assert cache.get("zzz9999") == MISSING
+
+    cache.set("abc1234", b'{"short_id": "abc1234"}')
+    assert cache.get("abc1234") == b'{"short_id": "abc1234"}'
+    cache.invalidate("abc1234")
+    assert cache.get("abc1234") is None
+
+
+def test_pending_payloads_expire_with_the_negative_ttl():
+    cache = PublicItemCache(maxsize=10, ttl=60, negative_ttl=0.01)
+    cache.set_pending("abc1234", b'{"primary_image_derivatives": {}}')
+    assert cache.get("abc1234") is not None
+    time.sleep(0.02)
+    assert cache.get("abc1234") is None
@@ -0,0 +1,21 @@
+from backend.services.qr_cache import QRCache
+from backend.utils.http import etag_matches
+
+
+def test_qr_cache_memoizes_and_persists(tmp_path):
+    cache = QRCache(maxsize=4, directory=tmp_path)
+    png, etag = cache.png("http://example.com/i/abc1234")
+    assert png.startswith(b"\x89PNG")
+    assert cache.png("http://example.com/i/abc1234") == (png, etag)
+    assert len(list(tmp_path.glob("*.png"))) == 1
+
+    fresh = QRCache(maxsize=4, directory=tmp_path)
+    assert fresh.png("http://example.com/i/abc1234") == (png, etag)
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -1,7 +1,47 @@
-from backend.services.qrcode_utils import make_qr_png
+import pytest
+from PIL import Image
+
+from backend.services.qrcode_utils import (
+    CODE128_QUIET_ZONE,
+    code128_modules,
+    draw_code128,
+    draw_qr,
+    make_code128_png,
+    make_qr_png,
+    qr_matrix,
+)
 
 
 def test_make_qr_png_returns_image():
     img = make_qr_png("http://example.com")
     assert img.mode == "RGB"
     assert img.size[0] == img.size[1]
+
+
+def test_draw_qr_uses_whole_module_blocks():
+    for mode, dark in (("1", 0), ("RGB", (0, 0, 0))):
+        canvas = Image.new(mode, (200, 200), "white")
+        scale = draw_qr(canvas, "http://example.com/i/abc1234", (3, 3), 190)
+        matrix = qr_matrix("http://example.com/i/abc1234")
+        offset = 3 + (190 - len(matrix) * scale) // 2
+        assert scale == 190 // len(matrix)
+        assert {colour for _, colour in canvas.getcolors()} == {dark, 255 if mode == "1" else (255, 255, 255)}
+        for row, modules in enumerate(matrix):
+            for column, is_dark in enumerate(modules):
+                for dx, dy in ((0, 0), (scale - 1, scale - 1)):
+                    pixel = canvas.getpixel((offset + column * scale + dx, offset + row * scale + dy))
+                    assert (pixel == dark) == is_dark
+
+
+def test_code128_fits_whole_modules_or_refuses():
+    modules = code128_modules("SN-00001234")
+    canvas = Image.new("1", (400, 40), "white")
+    scale = draw_code128(canvas, "SN-00001234", (0, 0), 400, 40)
+    assert scale == 400 // (len(modules) + 2 * CODE128_QUIET_ZONE)
+    first_bar = CODE128_QUIET_ZONE * scale
+    assert canvas.getpixel((first_bar - 1, 20)) == 255 and canvas.getpixel((first_bar, 20)) == 0
+    with pytest.raises(ValueError):
+        draw_code128(canvas, "SN-00001234", (0, 0), len(modules), 40)
+    with pytest.raises(ValueError):
+        draw_code128(canvas, "SN-00001234", (0, 0), 400, 40, min_scale=scale + 1)
+    assert make_code128_png("SN-00001234").size == ((len(modules) + 2 * CODE128_QUIET_ZONE) * 2, 120)
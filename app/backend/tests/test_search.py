@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from backend.models import Base
+from backend.models.item import Item
+from backend.services import search
+from backend.services.search import InvertedIndex, apply_search, search_page, tokenize
+
+
+def test_inverted_index_prefix_and_substring_matches():
+    index = InvertedIndex()
+    drill, saw = uuid.uuid4(), uuid.uuid4()
+    index.add(drill, {"title": tokenize("Cordless Drill"), "serial_no": tokenize("SN-004521")})
+    index.add(saw, {"title": tokenize("Circular Saw"), "description": tokenize("drill bits not included")})
+
+    assert [doc for doc, _ in index.search("drill")] == [drill, saw]
+    assert [doc for doc, _ in index.search("cord")] == [drill]
+    assert [doc for doc, _ in index.search("4521")] == [drill]
+    assert index.search("circular drill") == [(saw, pytest.approx(3.0 + 1.0))]
+    assert index.search("hammer") == []
+
+
+def test_apply_search_on_sqlite():
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all(
+            [
+                Item(short_id="aaa1111", title="Label printer", tags=["office"]),
+                Item(short_id="bbb2222", title="Ladder", description="For the label shelf"),
+                Item(short_id="ccc3333", title="Kettle", tags=["kitchen"]),
+            ]
+        )
+        db.commit()
+
+        titles = db.execute(apply_search(select(Item.title), "label", db)).scalars().all()
+        assert titles == ["Label printer", "Ladder"]
+        assert db.execute(apply_search(select(Item.title), "kitch", db)).scalars().all() == ["Kettle"]
+
+
+def test_fallback_search_pages_instead_of_truncating(monkeypatch):
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(search, "MAX_FALLBACK_RESULTS", 2)
+    with Session(engine) as db:
+        db.add_all([Item(short_id=f"box{n:04d}", title=f"Box {n}") for n in range(5)])
+        db.commit()
+
+        query, next_offset = search_page(select(Item.title), "box", db)
+        first = db.execute(query).scalars().all()
+        assert (len(first), next_offset) == (2, 2)
+        rest = []
+        while next_offset is not None:
+            query, next_offset = search_page(select(Item.title), "box", db, offset=next_offset)
+            rest += db.execute(query).scalars().all()
+        assert sorted(first + rest) == [f"Box {n}" for n in range(5)]
+
+        query, next_offset = search_page(select(Item.title), "box", db, offset=1, limit=2)
+        assert len(db.execute(query).scalars().all()) == 2 and next_offset is None
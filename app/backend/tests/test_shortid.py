@@ -1,4 +1,6 @@
-from backend.utils.shortid import generate_short_id
+from prometheus_client import REGISTRY
+
+from backend.utils.shortid import ShortIdAllocator, generate_many, generate_short_id
 
 
 def test_short_id_length_and_charset():
@@ -10,3 +12,32 @@ def test_short_id_length_and_charset():
 def test_short_id_randomness():
     values = {generate_short_id() for _ in range(100)}
     assert len(values) > 90
+
+
+def test_generate_many_is_distinct_and_sized():
+    values = generate_many(500, length=10)
+    assert len(values) == len(set(values)) == 500
+    assert all(len(value) == 10 and value.isalnum() for value in values)
+
+
+def test_allocator_retries_collisions_and_counts_them():
+    existing = set(generate_many(5))
+    calls = []
+
+    def taken(candidates):
+        calls.append(list(candidates))
+        # Pretend the first two candidates of the first batch already exist.
+        return candidates[:2] if len(calls) == 1 else [c for c in candidates if c in existing]
+
+    def exported(name):
+        return REGISTRY.get_sample_value(name, {"length": "7"}) or 0.0
+
+    before = exported("short_id_candidates_total"), exported("short_id_collisions_total")
+    allocator = ShortIdAllocator(length=7)
+    allocated = allocator.allocate(10, taken)
+    assert len(allocated) == len(set(allocated)) == 10
+    assert not set(calls[0][:2]) & set(allocated)
+    assert allocator.stats()["collisions"] == 2
+    assert allocator.collision_rate == allocator.stats()["collision_rate"] == 2 / 12
+    assert exported("short_id_candidates_total") - before[0] == 12
+    assert exported("short_id_collisions_total") - before[1] == 2
@@ -0,0 +1,26 @@
+import io
+
+import pytest
+
+from backend.services import storage
+from backend.services.storage import UploadTooLarge, store_stream
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def test_identical_uploads_share_one_blob(tmp_path):
+    storage.settings.media_dir = tmp_path
+    first = store_stream(io.BytesIO(PNG_BYTES), "photo.jpeg")
+    second = store_stream(io.BytesIO(PNG_BYTES), "copy.png")
+    assert first == second
+    assert first.path.suffix == ".png"
+    assert first.relative_path.startswith("blobs/")
+    assert len(list((tmp_path / "blobs").rglob("*.png"))) == 1
+    assert not any((tmp_path / "blobs" / "tmp").iterdir())
+
+
+def test_upload_size_limit(tmp_path):
+    storage.settings.media_dir = tmp_path
+    with pytest.raises(UploadTooLarge):
+        store_stream(io.BytesIO(b"x" * 100), "big.bin", max_bytes=10)
+    assert not any((tmp_path / "blobs" / "tmp").iterdir())
@@ -0,0 +1,71 @@
+import pytest
+
+from backend.services import ai
+from backend.services.suggestions import FAILED, PENDING, READY, SuggestionStore, suggestion_key
+from backend.tasks import ai_tasks
+
+
+class CountingProvider(ai.LocalProvider):
+    calls = 0
+
+    def describe(self, image_path=None, text_hint=None):
+        type(self).calls += 1
+        return super().describe(image_path=image_path, text_hint=text_hint)
+
+
+def test_local_provider_is_deterministic():
+    provider = ai.get_provider("local")
+    first = provider.describe(image_path="blobs/ab/cd/abcd.jpg", text_hint="watering can")
+    assert first == provider.describe(image_path="blobs/ab/cd/abcd.jpg", text_hint="watering can")
+    assert set(first) == {"title", "description", "tags"}
+    assert ai.get_provider(f"{__name__}:CountingProvider").name == "local"
+    with pytest.raises(ValueError):
+        ai.get_provider("nope")
+    with pytest.raises(TypeError):
+        ai.SuggestionProvider()
+
+
+def test_suggestion_key_depends_on_content_hint_and_provider():
+    key = suggestion_key("a" * 64, "can", provider="local")
+    assert key == suggestion_key("a" * 64, " can ", provider="local")
+    assert key != suggestion_key("b" * 64, "can", provider="local")
+    assert key != suggestion_key("a" * 64, "jug", provider="local")
+    assert key != suggestion_key("a" * 64, "can", provider="other")
+
+
+def test_duplicate_requests_share_one_inference(monkeypatch):
+    store = SuggestionStore(ttl=60, timeout=60)
+    monkeypatch.setattr(ai_tasks, "suggestion_store", store)
+    monkeypatch.setattr(ai_tasks, "get_provider", lambda: CountingProvider())
+    CountingProvider.calls = 0
+    key = suggestion_key("c" * 64, "can")
+
+    store.assign("item-1", key)
+    assert store.claim(key)
+    store.assign("item-2", key)
+    assert not store.claim(key)
+    assert store.status("item-2") == (PENDING, None)
+
+    suggestions = ai_tasks.suggest_item_metadata(key, "blobs/cc/cc/x.jpg", "can")
+    assert store.status("item-1") == (READY, suggestions)
+    assert store.status("item-2") == (READY, suggestions)
+    assert ai_tasks.suggest_item_metadata(key, "blobs/cc/cc/x.jpg", "can") == suggestions
+    assert CountingProvider.calls == 1
+    assert store.status("unknown") is None
+
+
+def test_failed_inference_releases_the_key(monkeypatch):
+    class BrokenProvider(ai.SuggestionProvider):
+        def describe(self, image_path=None, text_hint=None):
+            raise ai.SuggestionError("model unavailable")
+
+    store = SuggestionStore(ttl=60, timeout=60)
+    monkeypatch.setattr(ai_tasks, "suggestion_store", store)
+    monkeypatch.setattr(ai_tasks, "get_provider", lambda: BrokenProvider())
+    key = suggestion_key(None, "can")
+    store.assign("item-1", key)
+    store.claim(key)
+    with pytest.raises(ai.SuggestionError):
+        ai_tasks.suggest_item_metadata(key, None, "can")
+    assert store.status("item-1") == (FAILED, None)
+    assert store.claim(key)
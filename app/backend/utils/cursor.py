@@ -0,0 +1,58 @@
+"""Opaque keyset pagination cursors."""
+from __future__ import annotations
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Tuple
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+
+
+def encode_cursor(created_at: datetime, item_id: uuid.UUID) -> str:
+    """Encode the sort key of the last row of a page."""
+
+    return _encode(f"{created_at.isoformat()}|{item_id}")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises ``ValueError`` when the cursor is malformed.
+    """
+
+    try:
+        created_at, item_id = _decode(cursor).split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(item_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode the position after the last row of a page of ranked search results.
+
+    Relevance has no stable sort key to resume from, so search pages by offset.
+    """
+
+    return _encode(f"#{offset}")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """Decode a cursor produced by :func:`encode_offset_cursor`.
+
+    Raises ``ValueError`` when the cursor is malformed.
+    """
+
+    try:
+        raw = _decode(cursor)
+        if not raw.startswith("#") or not raw[1:].isdigit():
+            raise ValueError(raw)
+        return int(raw[1:])
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
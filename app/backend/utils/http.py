@@ -0,0 +1,156 @@
+"""Helpers for HTTP caching headers."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Optional, Tuple, Union
+
+from fastapi.responses import Response
+
+from .lru import LRUCache
+
+try:  # Brotli is optional; without it only gzip is offered.
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Compressing tiny bodies costs more than it saves.
+MIN_COMPRESS_BYTES = 512
+
+_compressed: LRUCache[Tuple[str, str], bytes] = LRUCache(maxsize=4096)
+
+
+def strong_etag(data: bytes) -> str:
+    """Return a quoted strong entity tag for ``data``."""
+
+    return '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+
+
+def weak_etag(*parts: object) -> str:
+    """Return a weak entity tag derived from ``parts``.
+
+    Weak tags stay valid across content codings, so one tag covers the
+    identity, gzip and brotli variants of a JSON body.
+    """
+
+    digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return 'W/"' + digest[:32] + '"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive-UTC or aware datetime as an HTTP date."""
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header against ``etag``.
+
+    Uses the weak comparison RFC 9110 prescribes for ``If-None-Match``.
+    """
+
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any((value[2:] if value.startswith("W/") else value) == opaque for value in candidates)
+
+
+def not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """Decide whether a GET can be answered with 304 Not Modified.
+
+    ``If-Modified-Since`` is only consulted when the request carries no
+    ``If-None-Match``, as RFC 9110 requires.
+    """
+
+    if if_none_match:
+        return etag_matches(if_none_match, etag)
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole-second resolution.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def preferred_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Return ``"br"``, ``"gzip"`` or ``None`` for an ``Accept-Encoding`` header."""
+
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            weight = float(value) if name.strip() == "q" else 1.0
+        except ValueError:
+            weight = 0.0
+        if weight > 0:
+            accepted.add(coding.strip().lower())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compressed(body: bytes, etag: str, encoding: str) -> bytes:
+    """Return ``body`` in ``encoding``, compressing each tagged body only once."""
+
+    cached = _compressed.get((etag, encoding))
+    if cached is None:
+        cached = brotli.compress(body) if encoding == "br" else gzip.compress(body, mtime=0)
+        _compressed.set((etag, encoding), cached)
+    return cached
+
+
+def conditional_response(
+    body: Union[bytes, Callable[[], bytes]],
+    etag: str,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    accept_encoding: Optional[str] = None,
+    precompress: bool = False,
+    media_type: str = "application/json",
+    cache_control: str = "no-cache",
+) -> Response:
+    """Build a 200 or 304 response for ``body`` carrying its validators.
+
+    ``body`` may be a callable so that serialization is skipped on a 304.
+    With ``precompress`` the body is sent gzip or brotli encoded when the
+    client accepts it; the encoded copy is memoized by ``etag``.
+    """
+
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if precompress:
+        headers["Vary"] = "Accept-Encoding"
+    if not_modified(if_none_match, if_modified_since, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if callable(body):
+        body = body()
+    encoding = preferred_encoding(accept_encoding) if precompress and len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding is not None:
+        body = compressed(body, etag, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=media_type, headers=headers)
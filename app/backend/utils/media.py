@@ -0,0 +1,62 @@
+"""Static file serving for ``/media`` with cache validators."""
+from __future__ import annotations
+
+import os
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .http import not_modified
+
+# Uploads and their derivatives are named after the SHA-256 of the upload, so
+# a URL under these directories always serves the same bytes.
+CONTENT_ADDRESSED_DIRS = ("blobs", "derivatives")
+
+
+class MediaFiles(StaticFiles):
+    """``StaticFiles`` that treats content-addressed files as immutable.
+
+    Files under :data:`CONTENT_ADDRESSED_DIRS` get their content hash as
+    ETag and ``cache_control``; everything else (rendered labels, which are
+    rewritten in place) must be revalidated on every use.
+    """
+
+    def __init__(
+        self,
+        *args: object,
+        cache_control: str,
+        immutable_dirs: Tuple[str, ...] = CONTENT_ADDRESSED_DIRS,
+        **kwargs: object,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self.immutable_dirs = immutable_dirs
+
+    def _is_immutable(self, full_path: str) -> bool:
+        relative = Path(os.path.relpath(full_path, os.path.realpath(self.directory)))
+        return bool(relative.parts) and relative.parts[0] in self.immutable_dirs
+
+    def file_response(
+        self, full_path: str, stat_result: os.stat_result, scope: Scope, status_code: int = 200
+    ) -> Response:
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, method=scope["method"])
+        if self._is_immutable(full_path):
+            response.headers["etag"] = f'"{Path(full_path).stem}"'
+            response.headers["cache-control"] = self.cache_control
+        else:
+            response.headers["cache-control"] = "no-cache"
+
+        request_headers = Headers(scope=scope)
+        if status_code == 200 and not_modified(
+            request_headers.get("if-none-match"),
+            request_headers.get("if-modified-since"),
+            response.headers["etag"],
+            parsedate_to_datetime(response.headers["last-modified"]),
+        ):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,19 @@
+"""Parsing of free-form tag input."""
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+
+def parse_tags(raw: Optional[str]) -> list[str]:
+    """Accept a JSON list or a comma-separated string of tags."""
+
+    if not raw:
+        return []
+    try:
+        parsed = json.loads(raw)
+        if isinstance(parsed, list):
+            return [str(tag) for tag in parsed]
+    except json.JSONDecodeError:
+        pass
+    return [tag.strip() for tag in raw.split(",") if tag.strip()]
@@ -8,6 +8,7 @@ interface PublicItem {
   location?: string | null;
   status: string;
   primary_image?: string | null;
+  primary_image_derivatives?: Record<string, string>;
 }
 
 async function getItem(shortId: string): Promise<PublicItem | null> {
@@ -40,7 +41,7 @@ export default async function PublicItemPage({ params }: { params: { shortId: st
           initial={{ scale: 0.95 }}
           animate={{ scale: 1 }}
           transition={{ duration: 0.4 }}
-          src={item.primary_image ?? ""}
+          src={item.primary_image_derivatives?.webp ?? item.primary_image ?? ""}
           alt={item.title}
           className="h-64 w-full rounded-2xl object-cover"
         />
@@ -38,6 +38,22 @@ export default function NewItemPage() {
     setForm((prev) => ({ ...prev, [field]: value }));
   };
 
+  const pollSuggestions = async (base: string, itemId: string) => {
+    for (let attempt = 0; attempt < 60; attempt += 1) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const response = await fetch(`${base}/api/items/${itemId}/suggestions`);
+      if (!response.ok) break;
+      const json = await response.json();
+      if (json.status === "ready") {
+        setSuggestions(json.suggestions);
+        setMessage("Review suggestions below.");
+        return;
+      }
+      if (json.status !== "pending") break;
+    }
+    setMessage("Suggestions are not available for this item.");
+  };
+
   const handleCreate = async () => {
     setLoading(true);
     setMessage(null);
@@ -77,8 +93,14 @@ export default function NewItemPage() {
         tags: Array.isArray(json.item.tags) ? json.item.tags.join(", ") : prev.tags,
         location: json.item.location ?? "",
       }));
-      setSuggestions(json.suggestions);
-      setMessage("Item created! Review suggestions below.");
+      if (json.suggestions) {
+        setSuggestions(json.suggestions);
+        setMessage("Item created! Review suggestions below.");
+      } else {
+        setSuggestions(null);
+        setMessage("Item created! Suggestions are on their way.");
+        void pollSuggestions(base, json.item.id);
+      }
     } catch (error) {
       setMessage(error instanceof Error ? error.message : "Failed to create item");
     } finally {
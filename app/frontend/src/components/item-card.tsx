@@ -8,8 +8,10 @@ interface ItemCardProps {
 
 export function ItemCard({ item }: ItemCardProps) {
   const base = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
-  const primaryImage = item.images[0]?.path
-    ? `${base}/media/${item.images[0].path}`
+  const firstImage = item.images[0];
+  const imagePath = firstImage?.derivatives?.thumb ?? firstImage?.path;
+  const primaryImage = imagePath
+    ? `${base}/media/${imagePath}`
     : "https://placehold.co/400x300?text=No+Image";
 
   return (
@@ -1,11 +1,19 @@
 "use client";
 
-import { useState } from "react";
+import { useEffect, useRef, useState } from "react";
 
 interface PrintButtonProps {
   itemId: string;
 }
 
+const STATE_LABELS: Record<string, string> = {
+  queued: "Queued",
+  rendering: "Rendering label...",
+  spooling: "Sending to printer...",
+  done: "Printed",
+  failed: "Print failed",
+};
+
 const SIZE_OPTIONS = [
   { label: "50 × 30 mm", value: "50x30" },
   { label: "40 × 30 mm", value: "40x30" },
@@ -17,10 +25,29 @@ export function PrintButton({ itemId }: PrintButtonProps) {
   const [copies, setCopies] = useState(1);
   const [status, setStatus] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const events = useRef<EventSource | null>(null);
+  const base = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
+
+  useEffect(() => () => events.current?.close(), []);
+
+  const watchJob = (jobId: string) => {
+    events.current?.close();
+    const source = new EventSource(`${base}/api/jobs/events?ids=${encodeURIComponent(jobId)}`);
+    source.onmessage = (event) => {
+      const update = JSON.parse(event.data) as { state: string; error?: string };
+      const label = STATE_LABELS[update.state] ?? update.state;
+      setStatus(update.error ? `${label}: ${update.error}` : label);
+      if (update.state === "done" || update.state === "failed") {
+        source.close();
+      }
+    };
+    // The server ends the stream once the job finishes; don't reconnect.
+    source.onerror = () => source.close();
+    events.current = source;
+  };
 
   const handlePrint = async () => {
     setLoading(true);
-    const base = process.env.NEXT_PUBLIC_API_BASE ?? "http://localhost:8000";
     try {
       const response = await fetch(`${base}/api/items/${itemId}/print`, {
         method: "POST",
@@ -31,7 +58,8 @@ export function PrintButton({ itemId }: PrintButtonProps) {
       if (!response.ok) {
         throw new Error(json.detail ?? "Failed to queue print job");
       }
-      setStatus(`Queued job ${json.job_id}`);
+      setStatus(STATE_LABELS.queued);
+      watchJob(json.job_id);
     } catch (error) {
       setStatus(error instanceof Error ? error.message : "Failed to queue print job");
     } finally {
@@ -2,6 +2,7 @@ export interface ItemImage {
   id: string;
   path: string;
   created_at: string;
+  derivatives?: Record<string, string>;
 }
 
 export interface Item {